@@ -0,0 +1,97 @@
+"""
+JWT authentication that resolves users from a short-lived in-process cache.
+
+Entries are tagged with a per-user version kept in the default cache, which User saves
+and deletes replace (see accounts.signals). Every lookup compares the tags, so a change
+is seen on the next request by every process sharing that cache (see CACHES in
+settings). Changes made through queryset.update() show up once the entry expires after
+AUTH_USER_CACHE_TTL seconds.
+"""
+import copy
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+MAX_ENTRIES = 10000
+
+_users = {}
+_lock = threading.Lock()
+
+
+def _version_key(user_id):
+    return f"accounts:user-version:{user_id}"
+
+
+def _version(user_id):
+    # A fresh token rather than a counter: an evicted key can't come back with an old value
+    return cache.get(_version_key(user_id))
+
+
+def invalidate_user(user_id):
+    user_id = str(user_id)
+    cache.set(_version_key(user_id), uuid.uuid4().hex, None)
+    with _lock:
+        _users.pop(user_id, None)
+
+
+def reset_user_cache():
+    with _lock:
+        _users.clear()
+
+
+def _cached(user_id):
+    # Tokens carry the id as a string; key everything the same way
+    user_id = str(user_id)
+    version = _version(user_id)
+    with _lock:
+        entry = _users.get(user_id)
+        if entry is None:
+            return None, version
+        cached_version, expires_at, user = entry
+        if cached_version != version or expires_at <= time.monotonic():
+            del _users[user_id]
+            return None, version
+        return user, version
+
+
+def _store(user_id, version, user):
+    ttl = getattr(settings, "AUTH_USER_CACHE_TTL", 30)
+    user_id = str(user_id)
+    # A save that raced with the database read has already replaced the version
+    if ttl <= 0 or version != _version(user_id):
+        return
+    with _lock:
+        if len(_users) >= MAX_ENTRIES:
+            _users.clear()
+        _users[user_id] = (version, time.monotonic() + ttl, user)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def check_user(self, validated_token, user):
+        """The checks JWTAuthentication.get_user makes after loading the user, for cached users."""
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password)
+        ):
+            raise AuthenticationFailed("The user's password has been changed.", code="password_changed")
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        user, version = _cached(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            _store(user_id, version, user)
+        else:
+            self.check_user(validated_token, user)
+        # Each request gets its own instance so per-request state never leaks between requests
+        return copy.copy(user)
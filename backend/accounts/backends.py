@@ -0,0 +1,37 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from .hashing import check_password, hash_dummy_password
+from .models import email_key
+
+UserModel = get_user_model()
+
+
+def users_by_email(email):
+    """Users whose email matches case-insensitively; served by the accounts_user_email_ci_unique index."""
+    return (
+        UserModel._default_manager
+        .filter(normalized_email=email_key(email))
+        .exclude(normalized_email="")
+    )
+
+
+class EmailBackend(ModelBackend):
+    """
+    Authenticates with email and password in a single query; username logins (the Django
+    admin) still go through ModelBackend.
+    """
+
+    def authenticate(self, request, username=None, password=None, email=None, **kwargs):
+        if email is None:
+            return super().authenticate(request, username=username, password=password, **kwargs)
+        if not email or password is None:
+            return None
+        user = users_by_email(email).first()
+        if user is None:
+            # Hash anyway so unknown emails take as long as wrong passwords
+            hash_dummy_password(password)
+            return None
+        if check_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
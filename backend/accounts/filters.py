@@ -0,0 +1,17 @@
+import django_filters
+from django.db.models.functions import Lower
+
+from .models import User
+
+
+class UserFilter(django_filters.FilterSet):
+    role = django_filters.ChoiceFilter(choices=User.ROLE_CHOICES)
+    # Exact, case-insensitive match so the accounts_user_location_ci index applies
+    location = django_filters.CharFilter(method="filter_location")
+
+    class Meta:
+        model = User
+        fields = ["role", "location"]
+
+    def filter_location(self, queryset, name, value):
+        return queryset.alias(location_lower=Lower("location")).filter(location_lower=value.strip().lower())
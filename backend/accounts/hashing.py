@@ -0,0 +1,96 @@
+"""
+Password hashing policy.
+
+settings.PASSWORD_HASHING_TIER picks the hasher used for new passwords from
+settings.PASSWORD_HASHER_TIERS; the other tiers stay installed so existing hashes keep
+verifying and are rewritten with the preferred hasher on the next successful login.
+The hashers below keep Django's algorithm names, so their hashes are interchangeable
+with the stock ones, and read their cost parameters from settings.
+
+All hashing goes through a bounded thread pool (PASSWORD_HASHING_WORKERS, default one
+per core): a login burst queues for a worker instead of oversubscribing the CPU and
+starving every other request, which matters most under ASGI where sync views share a
+small thread pool.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class TunedArgon2PasswordHasher(hashers.Argon2PasswordHasher):
+    # OWASP's minimum recommended profile: far less CPU per login than Django's defaults
+    @property
+    def time_cost(self):
+        return getattr(settings, "PASSWORD_ARGON2_TIME_COST", 2)
+
+    @property
+    def memory_cost(self):
+        return getattr(settings, "PASSWORD_ARGON2_MEMORY_COST", 19456)  # KiB
+
+    @property
+    def parallelism(self):
+        return getattr(settings, "PASSWORD_ARGON2_PARALLELISM", 1)
+
+
+class TunedScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return getattr(settings, "PASSWORD_SCRYPT_WORK_FACTOR", 2 ** 14)
+
+    @property
+    def block_size(self):
+        return getattr(settings, "PASSWORD_SCRYPT_BLOCK_SIZE", 8)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, "PASSWORD_SCRYPT_PARALLELISM", 1)
+
+
+class TunedPBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return getattr(settings, "PASSWORD_PBKDF2_ITERATIONS", hashers.PBKDF2PasswordHasher.iterations)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _run(func, *args):
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = getattr(settings, "PASSWORD_HASHING_WORKERS", None) or os.cpu_count() or 1
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hashing")
+    return _executor.submit(func, *args).result()
+
+
+def set_password(user, raw_password):
+    """user.set_password(), with the hashing done on the bounded pool."""
+    if raw_password is None:
+        user.set_unusable_password()
+        return
+    user.password = _run(hashers.make_password, raw_password)
+    user._password = raw_password
+
+
+def check_password(user, raw_password):
+    """
+    user.check_password(), with the hashing done on the bounded pool. A correct password
+    stored with a non-preferred hasher or outdated cost is rehashed and saved.
+    """
+    is_correct, must_update = _run(hashers.verify_password, raw_password, user.password)
+    if is_correct and must_update:
+        set_password(user, raw_password)
+        # Only the password column, so a concurrent profile edit is not overwritten
+        user.save(update_fields=["password"])
+    return is_correct
+
+
+def hash_dummy_password(raw_password):
+    """Spend the same hashing time as a real check, for lookups that found no user."""
+    _run(hashers.make_password, raw_password)
@@ -0,0 +1,113 @@
+"""
+Resized, metadata-free variants of uploaded pictures (profile pictures, company logos).
+
+Variants are generated off-request and stored under a path derived from the SHA-256 of
+the original, so identical uploads share one set of files. The hash is written back to the
+model only once every variant exists, which is how serializers know they can use them.
+"""
+import hashlib
+import io
+
+from django.core.files.base import ContentFile
+from django.db.models.signals import post_save, pre_save
+
+from backend.tasks import run_in_background
+
+VARIANT_SIZES = {"thumb": 64, "small": 160, "medium": 480}
+VARIANT_FORMATS = {
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+VARIANT_ROOT = "image_variants"
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def variant_name(content_hash, size, fmt):
+    extension = VARIANT_FORMATS[fmt][1]
+    return f"{VARIANT_ROOT}/{content_hash[:2]}/{content_hash}/{size}.{extension}"
+
+
+def _content_hash(storage, name):
+    digest = hashlib.sha256()
+    with storage.open(name, "rb") as fh:
+        for chunk in iter(lambda: fh.read(READ_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _encode(image, fmt, size):
+    from PIL import Image
+
+    pil_format, _, options = VARIANT_FORMATS[fmt]
+    variant = image.copy()
+    variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+    if pil_format == "JPEG" and variant.mode != "RGB":
+        background = Image.new("RGB", variant.size, (255, 255, 255))
+        if variant.mode in ("RGBA", "LA"):
+            background.paste(variant, mask=variant.getchannel("A"))
+        else:
+            background.paste(variant.convert("RGB"))
+        variant = background
+    # A fresh info dict means no EXIF/ICC/XMP is carried into the output
+    variant.info = {}
+    buf = io.BytesIO()
+    variant.save(buf, pil_format, **options)
+    return buf.getvalue()
+
+
+def generate_variants(field_file):
+    """Write every size/format variant of field_file (skipping ones already cached) and return its hash."""
+    from PIL import Image, ImageOps
+
+    storage = field_file.storage
+    content_hash = _content_hash(storage, field_file.name)
+    missing = [
+        (size_name, fmt)
+        for size_name in VARIANT_SIZES
+        for fmt in VARIANT_FORMATS
+        if not storage.exists(variant_name(content_hash, size_name, fmt))
+    ]
+    if not missing:
+        return content_hash
+
+    with storage.open(field_file.name, "rb") as fh:
+        image = ImageOps.exif_transpose(Image.open(fh))
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        for size_name, fmt in missing:
+            data = _encode(image, fmt, VARIANT_SIZES[size_name])
+            storage.save(variant_name(content_hash, size_name, fmt), ContentFile(data))
+    return content_hash
+
+
+def refresh_variants(model, pk, field_name, hash_field):
+    obj = model._default_manager.filter(pk=pk).only(field_name).first()
+    if obj is None:
+        return
+    field_file = getattr(obj, field_name)
+    content_hash = generate_variants(field_file) if field_file else ""
+    # Only record the hash if the picture wasn't replaced while we were working
+    model._default_manager.filter(pk=pk, **{field_name: field_file.name or ""}).update(**{hash_field: content_hash})
+
+
+def watch_image_field(model, field_name, hash_field):
+    """Regenerate variants in the background whenever model.<field_name> gets a new upload or is cleared."""
+    flag = f"_{field_name}_variants_stale"
+
+    def mark_stale(sender, instance, update_fields=None, **kwargs):
+        if update_fields is not None and field_name not in update_fields:
+            return
+        field_file = getattr(instance, field_name)
+        new_upload = bool(field_file) and not getattr(field_file, "_committed", True)
+        cleared = not field_file and bool(getattr(instance, hash_field))
+        if new_upload or cleared:
+            setattr(instance, hash_field, "")
+            setattr(instance, flag, True)
+
+    def schedule(sender, instance, **kwargs):
+        if instance.__dict__.pop(flag, False):
+            run_in_background(refresh_variants, model, instance.pk, field_name, hash_field)
+
+    uid = f"{model._meta.label_lower}.{field_name}.variants"
+    pre_save.connect(mark_stale, sender=model, weak=False, dispatch_uid=f"{uid}.pre")
+    post_save.connect(schedule, sender=model, weak=False, dispatch_uid=f"{uid}.post")
@@ -0,0 +1,34 @@
+from django.db import migrations, models
+
+
+def email_key(email):
+    return (email or "").strip().casefold()
+
+
+def fill_normalized_emails(apps, schema_editor):
+    User = apps.get_model("accounts", "User")
+    # Lower() let non-ASCII case variants through; only the oldest account keeps the address for login
+    seen = set()
+    for user in User.objects.exclude(email="").order_by("id").only("id", "email"):
+        key = email_key(user.email)
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        user.normalized_email = key
+        user.save(update_fields=["normalized_email"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='normalized_email',
+            field=models.CharField(max_length=762, blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(fill_normalized_emails, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Separate from 0005: PostgreSQL won't alter a table with the data migration's triggers pending
+
+    dependencies = [
+        ('accounts', '0005_user_normalized_email'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='user',
+            name='accounts_user_email_ci_unique',
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(condition=models.Q(('normalized_email', ''), _negated=True), fields=('normalized_email',), name='accounts_user_email_ci_unique'),
+        ),
+    ]
@@ -1,8 +1,15 @@
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser
 
 # Create your models here.
 
+def email_key(email):
+    """The case-insensitive identity of an email, computed in Python only (SQL LOWER() is ASCII-only on SQLite)."""
+    return (email or "").strip().casefold()
+
+
 class User(AbstractUser):
     ROLE_CHOICES = (
         ('technician', 'technician'),
@@ -14,6 +21,30 @@ class User(AbstractUser):
     phone_number = models.CharField(max_length=20, null=True, blank=True)
     location = models.CharField(max_length=100)
     profile_picture = models.ImageField(upload_to='profile_pictures/', null=True, blank=True)
+    # SHA-256 of profile_picture once its resized variants exist (see accounts/images.py)
+    profile_picture_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
+    # email_key(email); casefolding can lengthen an address
+    normalized_email = models.CharField(max_length=762, blank=True, default="", editable=False)
+
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            # Login looks users up by email; this is also the index that lookup uses
+            models.UniqueConstraint(
+                fields=["normalized_email"], condition=~Q(normalized_email=""), name="accounts_user_email_ci_unique",
+            ),
+        ]
+        indexes = [
+            # UserListView filters; id last so the cursor pagination walks the index in order
+            models.Index(fields=["role", "id"], name="accounts_user_role_id"),
+            models.Index(Lower("location"), "id", name="accounts_user_location_ci"),
+        ]
 
     def __str__(self):
-        return f"{self.username}"
\ No newline at end of file
+        return f"{self.username}"
+
+    def save(self, *args, **kwargs):
+        self.normalized_email = email_key(self.email)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "email" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "normalized_email"}
+        super().save(*args, **kwargs)
\ No newline at end of file
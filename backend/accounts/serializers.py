@@ -2,6 +2,11 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from backend.sparse import SparseFieldsSerializerMixin
+
+from .backends import users_by_email
+from .hashing import set_password
+
 User = get_user_model()
 
 
@@ -16,29 +21,33 @@ class RegisterSerializer(serializers.ModelSerializer):
             'phone_number': {"required": False, "allow_null": True, "allow_blank": True},
         }
 
+    def validate_email(self, value):
+        if value and users_by_email(value).exists():
+            raise serializers.ValidationError("A user with this email already exists.")
+        return value
+
     def create(self, validated_data):
         password = validated_data.pop("password")
         user = User(**validated_data)
-        user.set_password(password)
+        set_password(user, password)
         user.save()
         return user
 
 
+class UserListSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ["id", "username", "email", "role", "phone_number", "location"]
+        read_only_fields = fields
+
+
 class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True)
 
     def validate(self, data):
         from django.contrib.auth import authenticate
-        email = data.get("email")
-        password = data.get("password")
-
-        try:
-            user_obj = User.objects.get(email=email)
-        except User.DoesNotExist:
-            raise serializers.ValidationError("Invalid credentials")
-
-        user = authenticate(username=user_obj.username, password=password)
+        user = authenticate(self.context.get("request"), email=data.get("email"), password=data.get("password"))
         if not user:
             raise serializers.ValidationError("Invalid credentials")
 
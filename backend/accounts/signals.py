@@ -1,13 +1,18 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 
 from employers.models import EmployerProfile
 from technicians.models import TechnicianProfile
+from .authentication import invalidate_user
+from .images import watch_image_field
 
 
 User = get_user_model()
 
+watch_image_field(User, "profile_picture", "profile_picture_hash")
+
 
 @receiver(post_save, sender=User)
 def create_user_profiles(sender, instance: User, created: bool, **kwargs):
@@ -27,3 +32,12 @@ def create_user_profiles(sender, instance: User, created: bool, **kwargs):
             defaults={"company_name": instance.username},
         )
 
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance: User, **kwargs):
+    # Again after commit, in case a request re-cached the old row in between
+    user_id = instance.pk
+    invalidate_user(user_id)
+    transaction.on_commit(lambda: invalidate_user(user_id))
+
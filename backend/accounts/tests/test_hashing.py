@@ -0,0 +1,60 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth import hashers
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from accounts import hashing
+from accounts.throttling import login_buckets
+
+User = get_user_model()
+
+
+class PasswordHashingTests(TestCase):
+    def setUp(self):
+        login_buckets.clear()
+
+    def login(self, email, password):
+        return self.client.post(reverse("login"), {"email": email, "password": password}, content_type="application/json")
+
+    def test_legacy_hash_is_upgraded_on_login(self):
+        with override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.PBKDF2PasswordHasher"]):
+            user = User.objects.create_user(username="old", email="old@example.com", password="pass1234", role="technician")
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$"))
+
+        self.assertEqual(self.login("old@example.com", "pass1234").status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("scrypt$"))
+        self.assertEqual(self.login("old@example.com", "pass1234").status_code, 200)
+
+    def test_wrong_password_does_not_rehash(self):
+        with override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.PBKDF2PasswordHasher"]):
+            user = User.objects.create_user(username="old", email="old@example.com", password="pass1234", role="technician")
+        legacy = user.password
+        self.assertEqual(self.login("old@example.com", "nope").status_code, 400)
+        user.refresh_from_db()
+        self.assertEqual(user.password, legacy)
+
+    def test_tuned_cost_changes_trigger_a_rehash(self):
+        user = User.objects.create_user(username="u", email="u@example.com", password="pass1234", role="technician")
+        with override_settings(PASSWORD_SCRYPT_WORK_FACTOR=2 ** 12):
+            self.assertTrue(hashing.check_password(user, "pass1234"))
+        user.refresh_from_db()
+        self.assertEqual(hashers.identify_hasher(user.password).decode(user.password)["work_factor"], 2 ** 12)
+
+    def test_hashing_runs_on_the_bounded_pool(self):
+        threads = []
+        original = hashers.make_password
+
+        def make_password(raw):
+            threads.append(threading.current_thread().name)
+            return original(raw)
+
+        user = User(username="p", email="p@example.com")
+        with mock.patch.object(hashing.hashers, "make_password", side_effect=make_password):
+            hashing.set_password(user, "pass1234")
+        self.assertTrue(threads[0].startswith("password-hashing"))
+        self.assertTrue(user.check_password("pass1234"))
@@ -0,0 +1,73 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from PIL import Image
+from rest_framework.test import APITestCase, APIRequestFactory
+from rest_framework.request import Request
+
+from accounts.images import VARIANT_SIZES, variant_name
+from chat.serializers import UserSerializer
+
+User = get_user_model()
+
+
+def make_jpeg(size=(1200, 900)):
+    buf = BytesIO()
+    exif = Image.Exif()
+    exif[0x010F] = "CameraMaker"
+    Image.new("RGB", size, (10, 120, 200)).save(buf, "JPEG", exif=exif)
+    return buf.getvalue()
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class ImageVariantTests(APITestCase):
+    def setUp(self):
+        self._temp_media = tempfile.mkdtemp()
+        self.addCleanup(lambda: shutil.rmtree(self._temp_media, ignore_errors=True))
+        override = override_settings(MEDIA_ROOT=self._temp_media)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.user = User.objects.create_user(
+            username="pictured", email="pictured@example.com", password="pass", role="employer", location="Kigali",
+        )
+
+    def _upload(self):
+        self.user.profile_picture = SimpleUploadedFile("me.jpg", make_jpeg(), content_type="image/jpeg")
+        self.user.save()
+        self.user.refresh_from_db()
+
+    def test_upload_generates_stripped_variants(self):
+        self._upload()
+        content_hash = self.user.profile_picture_hash
+        self.assertEqual(len(content_hash), 64)
+        for size_name, px in VARIANT_SIZES.items():
+            for fmt in ("webp", "jpeg"):
+                name = variant_name(content_hash, size_name, fmt)
+                self.assertTrue(default_storage.exists(name), name)
+                with default_storage.open(name, "rb") as fh:
+                    img = Image.open(fh)
+                    self.assertLessEqual(max(img.size), px)
+                    self.assertFalse(img.getexif())
+
+    def test_serializer_returns_variant_matching_context(self):
+        self._upload()
+        factory = APIRequestFactory()
+        request = Request(factory.get("/", HTTP_ACCEPT="image/webp,*/*"))
+        data = UserSerializer(self.user, context={"request": request}).data
+        self.assertTrue(data["profile_picture"].endswith(f"{self.user.profile_picture_hash}/thumb.webp"))
+
+        request = Request(factory.get("/", {"image_size": "medium"}))
+        data = UserSerializer(self.user, context={"request": request}).data
+        self.assertTrue(data["profile_picture"].endswith("/medium.jpg"))
+
+    def test_clearing_picture_clears_hash(self):
+        self._upload()
+        self.user.profile_picture = None
+        self.user.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_picture_hash, "")
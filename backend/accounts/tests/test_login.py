@@ -0,0 +1,112 @@
+from unittest import mock
+
+from django.contrib.auth import authenticate, get_user_model
+from django.db import IntegrityError
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts import backends
+from accounts.throttling import TokenBuckets, login_buckets
+
+User = get_user_model()
+
+
+class LoginTests(APITestCase):
+    def setUp(self):
+        login_buckets.clear()
+        self.user = User.objects.create_user(
+            username="tech", email="Tech@Example.com", password="secret-pass", role="technician"
+        )
+        self.url = reverse("login")
+
+    def test_email_is_matched_case_insensitively_in_one_query(self):
+        with self.assertNumQueries(1):
+            resp = self.client.post(self.url, {"email": "tech@example.COM", "password": "secret-pass"}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["user"]["id"], self.user.id)
+
+    def test_non_ascii_email_is_matched_case_insensitively(self):
+        # Only the domain is lowercased on save, and SQLite's LOWER() leaves É alone
+        user = User.objects.create_user(username="eloi", email="Éloi@example.com", password="secret-pass")
+        self.assertEqual(authenticate(None, email="éloi@example.com", password="secret-pass"), user)
+        self.assertEqual(backends.users_by_email("ÉLOI@example.com").get(), user)
+        with self.assertRaises(IntegrityError):
+            User.objects.create_user(username="dup", email="éloi@example.com", password="pass")
+
+    def test_unknown_email_still_hashes(self):
+        with mock.patch.object(backends, "hash_dummy_password", wraps=backends.hash_dummy_password) as dummy:
+            resp = self.client.post(self.url, {"email": "nobody@example.com", "password": "x"}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        dummy.assert_called_once_with("x")
+
+    def test_emails_are_unique_ignoring_case(self):
+        resp = self.client.post(reverse("register"), {
+            "username": "other", "email": "TECH@example.com", "password": "pass12345", "role": "employer", "location": "x",
+        }, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", resp.data)
+        with self.assertRaises(IntegrityError):
+            User.objects.create_user(username="dup", email="tech@EXAMPLE.com", password="pass")
+
+    def test_account_bucket_rejects_bursts_before_hashing(self):
+        for _ in range(5):
+            resp = self.client.post(self.url, {"email": "tech@example.com", "password": "wrong"}, format="json")
+            self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        with mock.patch.object(backends, "check_password") as check_password:
+            resp = self.client.post(self.url, {"email": "TECH@example.com", "password": "secret-pass"}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", resp)
+        check_password.assert_not_called()
+
+    @override_settings(LOGIN_RATE_LIMITS={"ip": (3, 0.01)})
+    def test_ip_bucket_covers_every_account(self):
+        codes = [
+            self.client.post(self.url, {"email": f"u{i}@example.com", "password": "x"}, format="json").status_code
+            for i in range(4)
+        ]
+        self.assertEqual(codes, [400, 400, 400, 429])
+
+    @override_settings(LOGIN_RATE_LIMITS={"ip": (3, 0.01)})
+    def test_spoofed_forwarded_for_does_not_escape_the_ip_bucket(self):
+        codes = [
+            self.client.post(
+                self.url, {"email": f"u{i}@example.com", "password": "x"}, format="json",
+                HTTP_X_FORWARDED_FOR=f"198.51.100.{i}",
+            ).status_code
+            for i in range(4)
+        ]
+        self.assertEqual(codes, [400, 400, 400, 429])
+
+    @override_settings(LOGIN_RATE_LIMITS={"ip": (1, 0.01)}, REST_FRAMEWORK={"NUM_PROXIES": 1})
+    def test_trusted_proxy_hop_identifies_the_client(self):
+        def attempt(forwarded_for):
+            return self.client.post(
+                self.url, {"email": "nobody@example.com", "password": "x"}, format="json",
+                HTTP_X_FORWARDED_FOR=forwarded_for,
+            ).status_code
+
+        # The proxy appends the address it saw; whatever the client sent before it is ignored
+        self.assertEqual(attempt("203.0.113.9, 198.51.100.1"), 400)
+        self.assertEqual(attempt("203.0.113.10, 198.51.100.1"), 429)
+        self.assertEqual(attempt("198.51.100.2"), 400)
+
+    def test_failures_from_another_ip_do_not_lock_the_owner_out(self):
+        for _ in range(6):
+            self.client.post(self.url, {"email": "tech@example.com", "password": "wrong"}, format="json",
+                             REMOTE_ADDR="198.51.100.7")
+        resp = self.client.post(self.url, {"email": "tech@example.com", "password": "secret-pass"}, format="json",
+                                REMOTE_ADDR="203.0.113.5")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_buckets_refill_over_time(self):
+        buckets = TokenBuckets()
+        self.assertEqual([buckets.take("k", 2, 0.5, now=0) for _ in range(2)], [0, 0])
+        self.assertEqual(buckets.take("k", 2, 0.5, now=0), 2.0)
+        self.assertEqual(buckets.take("k", 2, 0.5, now=2), 0)
+
+    def test_successful_logins_do_not_use_up_the_bucket(self):
+        for _ in range(10):
+            resp = self.client.post(self.url, {"email": "tech@example.com", "password": "secret-pass"}, format="json")
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
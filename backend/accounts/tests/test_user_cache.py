@@ -0,0 +1,119 @@
+import asyncio
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from django.core.cache import cache
+
+from accounts.authentication import CachedJWTAuthentication, reset_user_cache
+from chat.middleware import JWTAuthMiddleware
+
+User = get_user_model()
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        reset_user_cache()
+        self.user = User.objects.create_user(username="u", email="u@example.com", password="pass", role="technician")
+        self.token = AccessToken.for_user(self.user)
+        self.auth = CachedJWTAuthentication()
+
+    def test_second_lookup_skips_the_database(self):
+        with self.assertNumQueries(1):
+            first = self.auth.get_user(self.token)
+        with self.assertNumQueries(0):
+            second = self.auth.get_user(self.token)
+        self.assertEqual(first.pk, second.pk)
+        self.assertIsNot(first, second)
+
+    def test_save_invalidates_the_entry(self):
+        self.auth.get_user(self.token)
+        self.user.location = "Kigali"
+        self.user.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.auth.get_user(self.token).location, "Kigali")
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(self.token)
+
+    def test_invalidation_from_another_process_is_seen(self):
+        self.auth.get_user(self.token)
+        # Another worker deactivated the user: its signal replaced the shared version,
+        # but this process's entry is still there
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        cache.set(f"accounts:user-version:{self.user.pk}", "from-another-worker", None)
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(self.token)
+
+    # Patched rather than overridden: simplejwt modules hold on to the api_settings they imported
+    @mock.patch.object(api_settings, "CHECK_REVOKE_TOKEN", True)
+    def test_cache_hits_still_reject_revoked_tokens(self):
+        old_token = AccessToken.for_user(self.user)
+        self.user.set_password("new-pass")
+        self.user.save()
+        # The new token caches the user with the new password
+        self.auth.get_user(AccessToken.for_user(self.user))
+        with self.assertNumQueries(0), self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(old_token)
+
+    @override_settings(AUTH_USER_CACHE_TTL=0)
+    def test_zero_ttl_disables_caching(self):
+        self.auth.get_user(self.token)
+        with self.assertNumQueries(1):
+            self.auth.get_user(self.token)
+
+    def test_rest_requests_reuse_the_cached_user(self):
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {self.token}"
+        self.client.get(reverse("me"))
+        with self.assertNumQueries(0):
+            resp = self.client.get(reverse("me"))
+        self.assertEqual(resp.json()["username"], "u")
+
+    def test_websocket_middleware_resolves_users_from_the_cache(self):
+        seen = {}
+
+        async def inner(scope, receive, send):
+            seen["user"] = scope["user"]
+
+        middleware = JWTAuthMiddleware(inner)
+        scope = {"type": "websocket", "query_string": f"token={self.token}".encode()}
+        async_to_sync(middleware)(dict(scope), None, None)
+        self.assertEqual(seen["user"].pk, self.user.pk)
+        with self.assertNumQueries(0):
+            async_to_sync(middleware)(dict(scope), None, None)
+        self.assertEqual(seen["user"].pk, self.user.pk)
+
+        async_to_sync(middleware)({"type": "websocket", "query_string": b"token=bogus"}, None, None)
+        self.assertFalse(seen["user"].is_authenticated)
+
+    def test_websocket_middleware_reads_the_cache_off_the_event_loop(self):
+        on_loop = []
+        real_get = cache.get
+
+        def get(*args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            return real_get(*args, **kwargs)
+
+        async def inner(scope, receive, send):
+            pass
+
+        middleware = JWTAuthMiddleware(inner)
+        scope = {"type": "websocket", "query_string": f"token={self.token}".encode()}
+        with mock.patch.object(cache, "get", side_effect=get):
+            async_to_sync(middleware)(dict(scope), None, None)
+            async_to_sync(middleware)(dict(scope), None, None)
+        self.assertTrue(on_loop)
+        self.assertNotIn(True, on_loop)
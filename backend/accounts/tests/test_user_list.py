@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class UserListTests(APITestCase):
+    def setUp(self):
+        User.objects.bulk_create([
+            User(
+                username=f"user{i}", email=f"user{i}@example.com", password="x",
+                role="technician" if i % 2 else "employer", location="Kigali" if i % 3 == 0 else "Musanze",
+            )
+            for i in range(60)
+        ])
+        self.client.force_authenticate(User.objects.get(username="user0"))
+        self.url = reverse("user-list")
+
+    def test_cursor_pages_walk_every_user_once(self):
+        first = self.client.get(self.url)
+        self.assertEqual(len(first.data["results"]), 50)
+        self.assertNotIn("password", first.data["results"][0])
+        second = self.client.get(first.data["next"])
+        ids = [row["id"] for row in first.data["results"] + second.data["results"]]
+        self.assertEqual(ids, sorted(User.objects.values_list("id", flat=True)))
+        self.assertIsNone(second.data["next"])
+
+    def test_role_and_location_filters(self):
+        resp = self.client.get(self.url, {"role": "technician", "location": "kigali", "page_size": 100})
+        expected = User.objects.filter(role="technician", location="Kigali").count()
+        self.assertEqual(len(resp.data["results"]), expected)
+        self.assertTrue(all(row["role"] == "technician" and row["location"] == "Kigali" for row in resp.data["results"]))
+
+    def test_sparse_fields_trim_output_and_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(self.url, {"fields": "username,bogus"})
+        self.assertEqual(set(resp.data["results"][0]), {"username"})
+        select = next(q["sql"] for q in queries.captured_queries if 'FROM "accounts_user"' in q["sql"])
+        self.assertNotIn('"email"', select.split("FROM")[0])
+
+    def test_unknown_fields_only_is_rejected(self):
+        self.assertEqual(self.client.get(self.url, {"fields": "password"}).status_code, 400)
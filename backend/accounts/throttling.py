@@ -0,0 +1,89 @@
+"""
+Login rate limiting with in-process token buckets.
+
+Every login attempt takes a token from the bucket of the client IP and from the bucket
+of the email it names from that IP; a successful login gives them back, so only failures
+add up. Buckets refill continuously, so short bursts are fine but a sustained guessing
+run is refused with 429 before any password hashing happens.
+
+The client IP is DRF's get_ident(), which only trusts X-Forwarded-For as far as
+REST_FRAMEWORK["NUM_PROXIES"] allows. Account buckets are per IP so that failures from
+elsewhere can't lock the real owner out; guesses spread over many IPs are left to the
+per-IP limit.
+"""
+import threading
+import time
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+MAX_BUCKETS = 50000
+
+# (capacity, tokens added per second)
+DEFAULT_RATES = {
+    "ip": (20, 20 / 60),
+    "account": (5, 5 / 300),
+}
+
+
+class TokenBuckets:
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, refill_rate, now=None):
+        """Take one token from key's bucket; returns 0 on success, else seconds until one is available."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_rate)
+            if tokens >= 1:
+                if len(self._buckets) >= MAX_BUCKETS and key not in self._buckets:
+                    # Crude but bounded: forgetting buckets only ever errs towards allowing
+                    self._buckets.clear()
+                self._buckets[key] = (tokens - 1, now)
+                return 0
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / refill_rate
+
+    def give(self, key, capacity):
+        with self._lock:
+            if key in self._buckets:
+                tokens, updated = self._buckets[key]
+                self._buckets[key] = (min(capacity, tokens + 1), updated)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+login_buckets = TokenBuckets()
+
+
+class LoginRateThrottle(BaseThrottle):
+    def allow_request(self, request, view):
+        rates = {**DEFAULT_RATES, **getattr(settings, "LOGIN_RATE_LIMITS", {})}
+        ident = self.get_ident(request)
+        keys = [("ip", f"ip:{ident}")]
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if isinstance(email, str) and email.strip():
+            keys.append(("account", f"account:{email.strip().lower()}:{ident}"))
+        self.wait_seconds = 0
+        taken = []
+        for scope, key in keys:
+            capacity, refill_rate = rates[scope]
+            self.wait_seconds = login_buckets.take(key, capacity, refill_rate)
+            if self.wait_seconds:
+                return False
+            taken.append((key, capacity))
+        request._login_buckets = taken
+        return True
+
+    @staticmethod
+    def refund(request):
+        """Return the tokens a successful login took."""
+        for key, capacity in getattr(request, "_login_buckets", ()):
+            login_buckets.give(key, capacity)
+
+    def wait(self):
+        return self.wait_seconds
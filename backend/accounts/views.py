@@ -7,11 +7,18 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
-from django.core.mail import send_mail
 from django.conf import settings
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from .serializers import RegisterSerializer, LoginSerializer
+from django_filters.rest_framework import DjangoFilterBackend
+from .backends import users_by_email
+from .hashing import set_password
+from backend.sparse import SparseFieldsMixin
+from .filters import UserFilter
+from .pagination import UserCursorPagination
+from .serializers import RegisterSerializer, LoginSerializer, UserListSerializer
+from .throttling import LoginRateThrottle
+from notifications.mail import enqueue_email
 
 User = get_user_model()
 
@@ -50,19 +57,28 @@ class MeView(APIView):
 class LoginView(generics.GenericAPIView):
     serializer_class = LoginSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [LoginRateThrottle]
 
     @swagger_auto_schema(tags=["Auth"])
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
+        LoginRateThrottle.refund(request)
         return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
 
-class UserListView(generics.ListAPIView):
+class UserListView(SparseFieldsMixin, generics.ListAPIView):
+    """Cursor-paginated users; ?role=, ?location= and ?fields=id,username,... are optional."""
 
-    queryset = User.objects.all()
-    serializer_class = RegisterSerializer
+    serializer_class = UserListSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = UserCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = UserFilter
+
+    def get_queryset(self):
+        # id is always loaded: the cursor is built from it
+        return self.sparse_only(User.objects.only(*UserListSerializer.Meta.fields))
 
     @swagger_auto_schema(tags=["Auth"])
     def get(self, request, *args, **kwargs):
@@ -88,9 +104,8 @@ class PasswordResetRequestView(APIView):
         if not email:
             return Response({"detail": "Email is required"}, status=400)
 
-        try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
+        user = users_by_email(email).first()
+        if user is None:
             return Response({"detail": "If the email exists, a reset was sent."}, status=200)
 
         # Generate reset token & uid
@@ -101,17 +116,8 @@ class PasswordResetRequestView(APIView):
         reset_link_base = getattr(settings, "FRONTEND_RESET_URL", None) or getattr(settings, "BACKEND_RESET_URL", None)
         if reset_link_base:
             reset_link = f"{reset_link_base}?uid={uidb64}&token={token}"
-            try:
-                send_mail(
-                    subject="Password Reset Request",
-                    message=f"Click the link to reset your password: {reset_link}",
-                    from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@example.com"),
-                    recipient_list=[email],
-                    fail_silently=True,
-                )
-            except Exception:
-                # Never fail hard on email in API
-                pass
+            # Sent by the outbox worker, so SMTP latency and failures stay out of the request
+            enqueue_email("password_reset", user.email, {"username": user.username, "reset_link": reset_link})
 
         # In DEBUG, also return uid/token (for API testing without email)
         payload = {"detail": "Reset instructions sent if email exists."}
@@ -154,7 +160,7 @@ class PasswordResetConfirmView(APIView):
             return Response({"detail": "Invalid or expired token"}, status=400)
 
         # Set new password
-        user.set_password(new_password)
+        set_password(user, new_password)
         user.save(update_fields=["password"])
 
         return Response({"detail": "Password has been reset"}, status=200)
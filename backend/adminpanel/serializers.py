@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.utils import timezone
 
+from accounts.hashing import set_password
 from accounts.models import User
 from technicians.models import TechnicianProfile
 from jobs.models import Job
@@ -34,7 +35,7 @@ class UserAdminSerializer(serializers.ModelSerializer):
         password = validated_data.pop("password", None)
         user = User(**validated_data)
         if password:
-            user.set_password(password)
+            set_password(user, password)
         else:
             user.set_unusable_password()
         user.save()
@@ -45,7 +46,7 @@ class UserAdminSerializer(serializers.ModelSerializer):
         for attr, val in validated_data.items():
             setattr(instance, attr, val)
         if password:
-            instance.set_password(password)
+            set_password(instance, password)
         instance.save()
         return instance
 
@@ -72,6 +73,8 @@ class TechnicianProfileAdminSerializer(serializers.ModelSerializer):
             "criminal_record_is_expired",
             "criminal_record_expiry_notice",
             "national_id_document",
+            "documents_verified",
+            "documents_verified_at",
             "location",
             "is_approved",
             "is_paused",
@@ -90,6 +93,8 @@ class TechnicianProfileAdminSerializer(serializers.ModelSerializer):
             "criminal_record_is_expired",
             "criminal_record_expiry_notice",
             "national_id_document",
+            "documents_verified",
+            "documents_verified_at",
             "trial_ends_at",
             "rating_avg",
             "rating_count",
@@ -101,6 +106,8 @@ class TechnicianProfileAdminSerializer(serializers.ModelSerializer):
         on_trial = bool(obj.trial_ends_at and obj.trial_ends_at >= now)
         if on_trial:
             return True
+        if hasattr(obj, "subscription_active"):
+            return obj.subscription_active
         return Subscription.objects.filter(
             user=obj.user,
             status=Subscription.Status.ACTIVE,
@@ -147,3 +154,26 @@ class SubscriptionAdminSerializer(serializers.ModelSerializer):
         ]
 
 
+
+class PaymentAdminSerializer(serializers.ModelSerializer):
+    payer_username = serializers.ReadOnlyField(source="payer.username")
+    payee_username = serializers.ReadOnlyField(source="payee.username")
+
+    class Meta:
+        model = Payment
+        fields = [
+            "id",
+            "payer",
+            "payer_username",
+            "payee",
+            "payee_username",
+            "job",
+            "application",
+            "amount",
+            "currency",
+            "status",
+            "tx_ref",
+            "provider_tx_id",
+            "created_at",
+            "completed_at",
+        ]
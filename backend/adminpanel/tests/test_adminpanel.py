@@ -1,6 +1,14 @@
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.core.handlers.asgi import ASGIHandler
+from django.test import TransactionTestCase
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework import status
 from django.contrib.auth import get_user_model
 from technicians.models import TechnicianProfile
@@ -69,3 +77,134 @@ class AdminPanelTests(APITestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertIn("pending_approvals", resp.data)
         self.assertGreaterEqual(resp.data["pending_approvals"], 1)
+
+    def test_export_technicians_csv_streams_rows(self):
+        resp = self.client.get("/api/admin/technicians/export/", {"output": "csv", "is_approved": "false"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        self.assertEqual(resp["Content-Type"], "text/csv")
+        lines = b"".join(resp.streaming_content).decode().splitlines()
+        self.assertTrue(lines[0].startswith("id,user_id,user__username"))
+        self.assertEqual(len(lines), 2)
+        self.assertIn("tech_admin", lines[1])
+
+    def test_export_payments_ndjson(self):
+        from payments.models import Payment
+        Payment.objects.create(payer=self.tech_user, amount=5000, tx_ref="exp-1")
+        Payment.objects.create(payer=self.tech_user, amount=7000, tx_ref="exp-2")
+        resp = self.client.get("/api/admin/payments/export/", {"output": "ndjson"})
+        self.assertEqual(resp.status_code, 200)
+        rows = [json.loads(line) for line in b"".join(resp.streaming_content).decode().splitlines()]
+        self.assertEqual([r["tx_ref"] for r in rows], ["exp-1", "exp-2"])
+        self.assertEqual(rows[0]["payer__username"], "tech_admin")
+
+    def test_export_rejects_unknown_output(self):
+        resp = self.client.get("/api/admin/users/export/", {"output": "xml"})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_bulk_approve_by_ids_reports_per_id_outcomes(self):
+        from technicians.signals import technician_profiles_changed
+        other = User.objects.create_user(
+            username="tech_admin2", email="tech_admin2@example.com", password="password123",
+            role="technician", location="Musanze",
+        )
+        other_profile = TechnicianProfile.objects.get(user=other)
+        events = []
+        handler = lambda sender, **kwargs: events.append(kwargs)
+        technician_profiles_changed.connect(handler)
+        self.addCleanup(technician_profiles_changed.disconnect, handler)
+
+        missing_id = other_profile.id + 1000
+        resp = self.client.post(
+            "/api/admin/technicians/bulk/approve/",
+            {"ids": [self.tech_profile.id, other_profile.id, missing_id]},
+            format="json",
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data["updated"], 2)
+        outcomes = {r["id"]: r["outcome"] for r in resp.data["results"]}
+        self.assertEqual(outcomes[missing_id], "not_found")
+        self.assertEqual(outcomes[other_profile.id], "updated")
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["profile_ids"], sorted([self.tech_profile.id, other_profile.id]))
+
+        self.tech_profile.refresh_from_db()
+        self.assertTrue(self.tech_profile.is_approved)
+        self.assertFalse(self.tech_profile.is_paused)
+        self.assertGreater(self.tech_profile.trial_ends_at, timezone.now())
+
+    def test_bulk_resume_by_filter(self):
+        resp = self.client.post("/api/admin/technicians/bulk/resume/?is_approved=false", {}, format="json")
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn(self.tech_profile.id, [r["id"] for r in resp.data["results"]])
+        self.tech_profile.refresh_from_db()
+        self.assertFalse(self.tech_profile.is_paused)
+
+    def test_bulk_requires_ids_or_filter(self):
+        resp = self.client.post("/api/admin/technicians/bulk/pause/", {}, format="json")
+        self.assertEqual(resp.status_code, 400)
+
+    def test_bulk_rejects_params_that_filter_nothing(self):
+        other = User.objects.create_user(
+            username="tech_admin3", email="tech_admin3@example.com", password="password123", role="technician",
+        )
+        for query in ("is_aproved=false", "page=1", "search=", "is_approved="):
+            resp = self.client.post(f"/api/admin/technicians/bulk/pause/?{query}", {}, format="json")
+            self.assertEqual(resp.status_code, 400, query)
+        self.assertFalse(TechnicianProfile.objects.get(user=other).is_paused)
+
+
+class ExportASGITests(TransactionTestCase):
+    # Committed rows: the ASGI handler runs the view in its own thread and connection
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="administrator", email="administrator@example.com", password="password123",
+            role="admin", is_staff=True, is_superuser=True,
+        )
+        for i in range(10):
+            User.objects.create_user(username=f"tech{i}", email=f"tech{i}@example.com", password="pass", role="technician")
+
+    def get(self, path, query=b""):
+        """Run the request through the ASGI handler; returns (start message, [(body, lines read so far)])."""
+        from adminpanel import exports
+
+        read = []
+        iter_csv = exports.iter_csv
+
+        def counting_iter_csv(header, rows):
+            for line in iter_csv(header, rows):
+                read.append(line)
+                yield line
+
+        async def request():
+            communicator = ApplicationCommunicator(ASGIHandler(), {
+                "type": "http", "method": "GET", "path": path, "query_string": query,
+                "headers": [
+                    (b"host", b"testserver"),
+                    (b"authorization", f"Bearer {AccessToken.for_user(self.admin)}".encode()),
+                ],
+            })
+            await communicator.send_input({"type": "http.request", "body": b""})
+            start = await communicator.receive_output(timeout=10)
+            bodies = []
+            while True:
+                message = await communicator.receive_output(timeout=10)
+                bodies.append((message.get("body", b""), len(read)))
+                if not message.get("more_body"):
+                    return start, bodies
+
+        with mock.patch.dict(exports.EXPORT_FORMATS, {"csv": (counting_iter_csv, "text/csv")}):
+            return async_to_sync(request)()
+
+    def test_csv_export_streams_in_chunks(self):
+        with mock.patch("adminpanel.exports.EXPORT_CHUNK_SIZE", 2):
+            start, bodies = self.get("/api/admin/technicians/export/", b"output=csv")
+        self.assertEqual(start["status"], 200)
+        chunks = [(body, read) for body, read in bodies if body]
+        self.assertGreater(len(chunks), 1)
+        lines = b"".join(body for body, _ in chunks).decode().splitlines()
+        self.assertTrue(lines[0].startswith("id,user_id,user__username"))
+        self.assertEqual(len(lines), 11)
+        # The first bytes went out before the rest of the rows were read
+        self.assertLess(chunks[0][1], len(lines))
@@ -4,6 +4,7 @@ from .views import (
     UserAdminViewSet,
     TechnicianProfileAdminViewSet,
     SubscriptionAdminViewSet,
+    PaymentAdminViewSet,
     AnalyticsViewSet,
 )
 
@@ -11,6 +12,7 @@ router = DefaultRouter()
 router.register(r"users", UserAdminViewSet, basename="admin-users")
 router.register(r"technicians", TechnicianProfileAdminViewSet, basename="admin-technicians")
 router.register(r"subscriptions", SubscriptionAdminViewSet, basename="admin-subscriptions")
+router.register(r"payments", PaymentAdminViewSet, basename="admin-payments")
 router.register(r"analytics", AnalyticsViewSet, basename="admin-analytics")
 
 urlpatterns = [
@@ -1,32 +1,56 @@
-from django.db.models import Sum
+from datetime import timedelta
+
+from django.db.models import Exists, OuterRef, Sum
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, decorators, response, status, filters
 
 from accounts.models import User
 from technicians.models import TechnicianProfile
+from technicians.signals import technician_profiles_changed
 from jobs.models import Job
 from payments.models import Payment, Subscription
+from notifications import events as notification_events
 
+from .exports import StreamingExportMixin
 from .permissions import IsAdminRoleOrStaff
 from .serializers import (
     UserAdminSerializer,
     TechnicianProfileAdminSerializer,
     TechnicianAdminMinimalSerializer,
     SubscriptionAdminSerializer,
+    PaymentAdminSerializer,
 )
 from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
 
 
-class UserAdminViewSet(viewsets.ModelViewSet):
+class UserAdminViewSet(StreamingExportMixin, viewsets.ModelViewSet):
     queryset = User.objects.all().order_by("-date_joined")
     serializer_class = UserAdminSerializer
     permission_classes = [IsAdminRoleOrStaff]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter, DjangoFilterBackend]
     search_fields = ["username", "email", "phone_number", "location"]
     filterset_fields = ["role", "is_active", "is_staff", "is_superuser"]
+    export_filename = "users"
+    export_fields = [
+        "id",
+        "username",
+        "email",
+        "first_name",
+        "last_name",
+        "role",
+        "phone_number",
+        "location",
+        "is_active",
+        "is_staff",
+        "is_superuser",
+        "date_joined",
+        "last_login",
+    ]
 
 
-class TechnicianProfileAdminViewSet(viewsets.ModelViewSet):
+class TechnicianProfileAdminViewSet(StreamingExportMixin, viewsets.ModelViewSet):
     queryset = TechnicianProfile.objects.select_related("user").prefetch_related("skills").all()
     serializer_class = TechnicianProfileAdminSerializer
     permission_classes = [IsAdminRoleOrStaff]
@@ -34,23 +58,49 @@ class TechnicianProfileAdminViewSet(viewsets.ModelViewSet):
     filterset_fields = ["is_approved", "location", "years_experience"]
     search_fields = ["user__username", "user__email", "location", "skills__name"]
     http_method_names = ["get", "post", "head", "options"]
+    export_filename = "technicians"
+    export_fields = [
+        "id",
+        "user_id",
+        "user__username",
+        "user__email",
+        "location",
+        "years_experience",
+        "is_approved",
+        "is_paused",
+        "trial_ends_at",
+        "criminal_record_uploaded_at",
+        "criminal_record_expires_at",
+        "rating_avg",
+        "rating_count",
+        "created_at",
+    ]
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if getattr(self, "action", None) in {"list", "retrieve", "pending"}:
+            # Read by TechnicianProfileAdminSerializer instead of one query per row
+            qs = qs.annotate(subscription_active=Exists(Subscription.objects.filter(
+                user=OuterRef("user"),
+                status=Subscription.Status.ACTIVE,
+                end_date__gte=timezone.now(),
+            )))
+        return qs
 
     def get_serializer_class(self):
-        if getattr(self, "action", None) in {"approve", "revoke", "pause", "resume"}:
+        if getattr(self, "action", None) in {"approve", "revoke", "pause", "resume", "bulk"}:
             return TechnicianAdminMinimalSerializer
         return super().get_serializer_class()
 
     @decorators.action(detail=True, methods=["post"], url_path="approve")
     @swagger_auto_schema(request_body=None)
     def approve(self, request, pk=None):
-        from datetime import timedelta
-        from django.utils import timezone
-
         profile = self.get_object()
         profile.is_approved = True
         profile.trial_ends_at = timezone.now() + timedelta(days=30)
         profile.is_paused = False
         profile.save(update_fields=["is_approved", "trial_ends_at", "is_paused"])
+        notification_events.technicians_approved([profile.user_id])
         return response.Response({
             "status": "approved",
             "trial_ends_at": profile.trial_ends_at,
@@ -80,6 +130,72 @@ class TechnicianProfileAdminViewSet(viewsets.ModelViewSet):
         profile.save(update_fields=["is_paused"])
         return response.Response({"status": "resumed"})
 
+    def bulk_filter_names(self):
+        filterset_class = DjangoFilterBackend().get_filterset_class(self, self.get_queryset())
+        return [*filterset_class.base_filters, filters.SearchFilter.search_param]
+
+    def bulk_filter_params(self, request):
+        names = self.bulk_filter_names()
+        return {name: value for name, value in request.query_params.items() if name in names and value.strip()}
+
+    @decorators.action(detail=False, methods=["post"], url_path=r"bulk/(?P<operation>approve|revoke|pause|resume)")
+    @swagger_auto_schema(
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "ids": openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER)),
+            },
+        ),
+        operation_description="Apply approve/revoke/pause/resume to the given ids, or to every profile "
+                              "matching the list filters in the query string (e.g. ?is_approved=false).",
+    )
+    def bulk(self, request, operation=None):
+        ids = request.data.get("ids")
+        if ids is not None:
+            if not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+                return response.Response({"detail": "ids must be a list of integers."}, status=status.HTTP_400_BAD_REQUEST)
+        elif not self.bulk_filter_params(request):
+            # An unknown or empty param filters nothing: never let it select every profile
+            return response.Response(
+                {"detail": "Provide ids in the body or a filter in the query string "
+                           f"({', '.join(self.bulk_filter_names())})."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        qs = self.filter_queryset(self.get_queryset())
+        if ids is not None:
+            qs = qs.filter(pk__in=ids)
+        matched = set(qs.values_list("pk", flat=True))
+
+        changes = {
+            "approve": {"is_approved": True, "trial_ends_at": timezone.now() + timedelta(days=30), "is_paused": False},
+            "revoke": {"is_approved": False},
+            "pause": {"is_paused": True},
+            "resume": {"is_paused": False},
+        }[operation]
+        if matched:
+            TechnicianProfile.objects.filter(pk__in=matched).update(**changes)
+            technician_profiles_changed.send(
+                sender=TechnicianProfile, profile_ids=sorted(matched), fields=sorted(changes)
+            )
+            if operation == "approve":
+                notification_events.technicians_approved(
+                    TechnicianProfile.objects.filter(pk__in=matched).values_list("user_id", flat=True)
+                )
+
+        requested = ids if ids is not None else sorted(matched)
+        payload = {
+            "status": {"approve": "approved", "revoke": "revoked", "pause": "paused", "resume": "resumed"}[operation],
+            "updated": len(matched),
+            "results": [
+                {"id": pk, "outcome": "updated" if pk in matched else "not_found"}
+                for pk in dict.fromkeys(requested)
+            ],
+        }
+        if operation == "approve":
+            payload["trial_ends_at"] = changes["trial_ends_at"]
+        return response.Response(payload)
+
     @decorators.action(detail=False, methods=["get"], url_path="pending")
     def pending(self, request):
         qs = self.get_queryset().filter(is_approved=False)
@@ -91,7 +207,7 @@ class TechnicianProfileAdminViewSet(viewsets.ModelViewSet):
         return response.Response(ser.data)
 
 
-class SubscriptionAdminViewSet(viewsets.ModelViewSet):
+class SubscriptionAdminViewSet(StreamingExportMixin, viewsets.ModelViewSet):
     queryset = Subscription.objects.select_related("user", "plan").all()
     serializer_class = SubscriptionAdminSerializer
     permission_classes = [IsAdminRoleOrStaff]
@@ -99,6 +215,46 @@ class SubscriptionAdminViewSet(viewsets.ModelViewSet):
     search_fields = ["user__username", "plan__name"]
     filterset_fields = ["status", "plan", "user"]
     http_method_names = ["get", "head", "options"]
+    export_filename = "subscriptions"
+    export_fields = [
+        "id",
+        "user_id",
+        "user__username",
+        "plan_id",
+        "plan__name",
+        "plan__price",
+        "plan__currency",
+        "status",
+        "start_date",
+        "end_date",
+        "created_at",
+    ]
+
+
+class PaymentAdminViewSet(StreamingExportMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = Payment.objects.select_related("payer", "payee").all().order_by("-created_at")
+    serializer_class = PaymentAdminSerializer
+    permission_classes = [IsAdminRoleOrStaff]
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter, DjangoFilterBackend]
+    search_fields = ["payer__username", "payee__username", "tx_ref", "provider_tx_id"]
+    filterset_fields = ["status", "currency", "payer", "payee"]
+    export_filename = "payments"
+    export_fields = [
+        "id",
+        "payer_id",
+        "payer__username",
+        "payee_id",
+        "payee__username",
+        "job_id",
+        "application_id",
+        "amount",
+        "currency",
+        "status",
+        "tx_ref",
+        "provider_tx_id",
+        "created_at",
+        "completed_at",
+    ]
 
 
 class AnalyticsViewSet(viewsets.ViewSet):
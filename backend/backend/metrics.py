@@ -0,0 +1,214 @@
+"""
+Per-request instrumentation.
+
+RequestMetricsMiddleware records for every HTTP request the number of SQL queries and the
+time spent in them, the time spent rendering the response body (where DRF encodes the
+serialized data), the response size and the total latency. Each request is logged as one
+JSON line on the "backend.metrics" logger and added to per-endpoint aggregates, keyed by
+the resolved URL name (job-list, technician-list, ...), which metrics_view exposes in the
+Prometheus text format. Aggregates live in the process: scrape every worker.
+"""
+import json
+import logging
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+UNRESOLVED = "unresolved"
+
+
+class RequestMetrics:
+    """Measurements for one request; also the execute_wrapper that counts its queries."""
+
+    def __init__(self, method):
+        self.endpoint = UNRESOLVED
+        self.method = method
+        self.status = None
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.serialization_seconds = 0.0
+        self.response_bytes = None
+        self.duration_seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_seconds += time.perf_counter() - started
+
+    def as_dict(self):
+        return {
+            "endpoint": self.endpoint,
+            "method": self.method,
+            "status": self.status,
+            "queries": self.queries,
+            "sql_ms": round(self.sql_seconds * 1000, 3),
+            "serialization_ms": round(self.serialization_seconds * 1000, 3),
+            "response_bytes": self.response_bytes,
+            "duration_ms": round(self.duration_seconds * 1000, 3),
+        }
+
+
+class _Series:
+    def __init__(self):
+        self.count = 0
+        self.duration_sum = 0.0
+        self.duration_buckets = [0] * len(DURATION_BUCKETS)
+        self.queries_sum = 0
+        self.query_buckets = [0] * len(QUERY_BUCKETS)
+        self.sql_sum = 0.0
+        self.serialization_sum = 0.0
+        self.bytes_sum = 0
+
+    def add(self, metrics):
+        self.count += 1
+        self.duration_sum += metrics.duration_seconds
+        self.queries_sum += metrics.queries
+        self.sql_sum += metrics.sql_seconds
+        self.serialization_sum += metrics.serialization_seconds
+        self.bytes_sum += metrics.response_bytes or 0
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if metrics.duration_seconds <= bound:
+                self.duration_buckets[i] += 1
+        for i, bound in enumerate(QUERY_BUCKETS):
+            if metrics.queries <= bound:
+                self.query_buckets[i] += 1
+
+
+_series = {}  # (endpoint, method) -> _Series
+_responses = {}  # (endpoint, method, status) -> count
+_lock = threading.Lock()
+
+
+def record(metrics):
+    with _lock:
+        key = (metrics.endpoint, metrics.method)
+        if key not in _series:
+            _series[key] = _Series()
+        _series[key].add(metrics)
+        status_key = key + (str(metrics.status),)
+        _responses[status_key] = _responses.get(status_key, 0) + 1
+
+
+def reset_metrics():
+    with _lock:
+        _series.clear()
+        _responses.clear()
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _histogram(lines, name, labels, bounds, counts, total, count):
+    for bound, value in zip(bounds, counts):
+        lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {value}")
+    lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {count}")
+    lines.append(f"{name}_sum{_labels(**labels)} {total}")
+    lines.append(f"{name}_count{_labels(**labels)} {count}")
+
+
+def render_prometheus():
+    with _lock:
+        series = sorted(_series.items())
+        responses = sorted(_responses.items())
+        lines = [
+            "# HELP http_requests_total Requests handled, by resolved URL name, method and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (endpoint, method, status), count in responses:
+            lines.append(f"http_requests_total{_labels(endpoint=endpoint, method=method, status=status)} {count}")
+
+        lines += [
+            "# HELP http_request_duration_seconds Time from the first middleware to the response.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (endpoint, method), s in series:
+            _histogram(lines, "http_request_duration_seconds", {"endpoint": endpoint, "method": method},
+                       DURATION_BUCKETS, s.duration_buckets, s.duration_sum, s.count)
+
+        lines += [
+            "# HELP http_request_db_queries SQL queries run per request.",
+            "# TYPE http_request_db_queries histogram",
+        ]
+        for (endpoint, method), s in series:
+            _histogram(lines, "http_request_db_queries", {"endpoint": endpoint, "method": method},
+                       QUERY_BUCKETS, s.query_buckets, s.queries_sum, s.count)
+
+        for name, help_text, attribute in (
+            ("http_request_db_seconds_total", "Time spent executing SQL.", "sql_sum"),
+            ("http_request_serialization_seconds_total", "Time spent rendering response bodies.", "serialization_sum"),
+            ("http_response_bytes_total", "Response body bytes (streamed responses excluded).", "bytes_sum"),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (endpoint, method), s in series:
+                lines.append(f"{name}{_labels(endpoint=endpoint, method=method)} {getattr(s, attribute)}")
+    return "\n".join(lines) + "\n"
+
+
+def _endpoint(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return UNRESOLVED
+    return match.view_name or match.route or UNRESOLVED
+
+
+class RequestMetricsMiddleware:
+    """Keep first in MIDDLEWARE so the other middleware's queries and time are included."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = request.metrics = RequestMetrics(request.method)
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics))
+            response = self.get_response(request)
+        metrics.duration_seconds = time.perf_counter() - started
+        metrics.endpoint = _endpoint(request)
+        metrics.status = response.status_code
+        if not response.streaming:
+            metrics.response_bytes = len(response.content)
+        record(metrics)
+        logger.info(json.dumps(metrics.as_dict()))
+        return response
+
+    def process_template_response(self, request, response):
+        # Runs right before render(); DRF responses encode their data there
+        metrics = getattr(request, "metrics", None)
+        if metrics is not None:
+            started = time.perf_counter()
+
+            def rendered(_response):
+                metrics.serialization_seconds += time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+
+def metrics_view(request):
+    """Prometheus text exposition; needs "Authorization: Bearer <METRICS_TOKEN>" unless DEBUG."""
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token and not settings.DEBUG:
+        raise Http404
+    if token and not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponse(status=401)
+    return HttpResponse(render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
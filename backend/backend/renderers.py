@@ -0,0 +1,101 @@
+"""
+JSON rendering and parsing backed by orjson when it is installed.
+
+FastJSONRenderer produces the same bytes as DRF's JSONRenderer for the compact output
+this API returns: datetimes, decimals and other types orjson would format differently
+are handed to DRF's encoder, U+2028/U+2029 are escaped the way DRF does, and output
+with a float in exponent form is redone with the stdlib encoder. The one difference:
+NaN and infinity render as null where DRF raises ValueError. Indented output (the
+browsable API, ?indent=) and installs without orjson use the stdlib path. dumps_text()
+is the shared encoder for WebSocket frames.
+"""
+import json
+import re
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional accelerator
+    orjson = None
+
+_encoder = JSONEncoder()
+
+
+def _enabled():
+    return orjson is not None and getattr(settings, "FAST_JSON_ENABLED", True)
+
+
+_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+# Where a number in exponent form would continue; a literal first byte keeps the scan fast
+_EXPONENT = re.compile(rb"e-?[0-9]")
+
+
+def _has_exponent(ret):
+    """Whether orjson wrote a number (or float key) in exponent form: 1e16 where json writes 1e+16."""
+    for match in _EXPONENT.finditer(ret):
+        end = start = match.start()
+        while start and ret[start - 1] in b"0123456789.":
+            start -= 1
+        if start == end:
+            continue
+        if ret[start - 1:start] == b"-":
+            start -= 1
+        before = ret[start - 1:start]
+        # A string that merely looks like a key only costs the slower path
+        if start == 0 or before in (b":", b",", b"[") or (before == b'"' and ret[start - 2:start - 1] in (b"{", b",")):
+            return True
+    return False
+
+
+def dumps(data):
+    """Compact JSON bytes, identical to DRF's JSONRenderer output for finite numbers."""
+    ret = None
+    if _enabled():
+        ret = orjson.dumps(data, default=_encoder.default, option=_OPTIONS)
+        if _has_exponent(ret):
+            ret = None
+    if ret is None:
+        ret = json.dumps(data, cls=JSONEncoder, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+    # Valid JSON but not valid JavaScript; DRF escapes them too
+    if b"\xe2\x80" in ret:
+        ret = ret.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
+    return ret
+
+
+def dumps_text(data):
+    return dumps(data).decode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if not _enabled() or self.get_indent(accepted_media_type or "", renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return dumps(data)
+        except orjson.JSONEncodeError:
+            # Whatever orjson refuses (e.g. integers over 64 bits) gets the stdlib path
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class FastJSONParser(JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        if not _enabled():
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            raw = stream.read()
+            if encoding.lower().replace("-", "") != "utf8":
+                raw = raw.decode(encoding)
+            return orjson.loads(raw)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,149 @@
+"""
+Read-replica routing for public read endpoints.
+
+Views opt in with ReplicaReadMixin: their safe requests read from a healthy replica listed
+in DATABASE_REPLICAS, everything else stays on the primary. A user who just wrote is pinned
+to the primary for REPLICA_PIN_SECONDS (ReplicaPinningMiddleware records the write) so they
+read their own writes. Replicas more than REPLICA_MAX_LAG_SECONDS behind, or unreachable,
+are skipped until the next check; with none left, reads go to the primary. Each request
+picks one replica and reads everything from it, so its queries see a single snapshot.
+
+A pin is kept twice: in the default cache (shared between workers when CACHE_URL is
+set) and in a signed cookie, which any worker can verify even without a shared cache.
+"""
+import contextvars
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+_read_alias = contextvars.ContextVar("read_alias", default=None)
+
+_health = {}  # alias -> (checked at, healthy)
+_health_lock = threading.Lock()
+
+
+PIN_COOKIE = "replica_pin"
+_PIN_SALT = "backend.replicas.pin"
+
+
+def _pin_key(user_id):
+    return f"replicas:pin:{user_id}"
+
+
+def pin_to_primary(user_id, response=None):
+    seconds = getattr(settings, "REPLICA_PIN_SECONDS", 10)
+    cache.set(_pin_key(user_id), True, seconds)
+    if response is not None:
+        response.set_signed_cookie(
+            PIN_COOKIE, str(user_id), salt=_PIN_SALT, max_age=seconds, httponly=True, samesite="Lax",
+        )
+
+
+def is_pinned(user, request=None):
+    if user is None or not user.is_authenticated:
+        return False
+    if request is not None:
+        seconds = getattr(settings, "REPLICA_PIN_SECONDS", 10)
+        if request.get_signed_cookie(PIN_COOKIE, None, salt=_PIN_SALT, max_age=seconds) == str(user.pk):
+            return True
+    return bool(cache.get(_pin_key(user.pk)))
+
+
+def replica_lag(alias):
+    """Seconds alias is behind the primary. Only PostgreSQL standbys report lag; others count as current."""
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return 0.0
+    with connection.cursor() as cursor:
+        # An idle primary sends nothing to replay, so only count time while WAL is still outstanding
+        cursor.execute(
+            "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+            "THEN 0 ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+        )
+        return float(cursor.fetchone()[0])
+
+
+def healthy_replicas():
+    interval = getattr(settings, "REPLICA_LAG_CHECK_INTERVAL", 2.0)
+    max_lag = getattr(settings, "REPLICA_MAX_LAG_SECONDS", 5.0)
+    healthy = []
+    for alias in getattr(settings, "DATABASE_REPLICAS", []):
+        now = time.monotonic()
+        with _health_lock:
+            checked = _health.get(alias)
+        if checked is None or now - checked[0] >= interval:
+            try:
+                ok = replica_lag(alias) <= max_lag
+            except DatabaseError:
+                ok = False
+            checked = (now, ok)
+            with _health_lock:
+                _health[alias] = checked
+        if checked[1]:
+            healthy.append(alias)
+    return healthy
+
+
+def reset_replica_health():
+    with _health_lock:
+        _health.clear()
+
+
+class ReplicaRouter:
+    """Sends reads to a replica inside ReplicaReadMixin views; everything else uses the primary."""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        databases = {DEFAULT_DB_ALIAS, *getattr(settings, "DATABASE_REPLICAS", [])}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaReadMixin:
+    """For public read views: safe requests read from a replica unless the user is pinned."""
+
+    def dispatch(self, request, *args, **kwargs):
+        token = _read_alias.set(None)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        # After authentication, so a pinned user is recognised
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not is_pinned(request.user, request):
+            replicas = healthy_replicas()
+            _read_alias.set(random.choice(replicas) if replicas else DEFAULT_DB_ALIAS)
+
+
+class ReplicaPinningMiddleware:
+    """Pins users to the primary after a successful write request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and getattr(settings, "DATABASE_REPLICAS", [])
+        ):
+            # DRF copies the authenticated user onto the Django request
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                pin_to_primary(user.pk, response)
+        return response
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 from datetime import timedelta
+from importlib.util import find_spec
 import os
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -68,9 +69,14 @@ INSTALLED_APPS = [
     'technicians',
     'payments',
     'adminpanel',
+    'geo',
+    'notifications',
+    'benchmarks',
 ]
 
 MIDDLEWARE = [
+    'backend.metrics.RequestMetricsMiddleware',
+    'backend.replicas.ReplicaPinningMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -106,13 +112,89 @@ TEMPLATES = [
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+# DB_ENGINE=postgres selects PostgreSQL (DB_* variables); anything else uses SQLite at SQLITE_PATH
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite').lower()
+
+# Run on every new SQLite connection. WAL lets reads proceed while one writer commits, and
+# synchronous=NORMAL is durable across application crashes in WAL mode (fsync at checkpoints).
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'wal'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'normal'),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+    'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', '-65536')),  # negative: KiB, so 64 MiB
+    'temp_store': os.getenv('SQLITE_TEMP_STORE', 'memory'),
 }
 
+# PostgreSQL connections come from psycopg's pool (psycopg[pool]) of up to DB_POOL_MAX_SIZE.
+# Under ASGI each request's sync code can run on a fresh thread, and a persistent connection
+# (CONN_MAX_AGE) stays with its thread, so they would pile up until Postgres refuses more.
+# DB_POOL_MAX_SIZE=0 opens one connection per request instead; DB_CONN_MAX_AGE is for WSGI only.
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+
+if DB_ENGINE in ('postgres', 'postgresql'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'backend'),
+            'USER': os.getenv('DB_USER', 'postgres'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': 0 if DB_POOL_MAX_SIZE else int(os.getenv('DB_CONN_MAX_AGE', '0')),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                # Per-session limits so a runaway query or an abandoned transaction can't hold locks indefinitely
+                'options': ' '.join([
+                    f"-c statement_timeout={int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '15000'))}",
+                    f"-c lock_timeout={int(os.getenv('DB_LOCK_TIMEOUT_MS', '5000'))}",
+                    f"-c idle_in_transaction_session_timeout={int(os.getenv('DB_IDLE_IN_TRANSACTION_TIMEOUT_MS', '60000'))}",
+                ]),
+            },
+        }
+    }
+    if DB_POOL_MAX_SIZE:
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # Seconds a writer waits for the lock before "database is locked"
+                'timeout': float(os.getenv('SQLITE_BUSY_TIMEOUT', '20')),
+                # Take the write lock at BEGIN: a read transaction that later writes can't wait
+                # on the busy timeout, it fails straight away
+                'transaction_mode': os.getenv('SQLITE_TRANSACTION_MODE', 'IMMEDIATE'),
+                'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+            },
+        }
+    }
+
+# Read replicas for the public read endpoints (see backend/replicas.py): SQLite files listed in
+# SQLITE_REPLICA_PATHS, or PostgreSQL hosts (host or host:port) in DB_REPLICA_HOSTS sharing the
+# primary's credentials. Tests mirror them onto the default database.
+_replica_env = 'DB_REPLICA_HOSTS' if DB_ENGINE in ('postgres', 'postgresql') else 'SQLITE_REPLICA_PATHS'
+DATABASE_REPLICAS = []
+for _i, _target in enumerate((t.strip() for t in os.getenv(_replica_env, '').split(',') if t.strip()), 1):
+    _replica = {**DATABASES['default'], 'OPTIONS': dict(DATABASES['default']['OPTIONS']), 'TEST': {'MIRROR': 'default'}}
+    if _replica_env == 'SQLITE_REPLICA_PATHS':
+        _replica['NAME'] = _target
+    else:
+        _host, _, _port = _target.partition(':')
+        _replica.update(HOST=_host, PORT=_port or _replica['PORT'])
+    DATABASES[f'replica{_i}'] = _replica
+    DATABASE_REPLICAS.append(f'replica{_i}')
+DATABASE_ROUTERS = ['backend.replicas.ReplicaRouter']
+# Seconds a user reads from the primary after writing; replicas further behind than
+# REPLICA_MAX_LAG_SECONDS are skipped (lag is re-checked every REPLICA_LAG_CHECK_INTERVAL seconds)
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '10'))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', '5'))
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv('REPLICA_LAG_CHECK_INTERVAL', '2'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -163,18 +245,92 @@ EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', EMAIL_HOST_USER or 'no-reply@example.com')
 
+# Uploads above this size are spooled to a temp file and moved into storage instead of held in memory
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv('FILE_UPLOAD_MAX_MEMORY_SIZE', str(2 * 1024 * 1024)))
+
+# Local worker pool for off-request work (see backend/tasks.py)
+BACKGROUND_TASK_WORKERS = int(os.getenv('BACKGROUND_TASK_WORKERS', '4'))
+BACKGROUND_TASKS_EAGER = os.getenv('BACKGROUND_TASKS_EAGER', 'False').lower() in ('1', 'true', 'yes')
+
+# Technician credential uploads (see technicians/documents.py)
+DOCUMENT_MAX_UPLOAD_SIZE = int(os.getenv('DOCUMENT_MAX_UPLOAD_SIZE', str(10 * 1024 * 1024)))
+
+# Seconds before the in-memory skill search index is rebuilt even without local Skill changes
+SKILL_INDEX_TTL = int(os.getenv('SKILL_INDEX_TTL', '300'))
+
+# Seconds between full rebuilds of the technician recommendation index (changes are applied incrementally in between)
+RECOMMENDATION_INDEX_TTL = int(os.getenv('RECOMMENDATION_INDEX_TTL', '600'))
+
+# "Jobs for me" feed: how far back and how many active jobs are scored, and cache lifetimes in seconds
+JOB_FEED_WINDOW_DAYS = int(os.getenv('JOB_FEED_WINDOW_DAYS', '60'))
+JOB_FEED_MAX_JOBS = int(os.getenv('JOB_FEED_MAX_JOBS', '5000'))
+JOB_FEED_INDEX_TTL = int(os.getenv('JOB_FEED_INDEX_TTL', '300'))
+JOB_FEED_CACHE_TIMEOUT = int(os.getenv('JOB_FEED_CACHE_TIMEOUT', '300'))
+
+# Seconds before the saved-search matcher reloads searches changed by other processes
+SAVED_SEARCH_INDEX_TTL = int(os.getenv('SAVED_SEARCH_INDEX_TTL', '60'))
+
+# Notifications queued within this many seconds are stored and pushed together
+NOTIFICATION_COALESCE_SECONDS = float(os.getenv('NOTIFICATION_COALESCE_SECONDS', '0.25'))
+
+# Email outbox: send right after commit in a background task (the send_outbox command works either way)
+EMAIL_OUTBOX_AUTOSEND = os.getenv('EMAIL_OUTBOX_AUTOSEND', 'True').lower() in ('1', 'true', 'yes')
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', '5'))
+
+# check_criminal_records: default reminder window before a certificate expires
+CRIMINAL_RECORD_REMINDER_DAYS = int(os.getenv('CRIMINAL_RECORD_REMINDER_DAYS', '14'))
+
+# Per-request query/latency metrics (see backend/metrics.py); /metrics/ needs the bearer token unless DEBUG
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() in ('1', 'true', 'yes')
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
 # Password reset redirect targets
 FRONTEND_RESET_URL = os.getenv('FRONTEND_RESET_URL')
 BACKEND_RESET_URL = os.getenv('BACKEND_RESET_URL')
 
 
+# Default cache. Job feed versions, authenticated-user invalidation and replica pins live here, so
+# with more than one worker process CACHE_URL must point at a shared Redis (e.g.
+# redis://127.0.0.1:6379/2); the per-process fallback is only correct for a single worker.
+CACHE_URL = os.getenv('CACHE_URL', '')
+if CACHE_URL.startswith(('redis://', 'rediss://', 'unix://')):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
+# Seconds an authenticated user row is reused by CachedJWTAuthentication and the chat middleware
+AUTH_USER_CACHE_TTL = float(os.getenv('AUTH_USER_CACHE_TTL', '30'))
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
-    )
+    ),
+    # orjson-backed when installed; same bytes as DRF's JSON renderer except NaN/infinity (see backend.renderers)
+    "DEFAULT_RENDERER_CLASSES": (
+        "backend.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "backend.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+    # Reverse proxies in front of the app; throttles trust that many X-Forwarded-For hops and
+    # otherwise use REMOTE_ADDR (left unset, DRF would believe any client-supplied header)
+    "NUM_PROXIES": int(os.getenv('NUM_PROXIES', '0')),
 }
 SWAGGER_SETTINGS = {
     "SECURITY_DEFINITIONS": {
@@ -189,6 +345,28 @@ SWAGGER_SETTINGS = {
 
 AUTH_USER_MODEL = 'accounts.User'
 
+# Password hashing: the tier's hasher signs new passwords, the others still verify older
+# hashes, which are rehashed on the next login. argon2 needs the argon2-cffi package.
+PASSWORD_HASHING_TIER = os.getenv('PASSWORD_HASHING_TIER', 'argon2' if find_spec('argon2') else 'scrypt')
+PASSWORD_HASHER_TIERS = {
+    'argon2': 'accounts.hashing.TunedArgon2PasswordHasher',
+    'scrypt': 'accounts.hashing.TunedScryptPasswordHasher',
+    'pbkdf2': 'accounts.hashing.TunedPBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [PASSWORD_HASHER_TIERS[PASSWORD_HASHING_TIER]] + [
+    hasher for tier, hasher in PASSWORD_HASHER_TIERS.items() if tier != PASSWORD_HASHING_TIER
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+PASSWORD_HASHING_WORKERS = int(os.getenv('PASSWORD_HASHING_WORKERS', '0')) or None  # default: one per core
+
+# Email logins in one indexed query; username logins (Django admin) fall through to ModelBackend
+AUTHENTICATION_BACKENDS = ['accounts.backends.EmailBackend']
+
+# Token buckets for LoginView: scope -> (burst capacity, tokens refilled per second)
+LOGIN_RATE_LIMITS = {
+    'ip': (int(os.getenv('LOGIN_RATE_IP_BURST', '20')), float(os.getenv('LOGIN_RATE_IP_PER_MINUTE', '20')) / 60),
+    'account': (int(os.getenv('LOGIN_RATE_ACCOUNT_BURST', '5')), float(os.getenv('LOGIN_RATE_ACCOUNT_PER_HOUR', '60')) / 3600),
+}
+
 ASGI_APPLICATION = "backend.asgi.application"  # NEW (project package is "backend")
 
 # Channel layers
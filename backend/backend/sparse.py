@@ -0,0 +1,184 @@
+"""
+Sparse fieldsets and a values()-based fast path for list endpoints.
+
+``?fields=id,title`` limits a list response to those top-level fields. Views mixing in
+SparseFieldsMixin pass the choice to their serializer (which mixes in
+SparseFieldsSerializerMixin) and load only the model columns behind the kept fields.
+
+ValuesRowSerializer is the fast path for the hottest lists: it fetches plain
+values_list() tuples and turns each into a dict with a precompiled list of converters
+taken from the view's ModelSerializer fields, so the JSON is byte-for-byte what the
+ModelSerializer would produce, without building model instances or walking DRF's
+per-field machinery for every row.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from django.db.models.fields.files import FieldFile
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+# Field classes whose to_representation is the identity for the Python values values() returns
+_PASSTHROUGH = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.ReadOnlyField,
+)
+
+
+class SparseFieldsSerializerMixin:
+    """Accepts fields=[...] and drops every other top-level field."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SparseFieldsMixin:
+    """
+    Generic-view mixin for ?fields=. ``sparse_columns`` maps serializer fields to the model
+    columns they need when that can't be read off the field's source (use [] for none).
+    """
+
+    sparse_fields_param = "fields"
+    sparse_columns = {}
+
+    def get_sparse_fields(self):
+        """The requested field names in declaration order, or None for all of them."""
+        if not hasattr(self, "_sparse_fields"):
+            self._sparse_fields = None
+            raw = self.request.query_params.get(self.sparse_fields_param) if self.request else None
+            if raw:
+                requested = {part.strip() for part in raw.split(",")}
+                fields = [name for name in self.get_serializer_class().Meta.fields if name in requested]
+                if not fields:
+                    allowed = ", ".join(self.get_serializer_class().Meta.fields)
+                    raise ValidationError({self.sparse_fields_param: f"Choose from: {allowed}."})
+                self._sparse_fields = fields
+        return self._sparse_fields
+
+    def wants_field(self, name):
+        fields = self.get_sparse_fields()
+        return fields is None or name in fields
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", self.get_sparse_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def sparse_only(self, queryset):
+        """queryset.only() the columns behind the requested fields; unchanged when all are requested."""
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        model = queryset.model
+        by_name = {f.name: f for f in model._meta.concrete_fields}
+        by_attname = {f.attname: f for f in model._meta.concrete_fields}
+        declared = self.get_serializer_class()._declared_fields
+        columns = [model._meta.pk.name]
+        for name in fields:
+            if name in self.sparse_columns:
+                columns.extend(self.sparse_columns[name])
+                continue
+            source = getattr(declared.get(name), "source", None) or name
+            field = by_name.get(source) or by_attname.get(source)
+            if field is not None:
+                columns.append(field.name)
+        return queryset.only(*dict.fromkeys(columns))
+
+
+class ValuesRowSerializer:
+    """
+    Serialize values_list() rows the way serializer would serialize the instances.
+
+    ``lookups`` maps each output field to the values() lookup that holds its value (by
+    default the field's source). ``converters`` overrides how a value is represented, for
+    method fields and the like; other fields reuse the serializer field's to_representation,
+    skipped entirely for types that need no conversion. Fields named in ``deferred`` get no
+    column; fill them in after serialize(), e.g. from a second query for nested lists.
+    ``extra`` lookups are fetched without being output (see index()).
+    """
+
+    def __init__(self, serializer, lookups=None, converters=None, deferred=(), extra=()):
+        lookups, converters = lookups or {}, converters or {}
+        model = serializer.Meta.model
+        file_fields = {f.name: f for f in model._meta.concrete_fields if isinstance(f, models.FileField)}
+        self.lookups, plan = list(extra), []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if name in deferred:
+                # Placeholder so the key keeps its position once the caller fills it in
+                plan.append((name, None, None))
+                continue
+            if isinstance(field, serializers.SerializerMethodField) and (name not in lookups or name not in converters):
+                raise ImproperlyConfigured(f"Method field '{name}' needs both a lookup and a converter.")
+            lookup = lookups.get(name) or field.source.replace(".", "__")
+            if lookup not in self.lookups:
+                self.lookups.append(lookup)
+            convert = converters.get(name)
+            if convert is None and lookup in file_fields:
+                convert = _file_converter(field, file_fields[lookup])
+            elif convert is None and not isinstance(field, _PASSTHROUGH):
+                convert = field.to_representation
+            plan.append((name, self.lookups.index(lookup), convert))
+        self.plan = plan
+
+    def values(self, queryset):
+        return queryset.values_list(*self.lookups)
+
+    def index(self, lookup):
+        return self.lookups.index(lookup)
+
+    def serialize(self, rows):
+        plan = self.plan
+        data = []
+        for row in rows:
+            item = {}
+            for name, index, convert in plan:
+                value = None if index is None else row[index]
+                # DRF leaves None alone for every field type
+                item[name] = value if convert is None or value is None else convert(value)
+            data.append(item)
+        return data
+
+
+class ValuesListMixin(SparseFieldsMixin):
+    """
+    Serves list() through get_values_serializer() when it returns one; pagination,
+    filtering and ?fields= behave exactly as on the ModelSerializer path.
+    """
+
+    use_values_path = True  # as_view(use_values_path=False) forces the ModelSerializer path
+
+    def get_values_serializer(self, serializer, queryset):
+        """A ValuesRowSerializer for serializer and the filtered queryset, or None for the normal path."""
+        return None
+
+    def finish_values_rows(self, data, rows, values_serializer):
+        """Fill in deferred fields; rows are the fetched tuples, parallel to data."""
+        return data
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_values_path:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        values_serializer = self.get_values_serializer(self.get_serializer(), queryset)
+        if values_serializer is None:
+            return super().list(request, *args, **kwargs)
+        queryset = values_serializer.values(queryset)
+        page = self.paginate_queryset(queryset)
+        rows = list(page if page is not None else queryset)
+        data = self.finish_values_rows(values_serializer.serialize(rows), rows, values_serializer)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+def _file_converter(field, model_field):
+    def convert(name):
+        # values() returns the stored name; the field needs a FieldFile to build the URL
+        return field.to_representation(FieldFile(None, model_field, name))
+    return convert
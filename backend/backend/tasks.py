@@ -0,0 +1,68 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = set()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "BACKGROUND_TASK_WORKERS", 4),
+                thread_name_prefix="background-task",
+            )
+    return _executor
+
+
+def _run(func, args, kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", getattr(func, "__qualname__", func))
+    finally:
+        # Worker threads open their own connections; don't leak them between tasks
+        connections.close_all()
+
+
+def run_in_background(func, *args, **kwargs):
+    """
+    Run func(*args, **kwargs) on the local worker pool once the current transaction commits.
+
+    With settings.BACKGROUND_TASKS_EAGER the call runs inline instead, which is what
+    tests and one-off management commands want.
+    """
+    if getattr(settings, "BACKGROUND_TASKS_EAGER", False):
+        func(*args, **kwargs)
+        return
+    transaction.on_commit(lambda: _submit(func, args, kwargs))
+
+
+def _submit(func, args, kwargs):
+    future = _get_executor().submit(_run, func, args, kwargs)
+    with _executor_lock:
+        _pending.add(future)
+    future.add_done_callback(_forget)
+
+
+def _forget(future):
+    with _executor_lock:
+        _pending.discard(future)
+
+
+def wait_for_background_tasks():
+    """Block until every submitted task, including ones queued by other tasks, has finished."""
+    while True:
+        with _executor_lock:
+            pending = set(_pending)
+        if not pending:
+            return
+        wait(pending)
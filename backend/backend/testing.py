@@ -0,0 +1,24 @@
+"""Test helpers shared across apps."""
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin checking responses against per-endpoint query budgets.
+
+    query_budgets maps resolved URL names (as recorded by RequestMetricsMiddleware) to the
+    most queries one request may run; seed more than one row so an N+1 shows up.
+    """
+
+    query_budgets = {}
+
+    def assertQueryBudget(self, response, budget=None):
+        metrics = getattr(response.wsgi_request, "metrics", None)
+        if metrics is None:
+            self.fail("No request metrics recorded; is RequestMetricsMiddleware enabled?")
+        if budget is None:
+            if metrics.endpoint not in self.query_budgets:
+                self.fail(f"No query budget set for {metrics.endpoint}.")
+            budget = self.query_budgets[metrics.endpoint]
+        if metrics.queries > budget:
+            self.fail(f"{metrics.endpoint} ran {metrics.queries} queries, over its budget of {budget}.")
+        return metrics
@@ -4,6 +4,8 @@ from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
+from .metrics import metrics_view
+
 schema_view = get_schema_view(
     openapi.Info(
         title="Chat API",
@@ -26,6 +28,8 @@ urlpatterns = [
     path('api/employers/', include("employers.urls")),
     path('api/chat/', include("chat.urls")),
     path('api/payments/', include('payments.urls')),
+    path('api/notifications/', include('notifications.urls')),
+    path('metrics/', metrics_view, name='metrics'),
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
     
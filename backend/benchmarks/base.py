@@ -0,0 +1,59 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+
+def measure(func, iterations, warmup=1):
+    """Call func iterations times; returns per-call timings in seconds."""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summarize(timings):
+    ordered = sorted(timings)
+    return {
+        "calls": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 3),
+        "per_second": round(len(ordered) / sum(ordered), 1) if sum(ordered) else None,
+    }
+
+
+class BenchmarkCommand(BaseCommand):
+    """
+    Base for benchmark_* commands: run() returns a list of result rows (dicts), printed
+    as a table or, with --json, as one JSON document for run_benchmarks to collect.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+
+    def run(self, **options):
+        raise NotImplementedError
+
+    def handle(self, *args, **options):
+        rows = self.run(**options)
+        if options["json"]:
+            self.stdout.write(json.dumps({"benchmark": self.benchmark_name(), "results": rows}))
+            return
+        if not rows:
+            self.stdout.write("No results")
+            return
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        widths = {c: max(len(c), *(len(str(row.get(c, ""))) for row in rows)) for c in columns}
+        self.stdout.write("  ".join(c.ljust(widths[c]) for c in columns).rstrip())
+        for row in rows:
+            self.stdout.write("  ".join(str(row.get(c, "")).ljust(widths[c]) for c in columns).rstrip())
+
+    def benchmark_name(self):
+        return self.__module__.rsplit(".", 1)[-1].removeprefix("benchmark_")
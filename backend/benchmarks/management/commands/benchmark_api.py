@@ -0,0 +1,200 @@
+import asyncio
+import time
+import uuid
+from itertools import islice
+
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from backend.replicas import reset_replica_health
+from backend.tasks import wait_for_background_tasks
+from benchmarks.base import BenchmarkCommand, summarize
+from benchmarks.seeding import CATEGORIES, LOCATIONS, SEARCH_TERMS, SKILLS, seed_marketplace
+from chat.models import Room
+from jobs.models import Job, JobApplication
+
+User = get_user_model()
+
+SCENARIOS = ("job_search", "technician_list", "apply", "employer_applicants", "chat")
+IN_MEMORY_CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+
+
+class Command(BenchmarkCommand):
+    help = (
+        "Scripted scenarios against the hot API endpoints and the chat WebSocket, run in process: "
+        "latency percentiles and requests per second for one client."
+    )
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--scenario", choices=SCENARIOS, action="append", help="Limit to these scenarios (repeatable).")
+        parser.add_argument("--scale", type=int, default=1,
+                            help="Multiplier for the seeded data (1: 20 employers, 200 technicians, 400 jobs).")
+        parser.add_argument("--iterations", type=int, default=200, help="Requests (or chat messages) per scenario.")
+        parser.add_argument("--in-place", action="store_true",
+                            help="Seed and run against the configured database instead of a throwaway test "
+                                 "database; the seeded rows are left behind.")
+        parser.add_argument("--configured-channel-layer", action="store_true",
+                            help="Use CHANNEL_LAYERS (e.g. Redis) for the chat scenario instead of the in-memory layer.")
+
+    def run(self, **options):
+        if options["in_place"]:
+            return self.run_scenarios(options)
+        # Same database the test runner would build: in-memory on SQLite, test_<NAME> on Postgres
+        connection = connections[DEFAULT_DB_ALIAS]
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        # Replicas follow it as the runner's TEST MIRROR does, or public reads would miss the seeded rows
+        replicas = {alias: dict(connections[alias].settings_dict) for alias in settings.DATABASE_REPLICAS}
+        for alias in replicas:
+            connections[alias].close()
+            connections[alias].creation.set_as_test_mirror(connection.settings_dict)
+        reset_replica_health()
+        try:
+            return self.run_scenarios(options)
+        finally:
+            for alias, settings_dict in replicas.items():
+                connections[alias].close()
+                connections[alias].settings_dict = settings_dict
+            reset_replica_health()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def run_scenarios(self, options):
+        data = self.seed(options["scale"])
+        channel_layers = {} if options["configured_channel_layer"] else {"CHANNEL_LAYERS": IN_MEMORY_CHANNEL_LAYERS}
+        rows = []
+        with override_settings(**channel_layers):
+            try:
+                for name in options["scenario"] or SCENARIOS:
+                    timings, errors = getattr(self, f"scenario_{name}")(data, options["iterations"])
+                    stats = summarize(timings)
+                    rows.append({
+                        "scenario": name,
+                        "requests": stats["calls"],
+                        "errors": errors,
+                        "p50_ms": stats["p50_ms"],
+                        "p95_ms": stats["p95_ms"],
+                        "p99_ms": stats["p99_ms"],
+                        "per_second": stats["per_second"],
+                    })
+            finally:
+                # Notifications and emails the scenarios queued run against this database and channel
+                # layer, not the configured ones run() restores afterwards
+                wait_for_background_tasks()
+        return rows
+
+    def client(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        return client
+
+    def drive(self, calls, expected_status, warmup=1):
+        """Time each call (after warmup ones); returns (timings, unexpected statuses)."""
+        timings, errors = [], 0
+        for i, call in enumerate(calls):
+            start = time.perf_counter()
+            response = call()
+            elapsed = time.perf_counter() - start
+            if i >= warmup:
+                timings.append(elapsed)
+                errors += response.status_code != expected_status
+        return timings, errors
+
+    def scenario_job_search(self, data, iterations):
+        client, url = self.client(data["technicians"][0]), reverse("job-list")
+        params = [
+            {"q": SEARCH_TERMS[i % len(SEARCH_TERMS)], "category": CATEGORIES[i % len(CATEGORIES)]}
+            if i % 2 else {"location": LOCATIONS[i % len(LOCATIONS)]}
+            for i in range(iterations + 1)
+        ]
+        return self.drive((lambda p=p: client.get(url, p) for p in params), 200)
+
+    def scenario_technician_list(self, data, iterations):
+        client, url = self.client(data["employers"][0]), reverse("technician-list")
+        params = [
+            {"skill": SKILLS[i % len(SKILLS)][:4]} if i % 2 else {"location": LOCATIONS[i % len(LOCATIONS)]}
+            for i in range(iterations + 1)
+        ]
+        return self.drive((lambda p=p: client.get(url, p) for p in params), 200)
+
+    def scenario_apply(self, data, iterations):
+        clients = {}
+        calls = []
+        for technician, job in self.unapplied_pairs(data, iterations):
+            if technician.pk not in clients:
+                clients[technician.pk] = self.client(technician)
+            url = reverse("technician-job-apply", kwargs={"job_id": job.pk})
+            calls.append(lambda c=clients[technician.pk], u=url: c.post(u, {"cover_letter": "Available this week."}, format="json"))
+        return self.drive(calls, 201, warmup=0)
+
+    def scenario_employer_applicants(self, data, iterations):
+        client, url = self.client(data["employers"][0]), reverse("employer-applicants")
+        return self.drive((lambda: client.get(url) for _ in range(iterations + 1)), 200)
+
+    def scenario_chat(self, data, iterations):
+        """Round trip from one participant's send to the other participant's receive over ws/chat/<room_id>/."""
+        from backend.asgi import application
+
+        room, employer, technician = data["room"]
+
+        async def scenario():
+            def connect(user):
+                return WebsocketCommunicator(
+                    application, f"/ws/chat/{room.pk}/?token={AccessToken.for_user(user)}",
+                    headers=[(b"origin", b"http://localhost")],
+                )
+
+            sender, receiver = connect(employer), connect(technician)
+            for communicator in (sender, receiver):
+                connected, _ = await communicator.connect()
+                if not connected:
+                    raise RuntimeError("Chat socket was refused")
+            timings, errors = [], 0
+            for i in range(iterations):
+                start = time.perf_counter()
+                await sender.send_json_to({"content": f"Benchmark message {i}"})
+                try:
+                    await receiver.receive_from(timeout=5)
+                    await sender.receive_from(timeout=5)
+                except asyncio.TimeoutError:
+                    errors += 1
+                    continue
+                timings.append(time.perf_counter() - start)
+            await sender.disconnect()
+            await receiver.disconnect()
+            return timings, errors
+
+        return async_to_sync(scenario)()
+
+    def unapplied_pairs(self, data, count):
+        technicians, jobs = data["technicians"], data["jobs"]
+        applied = set(
+            JobApplication.objects.filter(technician__in=technicians, job__in=jobs).values_list("technician_id", "job_id")
+        )
+        return list(islice(
+            ((technician, job) for technician in technicians for job in jobs if (technician.pk, job.pk) not in applied),
+            count,
+        ))
+
+    def seed(self, scale):
+        prefix = f"bench-{uuid.uuid4().hex[:8]}"
+        seed_marketplace(
+            users=220 * scale, employer_ratio=20 / 220, jobs_per_employer=20, applications_per_technician=5,
+            reviews_per_technician=3, rooms_per_employer=5, messages_per_room=20, prefix=prefix, seed=42,
+        )
+        employers = list(User.objects.filter(username__startswith=f"{prefix}-employer-").order_by("pk")[:1])
+        technicians = list(User.objects.filter(username__startswith=f"{prefix}-technician-").order_by("pk")[:50])
+        room = Room.objects.filter(participants=employers[0]).order_by("pk").first()
+        return {
+            "employers": employers,
+            "technicians": technicians,
+            "jobs": list(Job.objects.filter(is_active=True, employer__username__startswith=prefix).order_by("pk")[:100]),
+            "room": (room, employers[0], room.participants.exclude(pk=employers[0].pk).get()),
+        }
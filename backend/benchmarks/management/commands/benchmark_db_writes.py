@@ -0,0 +1,171 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connection, connections, transaction
+
+from benchmarks.base import BenchmarkCommand, summarize
+from benchmarks.seeding import seed_marketplace
+from chat.models import Message, Room
+from jobs.models import Job, JobApplication
+from payments.models import Payment
+
+# Environment each profile runs under; settings.py builds DATABASES from it. SQLite profiles
+# get a scratch SQLITE_PATH, "configured" keeps whatever the environment selects.
+PROFILES = {
+    "sqlite-default": {
+        "DB_ENGINE": "sqlite", "SQLITE_JOURNAL_MODE": "delete", "SQLITE_SYNCHRONOUS": "full",
+        "SQLITE_MMAP_SIZE": "0", "SQLITE_CACHE_SIZE": "-2000", "SQLITE_TEMP_STORE": "default",
+        "SQLITE_BUSY_TIMEOUT": "5", "SQLITE_TRANSACTION_MODE": "DEFERRED",
+    },
+    "sqlite-tuned": {
+        "DB_ENGINE": "sqlite",
+    },
+    "configured": {},
+}
+TUNABLES = ("SQLITE_JOURNAL_MODE", "SQLITE_SYNCHRONOUS", "SQLITE_MMAP_SIZE", "SQLITE_CACHE_SIZE",
+            "SQLITE_TEMP_STORE", "SQLITE_BUSY_TIMEOUT", "SQLITE_TRANSACTION_MODE")
+
+
+class Command(BenchmarkCommand):
+    help = (
+        "Concurrent write throughput per database profile: threads mixing chat message inserts, "
+        "payment webhook updates and job applications, each profile in its own process and scratch database."
+    )
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--profile", choices=sorted(PROFILES), action="append",
+                            help="Profiles to compare (repeatable). Default: both SQLite profiles, plus "
+                                 "'configured' when DB_ENGINE selects PostgreSQL.")
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--writes", type=int, default=150, help="Write transactions per thread.")
+        parser.add_argument("--worker", choices=sorted(PROFILES), help="Internal: run one profile in this process.")
+
+    def run(self, **options):
+        if options["worker"]:
+            return self.run_worker(options)
+        profiles = options["profile"] or ["sqlite-default", "sqlite-tuned"] + (
+            ["configured"] if connection.vendor != "sqlite" else []
+        )
+        rows = []
+        with tempfile.TemporaryDirectory() as directory:
+            for profile in profiles:
+                rows.extend(self.spawn(profile, directory, options))
+        return rows
+
+    def spawn(self, profile, directory, options):
+        env = dict(os.environ)
+        if profile != "configured":
+            for name in TUNABLES:
+                env.pop(name, None)
+            env.update(PROFILES[profile], SQLITE_PATH=str(Path(directory) / f"{profile}.sqlite3"))
+        result = subprocess.run(
+            [
+                sys.executable, str(Path(settings.BASE_DIR) / "manage.py"), "benchmark_db_writes",
+                "--worker", profile, "--threads", str(options["threads"]), "--writes", str(options["writes"]), "--json",
+            ],
+            env=env, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(f"Profile {profile} failed:\n{result.stderr[-2000:]}")
+        return json.loads(result.stdout.strip().splitlines()[-1])["results"]
+
+    def run_worker(self, options):
+        profile = options["worker"]
+        if connection.vendor == "sqlite" and profile != "configured":
+            # A scratch file chosen by the parent process
+            call_command("migrate", verbosity=0, interactive=False)
+            return self.measure(profile, options)
+        # Never write into the real database: use the test database the runner would create
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            return self.measure(profile, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def measure(self, profile, options):
+        threads, writes = options["threads"], options["writes"]
+        prefix = f"writes-{uuid.uuid4().hex[:8]}"
+        seed_marketplace(
+            users=threads + 1, employer_ratio=1 / (threads + 1), jobs_per_employer=writes // 3 + 1,
+            applications_per_technician=0, reviews_per_technician=0, rooms_per_employer=threads,
+            messages_per_room=0, subscribed_ratio=1.0, prefix=prefix,
+        )
+        job_ids = list(Job.objects.filter(employer__username__startswith=prefix).values_list("pk", flat=True))
+        rooms = list(Room.objects.filter(participants__username__startswith=f"{prefix}-employer-").values_list("pk", flat=True))
+        payments = list(Payment.objects.filter(tx_ref__startswith=prefix).values_list("payer_id", "tx_ref"))
+        connections.close_all()
+
+        timings, errors, lock = [], [0], threading.Lock()
+        barrier = threading.Barrier(threads)
+
+        def worker(index):
+            technician_id, tx_ref = payments[index % len(payments)]
+            room_id = rooms[index % len(rooms)]
+            local = []
+            barrier.wait()
+            try:
+                for i in range(writes):
+                    start = time.perf_counter()
+                    try:
+                        self.write(i, room_id, technician_id, tx_ref, job_ids)
+                    except OperationalError:
+                        # "database is locked" and friends
+                        with lock:
+                            errors[0] += 1
+                        continue
+                    local.append(time.perf_counter() - start)
+            finally:
+                connections.close_all()
+            with lock:
+                timings.extend(local)
+
+        pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        started = time.perf_counter()
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        stats = summarize(timings) if timings else {"p50_ms": None, "p95_ms": None, "p99_ms": None}
+        settings_dict = connections[DEFAULT_DB_ALIAS].settings_dict
+        return [{
+            "profile": profile,
+            "engine": settings_dict["ENGINE"].rsplit(".", 1)[-1],
+            "threads": threads,
+            "writes": len(timings),
+            "errors": errors[0],
+            "writes_per_second": round(len(timings) / elapsed, 1) if elapsed else None,
+            "p50_ms": stats["p50_ms"],
+            "p95_ms": stats["p95_ms"],
+            "p99_ms": stats["p99_ms"],
+        }]
+
+    def write(self, i, room_id, technician_id, tx_ref, job_ids):
+        kind = i % 3
+        if kind == 0:
+            # Chat send
+            Message.objects.create(room_id=room_id, sender_id=technician_id, content=f"Message {i}")
+        elif kind == 1:
+            # Webhook: read the payment, then write it back
+            with transaction.atomic():
+                payment = Payment.objects.select_for_update().get(tx_ref=tx_ref)
+                payment.provider_tx_id = f"evt-{i}"
+                payment.save(update_fields=["provider_tx_id"])
+        else:
+            # Apply: check the job, then insert the application
+            with transaction.atomic():
+                job = Job.objects.only("pk").get(pk=job_ids[i // 3])
+                JobApplication.objects.create(job=job, technician_id=technician_id)
@@ -0,0 +1,38 @@
+from importlib.util import find_spec
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.test.utils import override_settings
+
+from benchmarks.base import BenchmarkCommand, measure, summarize
+
+
+class Command(BenchmarkCommand):
+    help = "Measure password verification cost, as logins per second per core, for each hashing tier."
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--tier", choices=sorted(settings.PASSWORD_HASHER_TIERS), action="append", help="Limit to these tiers (repeatable).")
+        parser.add_argument("--iterations", type=int, default=20)
+
+    def run(self, **options):
+        rows = []
+        for tier in options["tier"] or list(settings.PASSWORD_HASHER_TIERS):
+            if tier == "argon2" and not find_spec("argon2"):
+                self.stderr.write("argon2: skipped, argon2-cffi is not installed")
+                continue
+            with override_settings(PASSWORD_HASHERS=[settings.PASSWORD_HASHER_TIERS[tier]]):
+                encoded = hashers.make_password("correct horse battery staple")
+                # One verify is one login's worth of hashing on one core
+                stats = summarize(measure(
+                    lambda: hashers.verify_password("correct horse battery staple", encoded),
+                    options["iterations"],
+                ))
+            rows.append({
+                "tier": tier,
+                "algorithm": encoded.split("$", 1)[0],
+                "mean_ms": stats["mean_ms"],
+                "p95_ms": stats["p95_ms"],
+                "logins_per_sec_per_core": stats["per_second"],
+            })
+        return rows
@@ -0,0 +1,72 @@
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from backend.renderers import FastJSONRenderer, dumps_text, orjson
+from benchmarks.base import BenchmarkCommand, measure, summarize
+
+
+def job_page(rows):
+    """A list response shaped like GET /api/jobs/ after serialization."""
+    now = timezone.now()
+    return {
+        "count": rows * 10,
+        "next": "http://testserver/api/jobs/?page=2",
+        "previous": None,
+        "results": [
+            {
+                "id": i, "employer_id": i % 40, "title": f"Fix the kitchen sink #{i}",
+                "description": "Leaking pipe under the sink, needs a new trap and seals. " * 3,
+                "category": "Plumbing", "location": "Kigali", "latitude": -1.9441, "longitude": 30.0619,
+                "budget": str(Decimal(25000 + i).quantize(Decimal("0.01"))), "currency": "RWF",
+                "is_active": True, "created_at": (now - timedelta(minutes=i)).isoformat(),
+                "applications_count": i % 7, "distance_km": round(i * 0.37, 2),
+            }
+            for i in range(rows)
+        ],
+    }
+
+
+class Command(BenchmarkCommand):
+    help = "Compare DRF's JSONRenderer with FastJSONRenderer, and per-subscriber with once-per-message chat encoding."
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--rows", type=int, default=50, help="Rows in the rendered list page.")
+        parser.add_argument("--subscribers", type=int, default=50, help="Sockets in the chat fan-out case.")
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def run(self, **options):
+        if orjson is None:
+            self.stderr.write("orjson is not installed; FastJSONRenderer uses the stdlib path")
+        iterations = options["iterations"]
+        page = job_page(options["rows"])
+        drf, fast = JSONRenderer(), FastJSONRenderer()
+        drf_stats = summarize(measure(lambda: drf.render(page), iterations))
+        fast_stats = summarize(measure(lambda: fast.render(page), iterations))
+        rows = [{
+            "case": f"render {options['rows']} rows",
+            "baseline_ms": drf_stats["mean_ms"],
+            "fast_ms": fast_stats["mean_ms"],
+            "speedup": round(drf_stats["mean_ms"] / fast_stats["mean_ms"], 2) if fast_stats["mean_ms"] else None,
+            "identical": drf.render(page) == fast.render(page),
+        }]
+
+        message = {
+            "id": 1, "room": 1, "sender": {"id": 2, "username": "tech", "email": "tech@example.com", "role": "technician"},
+            "content": "On my way, about 20 minutes out.", "timestamp": timezone.now().isoformat(), "read": False,
+        }
+        subscribers = range(options["subscribers"])
+        per_subscriber = summarize(measure(lambda: [json.dumps(message) for _ in subscribers], iterations))
+        once = summarize(measure(lambda: [dumps_text(message)] * len(subscribers), iterations))
+        rows.append({
+            "case": f"chat fan-out to {options['subscribers']}",
+            "baseline_ms": per_subscriber["mean_ms"],
+            "fast_ms": once["mean_ms"],
+            "speedup": round(per_subscriber["mean_ms"] / once["mean_ms"], 2) if once["mean_ms"] else None,
+            "identical": json.loads(json.dumps(message)) == json.loads(dumps_text(message)),
+        })
+        return rows
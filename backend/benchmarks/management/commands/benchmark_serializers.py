@@ -0,0 +1,98 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from benchmarks.base import BenchmarkCommand, measure, summarize
+from jobs.models import Job
+from jobs.views import JobListView
+from technicians.models import Skill, TechnicianProfile
+from technicians.views import TechnicianListView
+
+User = get_user_model()
+
+CASES = {
+    "jobs": (JobListView, "/api/jobs/"),
+    "technicians": (TechnicianListView, "/api/technicians/"),
+}
+
+
+class Command(BenchmarkCommand):
+    help = (
+        "Compare list endpoints served through their ModelSerializer with the values() fast path: "
+        "time per page and whether the JSON is byte-identical."
+    )
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--case", choices=sorted(CASES), action="append", help="Limit to these lists (repeatable).")
+        parser.add_argument("--rows", type=int, default=500, help="Rows to add (rolled back afterwards).")
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--fields", default="", help="Optional ?fields= to apply to both paths.")
+
+    def run(self, **options):
+        rows = []
+        with transaction.atomic():
+            if options["rows"]:
+                self.seed(options["rows"])
+            factory = APIRequestFactory()
+            params = {"page_size": options["page_size"]}
+            if options["fields"]:
+                params["fields"] = options["fields"]
+            for case in options["case"] or list(CASES):
+                view_class, path = CASES[case]
+                results = {}
+                for label, use_values_path in (("serializer", False), ("values", True)):
+                    view = view_class.as_view(use_values_path=use_values_path)
+
+                    def render():
+                        response = view(factory.get(path, params))
+                        return response.render().content
+
+                    body = render()
+                    results[label] = (body, summarize(measure(render, options["iterations"])))
+                slow, fast = results["serializer"][1], results["values"][1]
+                rows.append({
+                    "case": case,
+                    "serializer_ms": slow["mean_ms"],
+                    "values_ms": fast["mean_ms"],
+                    "speedup": round(slow["mean_ms"] / fast["mean_ms"], 2) if fast["mean_ms"] else None,
+                    "identical": results["serializer"][0] == results["values"][0],
+                    "bytes": len(results["values"][0]),
+                })
+            transaction.set_rollback(True)
+        return rows
+
+    def seed(self, count):
+        now = timezone.now()
+        employer = User.objects.create_user(username="bench-employer", email="", password=None, role="employer")
+        Job.objects.bulk_create([
+            Job(
+                employer=employer, title=f"Benchmark job {i}", description="Fix the wiring in a two-room flat " * 4,
+                category=("Plumbing", "Electrical", "Carpentry")[i % 3], location="Kigali",
+                budget=Decimal(10000 + i), currency="RWF",
+            )
+            for i in range(count)
+        ])
+        skills = [Skill.objects.get_or_create(name=name)[0] for name in ("Plumber", "Electrician", "Carpenter")]
+        users = User.objects.bulk_create([
+            User(username=f"bench-tech-{i}", email="", role="technician", first_name="Bench", last_name=str(i))
+            for i in range(count)
+        ])
+        profiles = TechnicianProfile.objects.bulk_create([
+            TechnicianProfile(
+                user=user, location="Kigali", years_experience=i % 20, is_approved=True,
+                trial_ends_at=now + timedelta(days=30), rating_avg=Decimal(i % 500) / 100,
+            )
+            for i, user in enumerate(users)
+        ])
+        through = TechnicianProfile.skills.through
+        through.objects.bulk_create([
+            through(technicianprofile_id=profile.pk, skill_id=skill.pk)
+            for i, profile in enumerate(profiles)
+            for skill in skills[: 1 + i % 3]
+        ])
@@ -0,0 +1,111 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import CommandError
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from benchmarks.base import BenchmarkCommand
+from chat.models import Message
+from employers.views import EmployerApplicantsListView
+from jobs.models import Job, JobApplication
+from jobs.views import JobListView, MyApplicationsView
+from payments.models import Payment, Subscription
+
+PAGE = 20
+
+User = get_user_model()
+
+
+def sample(queryset, field):
+    """A real value to plug into the query, so the planner sees a realistic lookup."""
+    return queryset.values_list(field, flat=True).order_by().first() or 0
+
+
+def view_queryset(view_class, user=None, **params):
+    """The page query view_class's list() sends for GET ?params: its filters, annotations and values() included."""
+    request = APIRequestFactory().get("/", params)
+    if user is not None:
+        force_authenticate(request, user)
+    view = view_class()
+    view.setup(request)
+    view.request = view.initialize_request(request)
+    view.format_kwarg = None
+    queryset = view.filter_queryset(view.get_queryset())
+    if getattr(view, "use_values_path", False):
+        values_serializer = view.get_values_serializer(view.get_serializer(), queryset)
+        if values_serializer is not None:
+            queryset = values_serializer.values(queryset)
+    return queryset[:view.paginator.get_page_size(view.request) or PAGE]
+
+
+def hot_queries():
+    """(name, queryset) in the shape the views send them."""
+    now = timezone.now()
+    # Unsaved users are enough: the views only filter on their ids
+    technician = User(pk=sample(JobApplication.objects.all(), "technician_id"), role="technician")
+    employer = User(pk=sample(Job.objects.all(), "employer_id"), role="employer")
+    category = sample(Job.objects.all(), "category") or ""
+    return [
+        ("job_list", view_queryset(JobListView)),
+        ("job_list_category", view_queryset(JobListView, category=category)),
+        ("my_applications", view_queryset(MyApplicationsView, technician)),
+        ("employer_applicants", view_queryset(EmployerApplicantsListView, employer)),
+        ("subscription_active", Subscription.objects.filter(
+            user_id=sample(Subscription.objects.all(), "user_id"), status=Subscription.Status.ACTIVE, end_date__gte=now,
+        )[:1]),
+        ("room_messages", Message.objects.filter(room_id=sample(Message.objects.all(), "room_id")).order_by("timestamp")),
+        ("payment_by_tx_ref", Payment.objects.filter(tx_ref=sample(Payment.objects.exclude(tx_ref=""), "tx_ref") or "")),
+    ]
+
+
+def full_scans(plan, vendor):
+    """Tables read start to finish, according to the plan text."""
+    if vendor == "sqlite":
+        # "SCAN jobs_job" reads the table; "SCAN jobs_job USING INDEX ..." walks an index in order
+        return sorted({m.group(1) for m in re.finditer(r"\bSCAN (\w+)(?!\w| USING)", plan)})
+    if vendor == "postgresql":
+        return sorted(set(re.findall(r"Seq Scan on (\w+)", plan)))
+    return []
+
+
+def sorts(plan, vendor):
+    if vendor == "sqlite":
+        return "TEMP B-TREE FOR ORDER BY" in plan
+    if vendor == "postgresql":
+        return bool(re.search(r"^\s*(->\s*)?(Incremental )?Sort\b", plan, re.MULTILINE))
+    return False
+
+
+class Command(BenchmarkCommand):
+    help = (
+        "EXPLAIN each hot query against the configured database and flag full table scans and "
+        "sorts the indexes should have avoided. Run it on seeded data (seed_marketplace): planners "
+        "scan tiny tables whatever the indexes."
+    )
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--query", action="append", help="Limit to these queries (repeatable).")
+        parser.add_argument("--fail-on-scan", action="store_true", help="Exit with an error if any query scans a table.")
+
+    def run(self, **options):
+        vendor = connection.vendor
+        rows = []
+        for name, queryset in hot_queries():
+            if options["query"] and name not in options["query"]:
+                continue
+            plan = queryset.explain()
+            scanned = full_scans(plan, vendor)
+            rows.append({
+                "query": name,
+                "full_scan": ",".join(scanned),
+                "sort": sorts(plan, vendor),
+                "plan": " | ".join(line.strip() for line in plan.splitlines() if line.strip()),
+            })
+        if options["fail_on_scan"]:
+            flagged = [row["query"] for row in rows if row["full_scan"]]
+            if flagged:
+                raise CommandError(f"Full table scans in: {', '.join(flagged)}")
+        return rows
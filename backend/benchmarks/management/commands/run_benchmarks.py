@@ -0,0 +1,151 @@
+import json
+import platform
+import subprocess
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command, get_commands
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+PREFIX = "benchmark_"
+# Columns where a larger number is the better result; other numeric *_ms columns are timings
+HIGHER_IS_BETTER = ("per_second", "per_sec", "speedup", "rps")
+
+
+def baseline_path(name, directory):
+    path = Path(name)
+    if path.suffix == ".json" or len(path.parts) > 1:
+        return path
+    return Path(directory) / f"{name}.json"
+
+
+def row_key(row):
+    """The first column identifies a row (case, scenario, tier, ...)."""
+    first = next(iter(row), None)
+    return f"{first}={row[first]}" if first is not None else ""
+
+
+def compare(current, baseline, threshold):
+    """Rows of (benchmark, row, metric, old, new, change %, regressed) for metrics in both reports."""
+    changes = []
+    for name, rows in current["benchmarks"].items():
+        old_rows = {row_key(row): row for row in baseline["benchmarks"].get(name) or []}
+        for row in rows:
+            old = old_rows.get(row_key(row))
+            if old is None:
+                continue
+            for metric, value in row.items():
+                higher_is_better = any(marker in metric for marker in HIGHER_IS_BETTER)
+                if not (metric.endswith("_ms") or higher_is_better):
+                    continue
+                before = old.get(metric)
+                if not isinstance(value, (int, float)) or not isinstance(before, (int, float)) or not before:
+                    continue
+                change = (value - before) / before * 100
+                regressed = change < -threshold if higher_is_better else change > threshold
+                changes.append((name, row_key(row), metric, before, value, round(change, 1), regressed))
+    return changes
+
+
+class Command(BaseCommand):
+    help = (
+        "Run every benchmark_* command, collect their --json reports into one document, and "
+        "optionally save it as a baseline or compare it against one (e.g. main vs. a branch)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--only", action="append", default=[], help="Run only this benchmark (repeatable), e.g. api.")
+        parser.add_argument("--skip", action="append", default=[], help="Skip this benchmark (repeatable).")
+        parser.add_argument("--save", metavar="NAME", help="Save the report as a baseline (a name or a .json path).")
+        parser.add_argument("--compare", metavar="NAME", help="Compare against a saved baseline.")
+        parser.add_argument("--baseline-dir", default=str(Path(settings.BASE_DIR) / "benchmarks" / "baselines"))
+        parser.add_argument("--threshold", type=float, default=10.0, help="Percent change counted as a regression.")
+        parser.add_argument("--fail-on-regression", action="store_true", help="Exit with an error if anything regressed.")
+        parser.add_argument("--json", action="store_true", help="Print the whole report as JSON.")
+
+    def handle(self, *args, **options):
+        names = sorted(name.removeprefix(PREFIX) for name in get_commands() if name.startswith(PREFIX))
+        unknown = set(options["only"] + options["skip"]) - set(names)
+        if unknown:
+            raise CommandError(f"Unknown benchmark(s): {', '.join(sorted(unknown))}. Available: {', '.join(names)}")
+        selected = [n for n in names if (not options["only"] or n in options["only"]) and n not in options["skip"]]
+
+        report = {"meta": self.meta(), "benchmarks": {}, "errors": {}}
+        for name in selected:
+            if not options["json"]:
+                self.stderr.write(f"Running {name}...")
+            out = StringIO()
+            try:
+                call_command(PREFIX + name, json=True, stdout=out, stderr=StringIO())
+                report["benchmarks"][name] = json.loads(out.getvalue())["results"]
+            except Exception as exc:
+                # One broken benchmark (e.g. an unmigrated database) shouldn't lose the others
+                report["errors"][name] = f"{exc.__class__.__name__}: {exc}"
+
+        if options["save"]:
+            path = baseline_path(options["save"], options["baseline_dir"])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, indent=2) + "\n")
+            self.stderr.write(f"Saved baseline to {path}")
+
+        changes = []
+        if options["compare"]:
+            path = baseline_path(options["compare"], options["baseline_dir"])
+            if not path.exists():
+                raise CommandError(f"No baseline at {path}")
+            changes = compare(report, json.loads(path.read_text()), options["threshold"])
+            report["comparison"] = {
+                "baseline": str(path),
+                "changes": [
+                    dict(zip(("benchmark", "row", "metric", "baseline", "current", "change_pct", "regressed"), change))
+                    for change in changes
+                ],
+            }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report))
+        else:
+            self.print_report(report, changes)
+        regressions = [change for change in changes if change[-1]]
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(f"{len(regressions)} metric(s) regressed by more than {options['threshold']}%.")
+
+    def meta(self):
+        try:
+            revision = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+                cwd=settings.BASE_DIR,
+            ).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            revision = ""
+        return {
+            "created_at": timezone.now().isoformat(),
+            "revision": revision,
+            "python": platform.python_version(),
+            "database": connection.vendor,
+        }
+
+    def print_report(self, report, changes):
+        for name, rows in report["benchmarks"].items():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            columns = list(dict.fromkeys(key for row in rows for key in row))
+            self.table(columns, [[row.get(c, "") for c in columns] for row in rows])
+        for name, error in report["errors"].items():
+            self.stdout.write(self.style.ERROR(f"{name} failed: {error}"))
+        if changes:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"Compared with {report['comparison']['baseline']}"))
+            self.table(
+                ["benchmark", "row", "metric", "baseline", "current", "change_%", ""],
+                [list(change[:-1]) + ["REGRESSED" if change[-1] else ""] for change in changes],
+            )
+
+    def table(self, columns, rows):
+        if not rows:
+            return
+        widths = [max(len(str(c)), *(len(str(row[i])) for row in rows)) for i, c in enumerate(columns)]
+        self.stdout.write("  ".join(str(c).ljust(w) for c, w in zip(columns, widths)).rstrip())
+        for row in rows:
+            self.stdout.write("  ".join(str(v).ljust(w) for v, w in zip(row, widths)).rstrip())
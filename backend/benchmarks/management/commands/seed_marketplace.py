@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.seeding import PASSWORD, seed_marketplace
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-seed synthetic users (with profiles), jobs, applications, reviews, subscriptions, "
+        "payments, chat rooms and messages for local load testing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--employer-ratio", type=float, default=0.1, help="Share of users who are employers.")
+        parser.add_argument("--jobs-per-employer", type=int, default=5)
+        parser.add_argument("--applications-per-technician", type=int, default=5)
+        parser.add_argument("--reviews-per-technician", type=int, default=3)
+        parser.add_argument("--rooms-per-employer", type=int, default=3)
+        parser.add_argument("--messages-per-room", type=int, default=10)
+        parser.add_argument("--subscribed-ratio", type=float, default=0.5, help="Share of technicians with a subscription.")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per bulk INSERT.")
+        parser.add_argument("--prefix", default="seed", help="Username prefix; use a new one to seed again.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, for repeatable data.")
+
+    def handle(self, *args, **options):
+        if User.objects.filter(username__startswith=f"{options['prefix']}-").exists():
+            raise CommandError(f"Users prefixed '{options['prefix']}-' already exist; pass another --prefix.")
+        counts = seed_marketplace(
+            users=options["users"],
+            employer_ratio=options["employer_ratio"],
+            jobs_per_employer=options["jobs_per_employer"],
+            applications_per_technician=options["applications_per_technician"],
+            reviews_per_technician=options["reviews_per_technician"],
+            rooms_per_employer=options["rooms_per_employer"],
+            messages_per_room=options["messages_per_room"],
+            subscribed_ratio=options["subscribed_ratio"],
+            chunk_size=options["chunk_size"],
+            prefix=options["prefix"],
+            seed=options["seed"],
+            log=self.stderr.write if options["verbosity"] > 1 else None,
+        )
+        for label, count in counts.items():
+            self.stdout.write(f"{label}: {count}")
+        self.stdout.write(f"Seeded {sum(counts.values())} rows; every seeded user's password is '{PASSWORD}'.")
@@ -0,0 +1,197 @@
+"""
+Synthetic marketplace data at production-like volumes (see the seed_marketplace command).
+
+Everything is written with bulk_create, one chunk at a time, so rows are generated lazily
+and memory stays flat however many are requested. bulk_create sends no post_save, so the
+per-row receivers (create_user_profiles, review_saved, the cache and index invalidation
+handlers) never run while seeding: profiles are written next to their users, rating_avg and
+rating_count are recomputed afterwards with set-based UPDATEs, and the in-process indexes
+and caches are invalidated once at the end.
+"""
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db.models import Avg, Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Round
+from django.utils import timezone
+
+from chat.models import Message, Room
+from employers.models import EmployerProfile
+from jobs.feed import bump_feed_version
+from jobs.models import Job, JobApplication
+from payments.models import Payment, Subscription, SubscriptionPlan
+from technicians.models import Review, Skill, TechnicianProfile
+from technicians.recommendations import reset_recommendation_index
+from technicians.skills import mark_skill_index_stale
+
+User = get_user_model()
+
+CATEGORIES = ("Plumbing", "Electrical", "Carpentry", "Painting", "Masonry", "Welding")
+LOCATIONS = ("Kigali", "Musanze", "Huye", "Rubavu", "Rwamagana", "Nyagatare")
+SKILLS = ("Plumber", "Electrician", "Carpenter", "Painter", "Mason", "Welder")
+SEARCH_TERMS = ("leak", "wiring", "door", "roof", "paint", "tiles")
+PASSWORD = "seed-pass"
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def seed_marketplace(
+    users=1000,
+    employer_ratio=0.1,
+    jobs_per_employer=5,
+    applications_per_technician=5,
+    reviews_per_technician=3,
+    rooms_per_employer=3,
+    messages_per_room=10,
+    subscribed_ratio=0.5,
+    chunk_size=5000,
+    prefix="seed",
+    seed=0,
+    log=None,
+):
+    """Seed the marketplace; returns {model label: rows created}. Usernames are <prefix>-<role>-<n>."""
+    rng = random.Random(seed)
+    now = timezone.now()
+    counts = {}
+    started = time.perf_counter()
+
+    def bulk(model, rows):
+        """bulk_create rows chunk by chunk; returns the primary keys."""
+        pks = []
+        for chunk in chunked(rows, chunk_size):
+            pks.extend(obj.pk for obj in model.objects.bulk_create(chunk))
+        label = model._meta.label
+        counts[label] = counts.get(label, 0) + len(pks)
+        if log:
+            log(f"{label}: {counts[label]} rows ({time.perf_counter() - started:.1f}s)")
+        return pks
+
+    # Hashing once keeps a million users from costing a million key derivations
+    password = make_password(PASSWORD)
+    employer_count = max(1, round(users * employer_ratio)) if users else 0
+    technician_count = users - employer_count
+
+    def new_users(role, count):
+        for i in range(count):
+            username = f"{prefix}-{role}-{i}"
+            yield User(
+                username=username, email=f"{username}@example.com", password=password, role=role,
+                first_name=role.title(), last_name=str(i), location=rng.choice(LOCATIONS),
+            )
+
+    employer_ids, technician_ids, profile_ids = [], [], []
+    for chunk in chunked(new_users("employer", employer_count), chunk_size):
+        created = User.objects.bulk_create(chunk)
+        employer_ids.extend(user.pk for user in created)
+        EmployerProfile.objects.bulk_create([
+            EmployerProfile(user=user, company_name=f"{user.username} Ltd", location=user.location) for user in created
+        ])
+    skills = [Skill.objects.get_or_create(name=name)[0].pk for name in SKILLS]
+    through = TechnicianProfile.skills.through
+    for chunk in chunked(new_users("technician", technician_count), chunk_size):
+        created = User.objects.bulk_create(chunk)
+        technician_ids.extend(user.pk for user in created)
+        profiles = TechnicianProfile.objects.bulk_create([
+            TechnicianProfile(
+                user=user, location=user.location, bio="Reliable and punctual. " * 3,
+                years_experience=rng.randint(0, 25), is_approved=rng.random() < 0.9,
+                trial_ends_at=now + timedelta(days=rng.randint(1, 30)) if rng.random() < 0.3 else None,
+            )
+            for user in created
+        ])
+        profile_ids.extend(profile.pk for profile in profiles)
+        through.objects.bulk_create([
+            through(technicianprofile_id=profile.pk, skill_id=skill_id)
+            for profile in profiles
+            for skill_id in rng.sample(skills, rng.randint(1, 3))
+        ])
+    counts[User._meta.label] = len(employer_ids) + len(technician_ids)
+    counts[EmployerProfile._meta.label] = len(employer_ids)
+    counts[TechnicianProfile._meta.label] = len(profile_ids)
+    if log:
+        log(f"{User._meta.label}: {counts[User._meta.label]} rows with profiles ({time.perf_counter() - started:.1f}s)")
+
+    plan, _ = SubscriptionPlan.objects.get_or_create(
+        name="Monthly", defaults={"duration_months": SubscriptionPlan.MONTHLY, "price": Decimal("5000")},
+    )
+    subscribers = [user_id for user_id in technician_ids if rng.random() < subscribed_ratio]
+    bulk(Subscription, (
+        Subscription(user_id=user_id, plan=plan, start_date=now - timedelta(days=5), end_date=now + timedelta(days=25))
+        for user_id in subscribers
+    ))
+    bulk(Payment, (
+        Payment(
+            payer_id=user_id, amount=plan.price, currency=plan.currency, status=Payment.Status.COMPLETED,
+            tx_ref=f"{prefix}-sub-{user_id}", completed_at=now - timedelta(days=5),
+        )
+        for user_id in subscribers
+    ))
+
+    job_ids = bulk(Job, (
+        Job(
+            employer_id=employer_id, title=f"{rng.choice(SEARCH_TERMS).title()} repair {i}",
+            description=f"Need help with a {rng.choice(SEARCH_TERMS)} in a two-room flat.",
+            category=rng.choice(CATEGORIES), location=rng.choice(LOCATIONS),
+            budget=Decimal(rng.randint(5, 200) * 1000), is_active=rng.random() < 0.9,
+        )
+        for employer_id in employer_ids
+        for i in range(jobs_per_employer)
+    ))
+    if job_ids:
+        per_technician = min(applications_per_technician, len(job_ids))
+        bulk(JobApplication, (
+            JobApplication(job_id=job_id, technician_id=user_id, cover_letter="I can do this.")
+            for user_id in technician_ids
+            for job_id in rng.sample(job_ids, per_technician)
+        ))
+    if employer_ids:
+        bulk(Review, (
+            Review(technician_id=profile_id, reviewer_id=rng.choice(employer_ids), rating=rng.randint(1, 5),
+                   comment="Good work")
+            for profile_id in profile_ids
+            for _ in range(reviews_per_technician)
+        ))
+
+    if technician_ids:
+        pairs = [(employer_id, rng.choice(technician_ids)) for employer_id in employer_ids for _ in range(rooms_per_employer)]
+        room_ids = bulk(Room, (Room() for _ in pairs))
+        participants = Room.participants.through
+        for chunk in chunked(zip(room_ids, pairs), chunk_size):
+            participants.objects.bulk_create([
+                participants(room_id=room_id, user_id=user_id) for room_id, pair in chunk for user_id in pair
+            ])
+        bulk(Message, (
+            Message(room_id=room_id, sender_id=pair[i % 2], content=f"Message {i}", read=i < messages_per_room - 1)
+            for room_id, pair in zip(room_ids, pairs)
+            for i in range(messages_per_room)
+        ))
+
+    recompute_ratings(profile_ids, chunk_size)
+    # What the skipped receivers would have done, once for the whole batch
+    reset_recommendation_index()
+    mark_skill_index_stale()
+    bump_feed_version()
+    if log:
+        log(f"Done in {time.perf_counter() - started:.1f}s")
+    return counts
+
+
+def recompute_ratings(profile_ids, chunk_size=5000):
+    """Set rating_avg/rating_count from the reviews table, one UPDATE per chunk of profiles."""
+    reviews = Review.objects.filter(technician=OuterRef("pk")).order_by().values("technician")
+    for chunk in chunked(profile_ids, chunk_size):
+        TechnicianProfile.objects.filter(pk__in=chunk).update(
+            rating_avg=Coalesce(Subquery(reviews.annotate(avg=Round(Avg("rating"), 2)).values("avg")), Value(0.0)),
+            rating_count=Coalesce(
+                Subquery(reviews.annotate(count=Count("pk")).values("count")), Value(0), output_field=IntegerField(),
+            ),
+        )
@@ -0,0 +1,234 @@
+import io
+import json
+import tempfile
+import time
+import uuid
+from decimal import Decimal
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Avg
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from backend.renderers import FastJSONParser, FastJSONRenderer, dumps, orjson
+from backend.tasks import run_in_background, wait_for_background_tasks
+from benchmarks.management.commands.explain_hot_queries import full_scans, sorts
+from benchmarks.management.commands.run_benchmarks import compare
+
+from chat.models import Message, Room
+from employers.models import EmployerProfile
+from jobs.models import Job, JobApplication
+from payments.models import Payment, Subscription
+from technicians.models import Review, TechnicianProfile
+
+User = get_user_model()
+
+
+class BenchmarkCommandTests(TestCase):
+    def run_json(self, *args):
+        out = StringIO()
+        call_command(*args, "--json", stdout=out, stderr=StringIO())
+        return json.loads(out.getvalue())
+
+    def test_benchmark_hashing(self):
+        report = self.run_json("benchmark_hashing", "--tier", "scrypt", "--iterations", "1")
+        self.assertEqual(report["benchmark"], "hashing")
+        self.assertEqual(report["results"][0]["algorithm"], "scrypt")
+        self.assertGreater(report["results"][0]["logins_per_sec_per_core"], 0)
+
+    def test_benchmark_serializers_values_path_matches_byte_for_byte(self):
+        report = self.run_json("benchmark_serializers", "--rows", "30", "--iterations", "1", "--page-size", "20")
+        self.assertEqual({row["case"] for row in report["results"]}, {"jobs", "technicians"})
+        for row in report["results"]:
+            self.assertTrue(row["identical"], row)
+        self.assertFalse(Job.objects.exists())
+
+    def test_benchmark_json(self):
+        report = self.run_json("benchmark_json", "--iterations", "2", "--rows", "5")
+        self.assertTrue(all(row["identical"] for row in report["results"]))
+
+    @skipUnless(orjson, "orjson is not installed")
+    def test_fast_renderer_is_not_slower(self):
+        report = self.run_json("benchmark_json", "--iterations", "100", "--rows", "50", "--subscribers", "1")
+        self.assertGreater(report["results"][0]["speedup"], 1, report["results"][0])
+
+    @override_settings(BACKGROUND_TASKS_EAGER=True)
+    def test_benchmark_api_scenarios(self):
+        report = self.run_json("benchmark_api", "--in-place", "--iterations", "3")
+        self.assertEqual(
+            [row["scenario"] for row in report["results"]],
+            ["job_search", "technician_list", "apply", "employer_applicants", "chat"],
+        )
+        for row in report["results"]:
+            self.assertEqual(row["errors"], 0, row)
+            self.assertEqual(row["requests"], 3)
+            self.assertLessEqual(row["p50_ms"], row["p99_ms"])
+
+    def test_benchmark_db_writes_runs_a_profile_in_its_own_process(self):
+        report = self.run_json("benchmark_db_writes", "--profile", "sqlite-tuned", "--threads", "2", "--writes", "6")
+        [row] = report["results"]
+        self.assertEqual((row["profile"], row["engine"], row["threads"]), ("sqlite-tuned", "sqlite3", 2))
+        self.assertEqual(row["writes"] + row["errors"], 12)
+        self.assertGreater(row["writes_per_second"], 0)
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite profile")
+    def test_sqlite_connections_get_the_tuning_pragmas(self):
+        with connection.cursor() as cursor:
+            pragmas = {
+                name: cursor.execute(f"PRAGMA {name}").fetchone()[0]
+                for name in ("synchronous", "cache_size", "temp_store")
+            }
+        # 1 = NORMAL, 2 = MEMORY
+        self.assertEqual(pragmas, {"synchronous": 1, "cache_size": -65536, "temp_store": 2})
+        self.assertEqual(connection.transaction_mode, "IMMEDIATE")
+
+    def test_run_benchmarks_saves_and_compares_baselines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            out = StringIO()
+            call_command("run_benchmarks", "--only", "json", "--save", "main", "--baseline-dir", directory,
+                         stdout=out, stderr=StringIO())
+            self.assertIn("chat fan-out", out.getvalue())
+
+            out = StringIO()
+            call_command("run_benchmarks", "--only", "json", "--compare", "main", "--baseline-dir", directory,
+                         "--threshold", "1000000", "--json", stdout=out, stderr=StringIO())
+            report = json.loads(out.getvalue())
+        self.assertEqual(list(report["benchmarks"]), ["json"])
+        self.assertTrue(report["comparison"]["changes"])
+        self.assertFalse(any(change["regressed"] for change in report["comparison"]["changes"]))
+
+        with self.assertRaises(CommandError):
+            call_command("run_benchmarks", "--only", "nope", stdout=StringIO(), stderr=StringIO())
+
+
+class SeedMarketplaceTests(TestCase):
+    def test_seeds_every_model_without_per_row_signals(self):
+        out = StringIO()
+        with mock.patch("technicians.signals._recompute_rating") as per_row_rating:
+            call_command("seed_marketplace", "--users", "50", "--chunk-size", "7", "--prefix", "t", stdout=out)
+        per_row_rating.assert_not_called()
+
+        # One profile per user: create_user_profiles would have collided with the bulk-created ones
+        self.assertEqual(User.objects.filter(username__startswith="t-").count(), 50)
+        self.assertEqual(EmployerProfile.objects.count(), 5)
+        self.assertEqual(TechnicianProfile.objects.count(), 45)
+        self.assertEqual(JobApplication.objects.count(), 45 * 5)
+        self.assertEqual(Review.objects.count(), 45 * 3)
+        self.assertEqual(Room.objects.count(), 5 * 3)
+        self.assertEqual(Room.participants.through.objects.count(), 5 * 3 * 2)
+        self.assertEqual(Message.objects.count(), 5 * 3 * 10)
+        self.assertEqual(Payment.objects.count(), Subscription.objects.count())
+        self.assertIn("Seeded", out.getvalue())
+
+        profile = TechnicianProfile.objects.first()
+        expected = Review.objects.filter(technician=profile).aggregate(avg=Avg("rating"))["avg"]
+        self.assertEqual(profile.rating_count, 3)
+        self.assertEqual(profile.rating_avg, Decimal(str(round(expected, 2))))
+
+        with self.assertRaises(CommandError):
+            call_command("seed_marketplace", "--users", "5", "--prefix", "t", stdout=StringIO())
+
+
+class HotQueryPlanTests(TestCase):
+    def test_hot_queries_use_the_indexes(self):
+        call_command("seed_marketplace", "--users", "200", "--prefix", "plan", stdout=StringIO())
+        out = StringIO()
+        call_command("explain_hot_queries", "--json", "--fail-on-scan", stdout=out)
+        rows = {row["query"]: row for row in json.loads(out.getvalue())["results"]}
+        self.assertEqual(len(rows), 7)
+        self.assertFalse(any(row["full_scan"] for row in rows.values()), rows)
+        if connection.vendor == "sqlite":
+            self.assertIn("jobs_job_active_recent", rows["job_list"]["plan"])
+            # The view's applications_count comes along and still leaves the index to do the ordering
+            self.assertIn("CORRELATED SCALAR SUBQUERY", rows["job_list"]["plan"])
+            self.assertFalse(rows["job_list"]["sort"])
+            self.assertIn("jobs_jobapp_tech_recent", rows["my_applications"]["plan"])
+            self.assertIn("payments_sub_user_active", rows["subscription_active"]["plan"])
+            self.assertIn("chat_message_room_time", rows["room_messages"]["plan"])
+            self.assertFalse(rows["room_messages"]["sort"])
+
+    def test_plan_parsing(self):
+        sqlite_plan = "2 0 0 SCAN jobs_job | 9 0 0 SCAN jobs_jobapplication USING INDEX x | 20 0 0 USE TEMP B-TREE FOR ORDER BY"
+        self.assertEqual(full_scans(sqlite_plan, "sqlite"), ["jobs_job"])
+        self.assertTrue(sorts(sqlite_plan, "sqlite"))
+        postgres_plan = (
+            "Limit  (cost=0.28..1.40 rows=20 width=8)\n"
+            "  ->  Sort  (cost=1.2..1.3 rows=20 width=8)\n"
+            "        ->  Seq Scan on jobs_job  (cost=0.00..1.10 rows=10 width=8)"
+        )
+        self.assertEqual(full_scans(postgres_plan, "postgresql"), ["jobs_job"])
+        self.assertTrue(sorts(postgres_plan, "postgresql"))
+        self.assertEqual(full_scans("Index Scan using jobs_job_active_recent on jobs_job", "postgresql"), [])
+
+
+class BackgroundTaskTests(TestCase):
+    def test_wait_covers_tasks_queued_by_tasks(self):
+        ran = []
+
+        def second():
+            time.sleep(0.05)
+            ran.append("second")
+
+        def first():
+            time.sleep(0.05)
+            ran.append("first")
+            run_in_background(second)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            run_in_background(first)
+        wait_for_background_tasks()
+        self.assertEqual(ran, ["first", "second"])
+
+
+class CompareTests(SimpleTestCase):
+    def test_direction_of_each_metric(self):
+        baseline = {"benchmarks": {"api": [{"scenario": "apply", "p95_ms": 10.0, "per_second": 100.0, "errors": 0}]}}
+        current = {"benchmarks": {"api": [{"scenario": "apply", "p95_ms": 12.0, "per_second": 95.0, "errors": 3}]}}
+        changes = {metric: (change, regressed) for _, _, metric, _, _, change, regressed in compare(current, baseline, 10)}
+        self.assertEqual(changes, {"p95_ms": (20.0, True), "per_second": (-5.0, False)})
+
+
+class RendererTests(SimpleTestCase):
+    def test_fast_renderer_matches_drf_byte_for_byte(self):
+        data = {
+            "decimal": Decimal("12.50"), "when": timezone.now(), "date": timezone.now().date(),
+            "uuid": uuid.uuid4(), "text": "Muraho \u2028 line\u2029 é", 1: "int key",
+            "nested": [{"x": 1.5, "y": None, "z": True}],
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_floats_match_drf(self):
+        data = {
+            "big": 1e16, "small": 1e-7, "plain": 0.1, "items": [123456789.5, -2.5e-5, 1.5e300], 1e20: "float key",
+            "lookalikes": ["1e5", "3e4f0c2a", "e1"],
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(dumps(data), JSONRenderer().render(data))
+        for value in (1e16, [-1e-7], {"a": {"b": 2e-9}}):
+            self.assertEqual(dumps(value), JSONRenderer().render(value))
+
+    def test_non_finite_floats(self):
+        for value in (float("nan"), float("inf"), float("-inf")):
+            with self.assertRaises(ValueError):
+                JSONRenderer().render({"value": [value]})
+            # orjson writes null; the stdlib path rejects them as DRF does
+            self.assertEqual(FastJSONRenderer().render({"value": [value]}), b'{"value":[null]}')
+            with override_settings(FAST_JSON_ENABLED=False), self.assertRaises(ValueError):
+                dumps({"value": [value]})
+
+    def test_indented_output_uses_drf(self):
+        rendered = FastJSONRenderer().render({"a": 1}, "application/json; indent=2")
+        self.assertEqual(rendered, JSONRenderer().render({"a": 1}, "application/json; indent=2"))
+
+    def test_parser(self):
+        self.assertEqual(FastJSONParser().parse(io.BytesIO('{"a": [1, "é"]}'.encode())), {"a": [1, "é"]})
+        with self.assertRaises(Exception):
+            FastJSONParser().parse(io.BytesIO(b"{nope"))
+
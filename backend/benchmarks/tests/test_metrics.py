@@ -0,0 +1,139 @@
+import json
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from backend.metrics import reset_metrics
+from backend.testing import QueryBudgetMixin
+from chat.models import Message, Room
+from jobs.models import Job, JobApplication
+from payments.models import Subscription, SubscriptionPlan
+from technicians.models import Skill
+
+User = get_user_model()
+
+CHANNEL_LAYERS_TEST = {
+    "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+}
+
+
+@override_settings(CHANNEL_LAYERS=CHANNEL_LAYERS_TEST, BACKGROUND_TASKS_EAGER=True)
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    # Budgets hold for any number of rows; every entry is hit with five of them
+    query_budgets = {
+        "job-list": 2,
+        "technician-list": 3,
+        "employer-applicants": 3,
+        "user-list": 1,
+        "room-list": 2,
+        "list-messages": 5,
+        "admin-technicians-list": 2,
+        "admin:chat_room_changelist": 6,
+        "admin:chat_message_changelist": 5,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(username="emp", email="emp@example.com", password="pass", role="employer")
+        cls.admin = User.objects.create_user(
+            username="root", email="root@example.com", password="pass", role="admin", is_staff=True, is_superuser=True,
+        )
+        skill = Skill.objects.create(name="Plumber")
+        plan = SubscriptionPlan.objects.create(name="Monthly", duration_months=1, price=1000)
+        cls.technicians = []
+        for i in range(5):
+            tech = User.objects.create_user(username=f"tech{i}", email=f"tech{i}@example.com", password="pass", role="technician")
+            profile = tech.technician_profile
+            profile.is_approved = True
+            profile.save(update_fields=["is_approved"])
+            profile.skills.add(skill)
+            Subscription.objects.create(user=tech, plan=plan, end_date=timezone.now() + timedelta(days=30))
+            job = Job.objects.create(employer=cls.employer, title=f"Job {i}", description="d", category="Plumbing")
+            JobApplication.objects.create(job=job, technician=tech)
+            room = Room.objects.create()
+            room.participants.add(cls.employer, tech)
+            Message.objects.create(room=room, sender=tech, content="hi")
+            cls.technicians.append(tech)
+        cls.room = room
+
+    def setUp(self):
+        reset_metrics()
+        self.client = APIClient()
+
+    def get(self, user, url, **params):
+        self.client.force_authenticate(user)
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content[:200])
+        return response
+
+    def test_hot_endpoints_stay_within_their_budgets(self):
+        for user, url in [
+            (self.employer, reverse("job-list")),
+            (self.employer, reverse("technician-list")),
+            (self.employer, reverse("employer-applicants")),
+            (self.admin, reverse("user-list")),
+            (self.employer, reverse("room-list")),
+            (self.employer, reverse("list-messages", kwargs={"room_id": self.room.id})),
+            (self.admin, reverse("admin-technicians-list")),
+        ]:
+            with self.subTest(url=url):
+                self.assertQueryBudget(self.get(user, url))
+
+    def test_admin_subscription_flag_is_annotated(self):
+        response = self.get(self.admin, reverse("admin-technicians-list"))
+        rows = response.data["results"] if isinstance(response.data, dict) else response.data
+        self.assertTrue(rows)
+        self.assertTrue(all(row["has_active_subscription"] for row in rows))
+        self.assertQueryBudget(response)
+
+    def test_django_admin_changelists(self):
+        self.client.force_login(self.admin)
+        for name in ("admin:chat_room_changelist", "admin:chat_message_changelist"):
+            with self.subTest(name=name):
+                response = self.client.get(reverse(name))
+                self.assertEqual(response.status_code, 200)
+                self.assertQueryBudget(response)
+
+    def test_budget_failure_names_the_endpoint(self):
+        with self.assertRaisesMessage(AssertionError, "room-list ran 2 queries, over its budget of 1"):
+            self.assertQueryBudget(self.get(self.employer, reverse("room-list")), budget=1)
+
+
+class MetricsEndpointTests(TestCase):
+    def setUp(self):
+        reset_metrics()
+        self.user = User.objects.create_user(username="emp", email="emp@example.com", password="pass", role="employer")
+        Job.objects.create(employer=self.user, title="Fix door", description="d", category="Carpentry")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_request_is_logged_as_one_json_line(self):
+        with self.assertLogs("backend.metrics", "INFO") as logs:
+            response = self.client.get(reverse("job-list"))
+        line = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(line["endpoint"], "job-list")
+        self.assertEqual(line["status"], 200)
+        self.assertEqual(line["queries"], response.wsgi_request.metrics.queries)
+        self.assertEqual(line["response_bytes"], len(response.content))
+        self.assertGreater(line["serialization_ms"], 0)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_prometheus_endpoint(self):
+        self.client.get(reverse("job-list"))
+        self.client.get(reverse("job-list"))
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 401)
+
+        body = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer s3cret").content.decode()
+        self.assertIn('http_requests_total{endpoint="job-list",method="GET",status="200"} 2', body)
+        self.assertIn('http_request_duration_seconds_count{endpoint="job-list",method="GET"} 2', body)
+        self.assertIn('http_request_db_queries_bucket{endpoint="job-list",method="GET",le="+Inf"} 2', body)
+        self.assertIn("# TYPE http_response_bytes_total counter", body)
+
+    @override_settings(METRICS_TOKEN="", DEBUG=False)
+    def test_endpoint_is_hidden_without_a_token(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 404)
@@ -0,0 +1,147 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import OperationalError, connections
+from django.http import HttpResponse
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from backend.replicas import PIN_COOKIE, pin_to_primary, reset_replica_health
+from jobs.models import Job
+
+User = get_user_model()
+
+REPLICA = "replica_test"
+SECOND_REPLICA = "replica_test_2"
+REPLICAS = (REPLICA, SECOND_REPLICA)
+CHANNEL_LAYERS_TEST = {
+    "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+}
+
+
+@override_settings(
+    DATABASE_REPLICAS=[REPLICA], CHANNEL_LAYERS=CHANNEL_LAYERS_TEST, BACKGROUND_TASKS_EAGER=True,
+)
+class ReplicaRoutingTests(TransactionTestCase):
+    """Other SQLite files play the replicas; they hold a snapshot of the primary taken in setUp."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Added only now: the runner would otherwise try to create and check a test database for them
+        cls.replica_paths = {}
+        for alias in REPLICAS:
+            handle, cls.replica_paths[alias] = tempfile.mkstemp(suffix=".sqlite3")
+            os.close(handle)
+            connections.settings[alias] = {**connections["default"].settings_dict, "NAME": cls.replica_paths[alias]}
+        cls.databases = {*cls.databases, *REPLICAS}
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.databases = cls.databases - set(REPLICAS)
+        for alias, path in cls.replica_paths.items():
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+            os.remove(path)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        reset_replica_health()
+        self.employer = User.objects.create_user(username="emp", email="emp@example.com", password="pass", role="employer")
+        self.create_job("Fix door")
+        self.sync_replica()
+        # Not on the replica yet
+        self.create_job("Install lights")
+
+    def create_job(self, title):
+        return Job.objects.create(
+            employer=self.employer, title=title, description="Repair", category="Carpentry",
+            location="Kigali", budget=30000, is_active=True,
+        )
+
+    def sync_replica(self):
+        for alias in ("default", *REPLICAS):
+            connections[alias].ensure_connection()
+        for alias in REPLICAS:
+            connections["default"].connection.backup(connections[alias].connection)
+
+    def job_titles(self, client):
+        response = client.get(reverse("job-list"))
+        self.assertEqual(response.status_code, 200)
+        return sorted(job["title"] for job in response.data["results"])
+
+    def test_public_reads_use_the_replica(self):
+        self.assertEqual(self.job_titles(APIClient()), ["Fix door"])
+        job = Job.objects.get(title="Fix door")
+        self.assertEqual(APIClient().get(reverse("job-detail", kwargs={"pk": job.pk})).status_code, 200)
+
+    @override_settings(DATABASE_REPLICAS=list(REPLICAS))
+    def test_one_replica_serves_the_whole_request(self):
+        # Alternating picks would split the count and page queries across replicas
+        picks = iter([REPLICA, SECOND_REPLICA] * 5)
+        with mock.patch("backend.replicas.random.choice", side_effect=lambda replicas: next(picks)) as choice:
+            with CaptureQueriesContext(connections[REPLICA]) as first, \
+                    CaptureQueriesContext(connections[SECOND_REPLICA]) as second:
+                self.assertEqual(self.job_titles(APIClient()), ["Fix door"])
+        self.assertEqual(choice.call_count, 1)
+        self.assertGreater(len(first), 1)
+        self.assertEqual(len(second), 0)
+
+    def test_other_reads_stay_on_the_primary(self):
+        self.assertEqual(Job.objects.all().db, "default")
+        client = APIClient()
+        client.force_authenticate(self.employer)
+        response = client.get(reverse("employer-my-jobs"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 2)
+
+    def test_writer_reads_from_the_primary_afterwards(self):
+        client = APIClient()
+        client.force_authenticate(self.employer)
+        response = client.post(reverse("employer-post-job"), {
+            "title": "Paint ceiling", "description": "White paint", "category": "Painting",
+            "location": "Kigali", "budget": 45000, "currency": "RWF",
+        }, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.job_titles(client), ["Fix door", "Install lights", "Paint ceiling"])
+        self.assertEqual(self.job_titles(APIClient()), ["Fix door"])
+
+        # Another worker without the shared cache still sees the signed pin cookie
+        cache.clear()
+        self.assertEqual(self.job_titles(client), ["Fix door", "Install lights", "Paint ceiling"])
+        client.cookies.clear()
+        self.assertEqual(self.job_titles(client), ["Fix door"])
+
+    def test_pin_cookie_must_be_signed_for_the_user(self):
+        client = APIClient()
+        client.force_authenticate(self.employer)
+        client.cookies[PIN_COOKIE] = str(self.employer.pk)
+        self.assertEqual(self.job_titles(client), ["Fix door"])
+        other = User.objects.create_user(username="other", email="other@example.com", password="pass", role="employer")
+        pinned = HttpResponse()
+        pin_to_primary(other.pk, pinned)
+        cache.clear()
+        client.cookies[PIN_COOKIE] = pinned.cookies[PIN_COOKIE].value
+        self.assertEqual(self.job_titles(client), ["Fix door"])
+
+    def test_lagging_replica_falls_back_to_the_primary(self):
+        with mock.patch("backend.replicas.replica_lag", return_value=60.0):
+            self.assertEqual(self.job_titles(APIClient()), ["Fix door", "Install lights"])
+
+    def test_unreachable_replica_falls_back_to_the_primary(self):
+        with mock.patch("backend.replicas.replica_lag", side_effect=OperationalError("unable to open database file")):
+            self.assertEqual(self.job_titles(APIClient()), ["Fix door", "Install lights"])
+
+    @override_settings(REPLICA_LAG_CHECK_INTERVAL=60)
+    def test_replica_health_is_cached(self):
+        with mock.patch("backend.replicas.replica_lag", return_value=0.0) as lag:
+            self.job_titles(APIClient())
+            self.job_titles(APIClient())
+        self.assertEqual(lag.call_count, 1)
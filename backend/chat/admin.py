@@ -1,6 +1,16 @@
 from django.contrib import admin
 from .models import Room, Message
 
-# Register your models here.
-admin.site.register(Room)
-admin.site.register(Message)
\ No newline at end of file
+
+@admin.register(Room)
+class RoomAdmin(admin.ModelAdmin):
+    def get_queryset(self, request):
+        # Room.__str__ lists the participants
+        return super().get_queryset(request).prefetch_related("participants")
+
+
+@admin.register(Message)
+class MessageAdmin(admin.ModelAdmin):
+    list_select_related = ("sender",)
+    # A select would render every Room (and its participants) in the form
+    raw_id_fields = ("room", "sender")
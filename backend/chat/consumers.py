@@ -4,10 +4,17 @@ from channels.db import database_sync_to_async
 from django.utils.timezone import now
 from django.contrib.auth.models import AnonymousUser
 from django.contrib.auth import get_user_model
+
+from backend.renderers import dumps_text
 from .models import Room, Message
 
 User = get_user_model()
 
+
+def message_event(message):
+    """Group event for a chat message, encoded once here rather than once per subscriber."""
+    return {"type": "chat.message", "text": dumps_text(message)}
+
 class ChatConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         self.room_id = self.scope["url_route"]["kwargs"]["room_id"]
@@ -45,23 +52,12 @@ class ChatConsumer(AsyncWebsocketConsumer):
         message = await self.create_message(self.user.id, int(self.room_id), content)
 
 
-        await self.channel_layer.group_send(
-            self.group_name,
-            {
-                "type": "chat.message",
-                "message": {
-                    "id": message["id"],
-                    "room": message["room"],
-                    "sender": message["sender"],
-                    "content": message["content"],
-                    "timestamp": message["timestamp"],
-                    "read": message["read"],
-                },
-            },
-        )
-    
+        await self.channel_layer.group_send(self.group_name, message_event(message))
+
     async def chat_message(self, event):
-        await self.send(text_data=json.dumps(event["message"]))
+        # Events from before pre-encoding still carry the dict
+        text = event.get("text")
+        await self.send(text_data=text if text is not None else json.dumps(event["message"]))
     
     @database_sync_to_async
     def _user_in_room(self, user_id, room_id):
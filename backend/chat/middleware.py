@@ -1,14 +1,18 @@
 from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
 from django.contrib.auth.models import AnonymousUser
-from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from accounts.authentication import CachedJWTAuthentication
+
 
 class JWTAuthMiddleware:
     def __init__(self, inner):
         self.inner = inner
-        self.jwt_auth = JWTAuthentication()
-    
+        self.jwt_auth = CachedJWTAuthentication()
+
     async def __call__(self, scope, receive, send):
-        query_string  = scope.get("query_string", b"").decode()
+        query_string = scope.get("query_string", b"").decode()
         params = parse_qs(query_string)
         token_list = params.get("token", [])
         user = AnonymousUser()
@@ -17,9 +21,10 @@ class JWTAuthMiddleware:
             raw_token = token_list[0]
             try:
                 validated = self.jwt_auth.get_validated_token(raw_token)
-                user = self.jwt_auth.get_user(validated)
+                # Even a cache hit checks the shared user version (Redis), so keep it off the event loop
+                user = await database_sync_to_async(self.jwt_auth.get_user)(validated)
             except Exception:
                 user = AnonymousUser()
-        
+
         scope["user"] = user
-        return await self.inner(scope, receive, send)
\ No newline at end of file
+        return await self.inner(scope, receive, send)
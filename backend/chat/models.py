@@ -19,6 +19,11 @@ class Message(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
     read = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["room", "timestamp"], name="chat_message_room_time"),
+        ]
+
     def __str__(self):
-        return f"Message {self.id} from Sender: {self.sender.username} | Room: {self.room.id}"
+        return f"Message {self.id} from Sender: {self.sender.username} | Room: {self.room_id}"
     
\ No newline at end of file
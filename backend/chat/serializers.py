@@ -1,11 +1,14 @@
 from rest_framework import serializers
 from .models import Message, Room
 from django.contrib.auth import get_user_model
+from accounts.fields import ImageVariantField
 
 User = get_user_model()
 
 
 class UserSerializer(serializers.ModelSerializer):
+    profile_picture = ImageVariantField(hash_field="profile_picture_hash", size="thumb", read_only=True)
+
     class Meta:
         model = User
         fields = ["id", "username", "email", "role", "profile_picture"]
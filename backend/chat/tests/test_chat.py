@@ -4,6 +4,11 @@ from rest_framework import status
 from django.contrib.auth import get_user_model
 from chat.models import Room, Message
 from django.test.utils import override_settings
+from unittest import mock
+import json
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from chat.consumers import ChatConsumer
 
 User = get_user_model()
 
@@ -64,6 +69,22 @@ class ChatTests(APITestCase):
         self.assertEqual(response.data["message"]["sender"], self.employer.username)
         self.assertEqual(response.data["message"]["content"], "Test message")
 
+    def test_broadcast_is_encoded_once_and_forwarded_verbatim(self):
+        room = Room.objects.create()
+        room.participants.add(self.employer, self.technician)
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(f"chat_{room.id}", channel)
+
+        self.client.post(reverse("send-message"), {"recipient_id": self.technician.id, "content": "Muraho"}, format="json")
+        event = async_to_sync(layer.receive)(channel)
+        self.assertEqual(json.loads(event["text"])["content"], "Muraho")
+
+        consumer = ChatConsumer()
+        with mock.patch.object(consumer, "send") as send:
+            async_to_sync(consumer.chat_message)(event)
+        send.assert_called_once_with(text_data=event["text"])
+
     def test_list_messages(self):
         room = Room.objects.create()
         room.participants.add(self.employer, self.technician)
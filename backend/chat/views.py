@@ -1,6 +1,7 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from .models import Message, Room
+from .consumers import message_event
 from .serializers import MessageSerializer, RoomSerializer
 from django.contrib.auth import get_user_model
 from channels.layers import get_channel_layer
@@ -16,7 +17,11 @@ class RoomListView(generics.ListAPIView):
 
     @swagger_auto_schema(tags=["Chat"], operation_summary="List my chat rooms")
     def get_queryset(self):
-        return Room.objects.filter(participants=self.request.user).order_by("-created_at")
+        return (
+            Room.objects.filter(participants=self.request.user)
+            .prefetch_related("participants")
+            .order_by("-created_at")
+        )
 
     @swagger_auto_schema(tags=["Chat"])
     def get(self, request, *args, **kwargs):
@@ -38,7 +43,7 @@ class MessageListView(generics.ListAPIView):
         if self.request.user not in room.participants.all():
             return Message.objects.none()
         
-        return Message.objects.filter(room=room).order_by("timestamp")
+        return Message.objects.filter(room=room).select_related("sender").order_by("timestamp")
 
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
@@ -101,22 +106,19 @@ class MessageSendView(generics.GenericAPIView):
             if channel_layer:
                 async_to_sync(channel_layer.group_send)(
                     f"chat_{room.id}",
-                    {
-                        "type": "chat.message",
-                        "message": {
-                            "id": message.id,
-                            "room": room.id,
-                            "sender": {
-                                "id": sender.id,
-                                "username": sender.username,
-                                "email": sender.email,
-                                "role": sender.role,
-                            },
-                            "content": message.content,
-                            "timestamp": message.timestamp.isoformat(),
-                            "read": message.read,
+                    message_event({
+                        "id": message.id,
+                        "room": room.id,
+                        "sender": {
+                            "id": sender.id,
+                            "username": sender.username,
+                            "email": sender.email,
+                            "role": sender.role,
                         },
-                    },
+                        "content": message.content,
+                        "timestamp": message.timestamp.isoformat(),
+                        "read": message.read,
+                    }),
                 )
         except Exception:
             # Skip broadcast errors (e.g., Redis down) to keep HTTP flow working
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employerprofile',
+            name='logo_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+    ]
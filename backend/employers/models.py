@@ -1,11 +1,14 @@
 from django.db import models
 from django.conf import settings
 
-class EmployerProfile(models.Model):
+from geo.models import GeoLocatedModel
+
+class EmployerProfile(GeoLocatedModel):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="employer_profile")
     company_name = models.CharField(max_length=120)
     company_description = models.TextField(blank=True)
     logo = models.ImageField(upload_to="logos/", blank=True, null=True)
+    logo_hash = models.CharField(max_length=64, blank=True, default="", editable=False)  # set once variants exist
     location = models.CharField(max_length=120, blank=True)
 
     def __str__(self):
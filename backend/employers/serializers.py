@@ -1,13 +1,18 @@
 from rest_framework import serializers
+
+from backend.sparse import SparseFieldsSerializerMixin
 from .models import EmployerProfile
 from technicians.models import TechnicianProfile, Skill
 from jobs.models import Job, JobApplication
+from accounts.fields import ImageVariantField
 
 # Employer profile
 class EmployerProfileSerializer(serializers.ModelSerializer):
+    logo = ImageVariantField(hash_field="logo_hash", size="medium", required=False, allow_null=True)
+
     class Meta:
         model = EmployerProfile
-        fields = ["id","company_name","company_description","location","logo"]
+        fields = ["id","company_name","company_description","location","latitude","longitude","logo"]
 
 # Read-only technician mini (for employer lists)
 class SkillMiniSerializer(serializers.ModelSerializer):
@@ -20,21 +25,26 @@ class TechnicianMiniSerializer(serializers.ModelSerializer):
     first_name = serializers.CharField(source="user.first_name", read_only=True)
     last_name = serializers.CharField(source="user.last_name", read_only=True)
     skills = SkillMiniSerializer(many=True, read_only=True)
+    distance_km = serializers.SerializerMethodField()
     class Meta:
         model = TechnicianProfile
-        fields = ["first_name","last_name","location","years_experience","rating_avg","rating_count","skills","is_approved"]
+        fields = ["first_name","last_name","location","years_experience","rating_avg","rating_count","skills","is_approved","distance_km"]
+
+    def get_distance_km(self, obj):
+        distance = getattr(obj, "distance_km", None)
+        return round(distance, 2) if distance is not None else None
 
 class JobCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Job
-        fields = ["id","title","description","category","location","budget","currency","is_active"]
+        fields = ["id","title","description","category","location","latitude","longitude","budget","currency","is_active"]
         read_only_fields = ["id","is_active"]
 
     def create(self, validated_data):
         user = self.context["request"].user
         return Job.objects.create(employer=user, **validated_data)
 
-class EmployerApplicationSerializer(serializers.ModelSerializer):
+class EmployerApplicationSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     technician_profile = TechnicianMiniSerializer(source="technician.technician_profile", read_only=True)
     class Meta:
         model = JobApplication
@@ -0,0 +1,6 @@
+from accounts.images import watch_image_field
+
+from .models import EmployerProfile
+
+
+watch_image_field(EmployerProfile, "logo", "logo_hash")
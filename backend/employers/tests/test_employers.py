@@ -130,3 +130,104 @@ class EmployerAPITests(APITestCase):
 
         self.app.refresh_from_db()
         self.assertEqual(self.app.status, JobApplication.HIRED)
+
+    def test_applicants_sparse_fields_skip_profile_joins(self):
+        job = Job.objects.create(employer=self.emp, title="Fix sink", description="d", category="Plumbing")
+        JobApplication.objects.create(job=job, technician=self.tech, cover_letter="hi")
+        client = APIClient(); client.force_authenticate(self.emp)
+        url = reverse("employer-applicants")
+        full = client.get(url)
+        self.assertEqual(full.data["results"][0]["technician_profile"]["skills"], [{"id": self.skill.id, "name": "Plumber"}])
+        with self.assertNumQueries(2):  # count + page
+            resp = client.get(url, {"fields": "id,status"})
+        self.assertEqual(resp.data["results"][0], {"id": full.data["results"][0]["id"], "status": "APPLIED"})
+
+
+class JobRecommendationTests(APITestCase):
+    def setUp(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from technicians.recommendations import reset_recommendation_index
+
+        reset_recommendation_index()
+        self.emp = User.objects.create_user(username="emp", email="emp@example.com", password="pass", role="employer")
+        plumber = Skill.objects.create(name="Plumber")
+        electrician = Skill.objects.create(name="Electrician")
+
+        def technician(username, location, skill, rating, bio="", approved=True):
+            user = User.objects.create_user(username=username, email=f"{username}@example.com", password="pass", role="technician")
+            profile = user.technician_profile
+            profile.location = location
+            profile.bio = bio
+            profile.rating_avg = rating
+            profile.is_approved = approved
+            profile.trial_ends_at = timezone.now() + timedelta(days=10)
+            profile.save()
+            profile.skills.add(skill)
+            return profile
+
+        self.near = technician("near", "Kimironko", plumber, 4.0, bio="Pipes, leaking taps and water tanks")
+        self.far = technician("far", "Musanze", plumber, 5.0)
+        self.sparky = technician("sparky", "Kimironko", electrician, 5.0)
+        self.hidden = technician("hidden", "Kimironko", plumber, 5.0, approved=False)
+        self.job = Job.objects.create(employer=self.emp, title="Fix leaking pipe", description="Kitchen sink leaking",
+                                      category="Plumbing", location="Remera")
+        self.url = reverse("employer-job-recommendations", kwargs={"pk": self.job.pk})
+        self.client = APIClient(); self.client.force_authenticate(self.emp)
+
+    def test_ranks_by_skill_and_distance(self):
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, 200)
+        ids = [r["id"] for r in resp.data["results"]]
+        self.assertEqual(ids, [self.near.id, self.far.id])
+        self.assertLess(resp.data["results"][0]["distance_km"], 5)
+        self.assertGreater(resp.data["results"][0]["score"], resp.data["results"][1]["score"])
+
+    def test_index_follows_profile_and_application_changes(self):
+        self.client.get(self.url)
+        self.hidden.is_approved = True
+        self.hidden.save(update_fields=["is_approved"])
+        JobApplication.objects.create(job=self.job, technician=self.near.user)
+
+        with self.assertNumQueries(8):
+            resp = self.client.get(self.url)
+        ids = [r["id"] for r in resp.data["results"]]
+        self.assertIn(self.hidden.id, ids)
+        self.assertNotIn(self.near.id, ids)
+
+    def test_other_employers_job_is_not_found(self):
+        other = User.objects.create_user(username="emp2", email="emp2@example.com", password="pass", role="employer")
+        client = APIClient(); client.force_authenticate(other)
+        self.assertEqual(client.get(self.url).status_code, 404)
+
+    def test_index_updates_wait_for_a_ranking_in_progress(self):
+        import threading
+        from unittest import mock
+        from technicians import recommendations
+
+        recommendations.rank_technicians(self.job)
+        errors = []
+
+        def update():
+            try:
+                recommendations.mark_profiles_dirty([self.near.id, self.far.id])
+                with mock.patch.object(recommendations, "load_candidates", return_value=[]):
+                    recommendations.rank_technicians(self.job)
+            except Exception as exc:
+                errors.append(exc)
+
+        updater = threading.Thread(target=update)
+        real_distance = recommendations.distance_km
+
+        def distance(*args):
+            # Both candidates leave the index while the first one is being scored
+            if not updater.ident:
+                updater.start()
+                updater.join(0.2)
+            return real_distance(*args)
+
+        with mock.patch.object(recommendations, "distance_km", side_effect=distance):
+            ranked = recommendations.rank_technicians(self.job)
+        updater.join()
+        self.assertEqual(errors, [])
+        self.assertEqual([profile_id for profile_id, _, _ in ranked], [self.near.id, self.far.id])
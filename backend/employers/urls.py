@@ -3,7 +3,7 @@ from .views import (
     MyEmployerProfileView, EmployerTechnicianListView, EmployerPostJobView,
     EmployerApplicantsListView, set_application_status,
     EmployerMyJobsView, EmployerJobDetailView,
-    EmployerCreateReviewView,
+    EmployerCreateReviewView, EmployerJobRecommendationsView,
 )
 
 urlpatterns = [
@@ -14,6 +14,7 @@ urlpatterns = [
     
     path("jobs/mine/", EmployerMyJobsView.as_view(), name="employer-my-jobs"),
     path("jobs/<int:pk>/", EmployerJobDetailView.as_view(), name="employer-job-detail"),
+    path("jobs/<int:pk>/recommendations/", EmployerJobRecommendationsView.as_view(), name="employer-job-recommendations"),
     path("applicants/", EmployerApplicantsListView.as_view(), name="employer-applicants"),
     path("applicants/<int:application_id>/status/<str:new_status>/", set_application_status, name="employer-set-status"),
 ]
@@ -7,12 +7,16 @@ from .serializers import (
     EmployerProfileSerializer, JobCreateSerializer, EmployerApplicationSerializer, TechnicianMiniSerializer
 )
 from .permissions import IsEmployer
+from backend.sparse import SparseFieldsMixin
 from technicians.models import TechnicianProfile, Review
 from django.utils import timezone
 from django.db.models import Q
 from technicians.serializers import ReviewSerializer
 from technicians.filters import TechnicianFilter
+from technicians.recommendations import recommend_technicians
+from notifications import events as notification_events
 from technicians.pagination import NinePerPagePagination
+from geo.filters import ProximityFilter
 from jobs.models import Job, JobApplication
 from jobs.serializers import JobSerializer, JobCreateUpdateSerializer, JobApplicationSerializer
 from django.utils import timezone
@@ -33,7 +37,7 @@ class EmployerTechnicianListView(generics.ListAPIView):
     serializer_class = TechnicianMiniSerializer
     permission_classes = [IsEmployer]
     pagination_class = NinePerPagePagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter, ProximityFilter]
     filterset_class = TechnicianFilter
     search_fields = ["user__username","bio","location","skills__name"]
     ordering_fields = ["rating_avg","years_experience"]
@@ -43,7 +47,7 @@ class EmployerTechnicianListView(generics.ListAPIView):
         now = timezone.now()
         return (
             TechnicianProfile.objects
-            .filter(is_approved=True, is_paused=False)
+            .filter(is_approved=True, is_paused=False, criminal_record_hidden=False)
             .filter(
                 Q(trial_ends_at__gte=now) |
                 Q(user__subscriptions__status="ACTIVE", user__subscriptions__end_date__gte=now)
@@ -57,21 +61,23 @@ class EmployerPostJobView(generics.CreateAPIView):
     permission_classes = [IsEmployer]
 
 
-class EmployerApplicantsListView(generics.ListAPIView):
+class EmployerApplicantsListView(SparseFieldsMixin, generics.ListAPIView):
     serializer_class = EmployerApplicationSerializer
     permission_classes = [IsEmployer]
     filter_backends = [filters.SearchFilter, DjangoFilterBackend]
     search_fields = ["technician__username","technician__email","cover_letter","job__title"]
     filterset_fields = ["status","job"]
     pagination_class = NinePerPagePagination
+    sparse_columns = {"technician_profile": ["technician"]}
 
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False) or not self.request.user.is_authenticated:
             return JobApplication.objects.none()
-        return JobApplication.objects.filter(job__employer=self.request.user)\
-            .select_related("job","technician","technician__technician_profile")\
-            .prefetch_related("technician__technician_profile__skills")\
-            .order_by("-created_at")
+        queryset = JobApplication.objects.filter(job__employer=self.request.user).order_by("-created_at")
+        if self.wants_field("technician_profile"):
+            queryset = queryset.select_related("technician__technician_profile")\
+                .prefetch_related("technician__technician_profile__skills")
+        return self.sparse_only(queryset)
 
 
 
@@ -102,6 +108,34 @@ class EmployerJobDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 
+class EmployerJobRecommendationsView(generics.GenericAPIView):
+    """
+    GET /api/employers/jobs/<pk>/recommendations/?limit=10
+    Technicians ranked for one of the employer's jobs; those who already applied are left out.
+    """
+    serializer_class = TechnicianMiniSerializer
+    permission_classes = [IsEmployer]
+    max_limit = 50
+
+    def get_queryset(self):
+        if getattr(self, "swagger_fake_view", False) or not self.request.user.is_authenticated:
+            return Job.objects.none()
+        return Job.objects.filter(employer=self.request.user)
+
+    def get(self, request, pk):
+        job = self.get_object()
+        try:
+            limit = min(max(int(request.query_params.get("limit", 10)), 1), self.max_limit)
+        except ValueError:
+            return Response({"detail": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        ranked = recommend_technicians(job, limit=limit)
+        results = [
+            {"id": profile.id, "score": round(score, 4), **self.get_serializer(profile).data}
+            for profile, score in ranked
+        ]
+        return Response({"job_id": job.id, "results": results})
+
+
 class EmployerCreateReviewView(generics.CreateAPIView):
     serializer_class = ReviewSerializer
     permission_classes = [IsEmployer]
@@ -131,7 +165,7 @@ def set_application_status(request, application_id: int, new_status: str):
         return Response({"detail": "Invalid status"}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        app = JobApplication.objects.select_related("job").get(id=application_id, job__employer=request.user)
+        app = JobApplication.objects.select_related("job", "technician").get(id=application_id, job__employer=request.user)
     except JobApplication.DoesNotExist:
         return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
 
@@ -142,4 +176,5 @@ def set_application_status(request, application_id: int, new_status: str):
     if new_status == JobApplication.HIRED:
         app.hired_at = timezone.now()
     app.save()
+    notification_events.application_status_changed([app])
     return Response({"ok": True, "status": app.status, "application_id": app.id})
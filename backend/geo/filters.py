@@ -0,0 +1,73 @@
+import math
+
+from django.db.models import ExpressionWrapper, F, FloatField, Value
+from django.db.models.functions import Sqrt
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .gazetteer import geocode
+from .grid import KM_PER_DEGREE, bounding_box, cells_within
+
+DEFAULT_RADIUS_KM = 25.0
+MAX_RADIUS_KM = 300.0
+
+
+def distance_expression(lat, lng):
+    """Distance in km from (lat, lng), computed in SQL with the same approximation as grid.distance_km."""
+    k = math.cos(math.radians(lat))
+    dlat = F("latitude") - Value(lat)
+    dlng = (F("longitude") - Value(lng)) * Value(k)
+    return ExpressionWrapper(Value(KM_PER_DEGREE) * Sqrt(dlat * dlat + dlng * dlng), output_field=FloatField())
+
+
+class ProximityFilter(BaseFilterBackend):
+    """
+    ?near=<place> or ?lat=&lng=, with an optional ?radius_km= (default 25, max 300).
+
+    Keeps rows within the radius, annotates ``distance_km`` and orders nearest first
+    unless the client asked for another ?ordering=. Without a point the queryset is untouched.
+    """
+
+    def get_point(self, request):
+        params = request.query_params
+        if params.get("lat") or params.get("lng"):
+            try:
+                lat, lng = float(params["lat"]), float(params["lng"])
+            except (KeyError, ValueError):
+                raise ValidationError({"lat": "lat and lng must both be numbers."})
+            if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+                raise ValidationError({"lat": "lat/lng out of range."})
+            return lat, lng
+        near = params.get("near")
+        if near:
+            point = geocode(near)
+            if point is None:
+                raise ValidationError({"near": f"Unknown place '{near}'."})
+            return point
+        return None
+
+    def get_radius(self, request):
+        try:
+            radius = float(request.query_params.get("radius_km", DEFAULT_RADIUS_KM))
+        except ValueError:
+            raise ValidationError({"radius_km": "radius_km must be a number."})
+        return min(max(radius, 0.0), MAX_RADIUS_KM)
+
+    def filter_queryset(self, request, queryset, view):
+        point = self.get_point(request)
+        if point is None:
+            return queryset
+        lat, lng = point
+        radius = self.get_radius(request)
+
+        cells = cells_within(lat, lng, radius)
+        if cells is not None:
+            queryset = queryset.filter(geo_cell__in=cells)
+        else:
+            min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius)
+            queryset = queryset.filter(latitude__range=(min_lat, max_lat), longitude__range=(min_lng, max_lng))
+
+        queryset = queryset.annotate(distance_km=distance_expression(lat, lng)).filter(distance_km__lte=radius)
+        if not request.query_params.get("ordering"):
+            queryset = queryset.order_by("distance_km", "pk")
+        return queryset
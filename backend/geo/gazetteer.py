@@ -0,0 +1,48 @@
+"""
+Offline geocoding of free-text locations against a bundled list of Rwandan places.
+
+data/rwanda_places.json holds approximate centroids for the city of Kigali, all 30
+districts (with their former town names as aliases) and the Kigali sectors that show up
+most in listings. The most specific place mentioned wins: "Kimironko, Gasabo" resolves
+to the Kimironko sector rather than the district.
+"""
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / "data" / "rwanda_places.json"
+
+# Lower rank = more specific
+_KIND_RANK = {"sector": 0, "district": 1, "city": 2}
+_TOKEN = re.compile(r"[a-z']+")
+
+
+def _normalize(text):
+    return " ".join(_TOKEN.findall((text or "").lower()))
+
+
+@lru_cache(maxsize=1)
+def load_places():
+    places = json.loads(GAZETTEER_PATH.read_text())
+    by_name = {}
+    for place in places:
+        for name in [place["name"], *place.get("aliases", [])]:
+            by_name[_normalize(name)] = place
+    return by_name
+
+
+@lru_cache(maxsize=4096)
+def geocode(text):
+    """Return (lat, lng) for the most specific known place named in text, or None."""
+    words = _normalize(text).split()
+    places = load_places()
+    best = None
+    for size in (3, 2, 1):
+        for start in range(len(words) - size + 1):
+            place = places.get(" ".join(words[start:start + size]))
+            if place and (best is None or _KIND_RANK[place["kind"]] < _KIND_RANK[best["kind"]]):
+                best = place
+    if best is None:
+        return None
+    return best["lat"], best["lng"]
@@ -0,0 +1,38 @@
+"""
+Fixed-size lat/lng grid used as a cheap spatial index without PostGIS.
+
+Each located row stores the key of the CELL_DEGREES x CELL_DEGREES cell it falls in
+(about 5.5 km at Rwanda's latitude). A radius query first narrows rows to the cells
+overlapping the search box with an indexed IN lookup, then filters on exact distance.
+"""
+import math
+
+CELL_DEGREES = 0.05
+KM_PER_DEGREE = 111.32
+MAX_CELLS_PER_QUERY = 400
+
+
+def cell_for(lat, lng):
+    return f"{math.floor(lat / CELL_DEGREES)}:{math.floor(lng / CELL_DEGREES)}"
+
+
+def bounding_box(lat, lng, radius_km):
+    dlat = radius_km / KM_PER_DEGREE
+    dlng = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+    return lat - dlat, lat + dlat, lng - dlng, lng + dlng
+
+
+def cells_within(lat, lng, radius_km):
+    """Keys of every cell overlapping the radius' bounding box, or None if there would be too many."""
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+    rows = range(math.floor(min_lat / CELL_DEGREES), math.floor(max_lat / CELL_DEGREES) + 1)
+    cols = range(math.floor(min_lng / CELL_DEGREES), math.floor(max_lng / CELL_DEGREES) + 1)
+    if len(rows) * len(cols) > MAX_CELLS_PER_QUERY:
+        return None
+    return [f"{row}:{col}" for row in rows for col in cols]
+
+
+def distance_km(lat1, lng1, lat2, lng2):
+    """Equirectangular approximation; accurate to well under 1% over the distances we rank on."""
+    k = math.cos(math.radians((lat1 + lat2) / 2))
+    return KM_PER_DEGREE * math.hypot(lat2 - lat1, (lng2 - lng1) * k)
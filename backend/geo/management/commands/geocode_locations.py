@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from employers.models import EmployerProfile
+from geo.models import GEO_FIELDS
+from jobs.models import Job
+from technicians.models import TechnicianProfile
+
+MODELS = {
+    "jobs": Job,
+    "technicians": TechnicianProfile,
+    "employers": EmployerProfile,
+}
+
+
+class Command(BaseCommand):
+    help = "Fill in coordinates and grid cells for rows whose location has not been geocoded yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", choices=sorted(MODELS), action="append", help="Limit to these models (repeatable).")
+        parser.add_argument("--all", action="store_true", help="Re-geocode every row, not only those missing a cell.")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        for label in options["model"] or sorted(MODELS):
+            model = MODELS[label]
+            qs = model.objects.exclude(location="").only("pk", "location", *GEO_FIELDS).order_by("pk")
+            if not options["all"]:
+                qs = qs.filter(geo_cell="")
+            batch, located, seen = [], 0, 0
+            for obj in qs.iterator(chunk_size=options["batch_size"]):
+                seen += 1
+                if options["all"]:
+                    obj.latitude = obj.longitude = None
+                obj._stored_geo = None
+                obj.update_geo()
+                if obj.geo_cell:
+                    located += 1
+                    batch.append(obj)
+                if len(batch) >= options["batch_size"]:
+                    model.objects.bulk_update(batch, GEO_FIELDS)
+                    batch = []
+            if batch:
+                model.objects.bulk_update(batch, GEO_FIELDS)
+            self.stdout.write(f"{label}: located {located} of {seen} rows")
@@ -0,0 +1,55 @@
+from django.db import models
+
+from .gazetteer import geocode
+from .grid import cell_for
+
+GEO_FIELDS = ("latitude", "longitude", "geo_cell")
+
+
+class GeoLocatedModel(models.Model):
+    """
+    Optional coordinates for models with a free-text ``location``.
+
+    Coordinates set explicitly are kept; otherwise they are geocoded from ``location``
+    whenever it changes. ``geo_cell`` is derived from the coordinates for radius queries
+    (see geo.grid and geo.filters.ProximityFilter).
+    """
+
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geo_cell = models.CharField(max_length=24, blank=True, default="", db_index=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_geo()
+        return instance
+
+    def _remember_geo(self):
+        if not ({"location", "latitude", "longitude"} & self.get_deferred_fields()):
+            self._stored_geo = (self.location, self.latitude, self.longitude)
+
+    def update_geo(self):
+        stored = getattr(self, "_stored_geo", None)
+        coords_changed = stored is None or (self.latitude, self.longitude) != stored[1:]
+        location_changed = stored is None or self.location != stored[0]
+        if not (coords_changed and self.latitude is not None and self.longitude is not None) and location_changed:
+            point = geocode(self.location) if self.location else None
+            self.latitude, self.longitude = point if point else (None, None)
+        if self.latitude is not None and self.longitude is not None:
+            self.geo_cell = cell_for(self.latitude, self.longitude)
+        else:
+            self.geo_cell = ""
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        touches_geo = update_fields is None or {"location", "latitude", "longitude"} & set(update_fields)
+        if touches_geo and not ({"location", "latitude", "longitude"} & self.get_deferred_fields()):
+            self.update_geo()
+            if update_fields is not None:
+                kwargs["update_fields"] = set(update_fields) | set(GEO_FIELDS)
+        super().save(*args, **kwargs)
+        self._remember_geo()
@@ -0,0 +1,69 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from geo.gazetteer import geocode
+from geo.grid import cell_for, distance_km
+from jobs.models import Job
+
+User = get_user_model()
+
+
+class GazetteerTests(APITestCase):
+    def test_most_specific_place_wins(self):
+        self.assertEqual(geocode("Kimironko, Gasabo"), (-1.9494, 30.1263))
+        self.assertEqual(geocode("gasabo district"), (-1.8937, 30.1127))
+        self.assertIsNone(geocode("Somewhere else"))
+
+    def test_distance_is_roughly_right(self):
+        # Kigali to Musanze is about 65 km as the crow flies
+        self.assertAlmostEqual(distance_km(-1.9441, 30.0619, -1.4998, 29.6343), 68, delta=5)
+
+
+class ProximitySearchTests(APITestCase):
+    def setUp(self):
+        self.emp = User.objects.create_user(username="emp", password="pass", role="employer", email="emp@example.com")
+        self.kimironko = Job.objects.create(employer=self.emp, title="Tiles", description="d", category="Masonry", location="Kimironko")
+        self.downtown = Job.objects.create(employer=self.emp, title="Sink", description="d", category="Plumbing", location="Kigali")
+        self.musanze = Job.objects.create(employer=self.emp, title="Roof", description="d", category="Roofing", location="Musanze")
+        self.unknown = Job.objects.create(employer=self.emp, title="Fence", description="d", category="Carpentry", location="Nowhere")
+
+    def test_location_is_geocoded_on_save(self):
+        self.assertEqual((self.kimironko.latitude, self.kimironko.longitude), (-1.9494, 30.1263))
+        self.assertEqual(self.kimironko.geo_cell, cell_for(-1.9494, 30.1263))
+        self.assertEqual(self.unknown.geo_cell, "")
+
+        self.kimironko.location = "Musanze"
+        self.kimironko.save(update_fields=["location"])
+        self.kimironko.refresh_from_db()
+        self.assertEqual(self.kimironko.geo_cell, self.musanze.geo_cell)
+
+    def test_explicit_coordinates_are_kept(self):
+        job = Job.objects.create(employer=self.emp, title="Gate", description="d", category="Welding",
+                                 location="Kigali", latitude=-2.0, longitude=30.0)
+        self.assertEqual((job.latitude, job.longitude), (-2.0, 30.0))
+
+    def test_near_filters_by_radius_and_orders_by_distance(self):
+        resp = self.client.get(reverse("job-list"), {"near": "Kimironko", "radius_km": 20})
+        self.assertEqual(resp.status_code, 200)
+        titles = [r["title"] for r in resp.data["results"]]
+        self.assertEqual(titles, ["Tiles", "Sink"])
+        self.assertEqual(resp.data["results"][0]["distance_km"], 0)
+
+        resp = self.client.get(reverse("job-list"), {"lat": -1.5, "lng": 29.63, "radius_km": 10})
+        self.assertEqual([r["title"] for r in resp.data["results"]], ["Roof"])
+
+    def test_bad_parameters(self):
+        self.assertEqual(self.client.get(reverse("job-list"), {"near": "Atlantis"}).status_code, 400)
+        self.assertEqual(self.client.get(reverse("job-list"), {"lat": "x", "lng": 1}).status_code, 400)
+
+    def test_backfill_command(self):
+        Job.objects.filter(pk=self.downtown.pk).update(latitude=None, longitude=None, geo_cell="")
+        out = StringIO()
+        call_command("geocode_locations", "--model", "jobs", stdout=out)
+        self.assertIn("located 1 of 2 rows", out.getvalue())
+        self.downtown.refresh_from_db()
+        self.assertEqual(self.downtown.geo_cell, cell_for(-1.9441, 30.0619))
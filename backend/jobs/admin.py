@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Job, JobApplication
+from notifications import events as notification_events
+from .models import Job, JobApplication, SavedSearch
 
 
 @admin.register(Job)
@@ -16,12 +17,27 @@ class JobApplicationAdmin(admin.ModelAdmin):
     search_fields = ("job__title", "technician__username")
     actions = ["mark_as_hired", "mark_as_rejected"]
 
+    def _set_status(self, request, queryset, new_status):
+        changed = list(queryset.exclude(status=new_status).select_related("job", "technician"))
+        updated = JobApplication.objects.filter(pk__in=[app.pk for app in changed]).update(status=new_status)
+        for app in changed:
+            app.status = new_status
+        # Queued in one go; delivered as one insert and one push per technician
+        notification_events.application_status_changed(changed)
+        self.message_user(request, f"Marked {updated} application(s) as {new_status}.")
+
     @admin.action(description="Mark selected as HIRED")
     def mark_as_hired(self, request, queryset):
-        updated = queryset.update(status=JobApplication.HIRED)
-        self.message_user(request, f"Marked {updated} application(s) as HIRED.")
+        self._set_status(request, queryset, JobApplication.HIRED)
 
     @admin.action(description="Mark selected as REJECTED")
     def mark_as_rejected(self, request, queryset):
-        updated = queryset.update(status=JobApplication.REJECTED)
-        self.message_user(request, f"Marked {updated} application(s) as REJECTED.")
+        self._set_status(request, queryset, JobApplication.REJECTED)
+
+
+@admin.register(SavedSearch)
+class SavedSearchAdmin(admin.ModelAdmin):
+    list_display = ("user", "name", "query", "category", "location", "is_active", "created_at")
+    list_filter = ("is_active", "notify_email")
+    search_fields = ("user__username", "name", "query", "category", "location")
+
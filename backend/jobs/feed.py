@@ -0,0 +1,199 @@
+"""
+"Jobs for me": active jobs scored against one technician.
+
+Recent active jobs are held in a column-oriented index (NumPy arrays of coordinates,
+timestamps and category codes, plus per-skill row arrays), so scoring every candidate
+job for a technician is a handful of vector operations. Each technician's ranked ids are
+cached; the cache key carries a global version replaced on Job changes and a per-user
+version replaced on profile, skill and application changes (see jobs.signals).
+"""
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from geo.grid import KM_PER_DEGREE
+from technicians.models import Skill, SkillAlias, TechnicianProfile
+from technicians.recommendations import terms
+from .models import Job, JobApplication
+
+WEIGHTS = {"skills": 0.45, "distance": 0.25, "history": 0.15, "recency": 0.15}
+DISTANCE_SCALE_KM = 15.0
+NEARBY_KM = 25.0
+RECENCY_SCALE_DAYS = 14.0
+FEED_SIZE = 100
+FEED_CACHE_TIMEOUT = 300
+
+GLOBAL_VERSION_KEY = "jobs:feed:version"
+
+
+def _category_key(category):
+    return " ".join((category or "").lower().split())
+
+
+class JobFeedIndex:
+    def __init__(self, rows, skill_names):
+        # rows: (id, category, title, description, latitude, longitude, created_at)
+        self.ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.lat = np.array([np.nan if row[4] is None else row[4] for row in rows], dtype=np.float64)
+        self.lng = np.array([np.nan if row[5] is None else row[5] for row in rows], dtype=np.float64)
+        self.created = np.array([row[6].timestamp() for row in rows], dtype=np.float64)
+        self.category_codes = {}
+        self.categories = np.array(
+            [self.category_codes.setdefault(_category_key(row[1]), len(self.category_codes)) for row in rows],
+            dtype=np.int64,
+        )
+
+        skill_stems = {}
+        for skill_id, name in skill_names:
+            for term in terms(name):
+                skill_stems.setdefault(term, set()).add(skill_id)
+        # skill id -> {row: weight}; category/title mentions count fully, description half
+        matches = {}
+        for row_no, (_, category, title, description, *_rest) in enumerate(rows):
+            for text, weight in ((f"{category} {title}", 1.0), (description, 0.5)):
+                for term in set(terms(text)):
+                    for skill_id in skill_stems.get(term, ()):
+                        per_row = matches.setdefault(skill_id, {})
+                        per_row[row_no] = max(per_row.get(row_no, 0.0), weight)
+        self.skill_rows = {
+            skill_id: (np.fromiter(per_row.keys(), dtype=np.int64), np.fromiter(per_row.values(), dtype=np.float64))
+            for skill_id, per_row in matches.items()
+        }
+
+    def __len__(self):
+        return len(self.ids)
+
+    def score(self, skill_ids, latitude, longitude, category_counts, exclude_ids=(), now=None, limit=FEED_SIZE):
+        """Return [(job_id, score)] best first for a technician with the given features."""
+        if not len(self):
+            return []
+        now = (now or timezone.now()).timestamp()
+
+        skill = np.zeros(len(self))
+        for skill_id in skill_ids:
+            if skill_id in self.skill_rows:
+                rows, weights = self.skill_rows[skill_id]
+                skill[rows] = np.maximum(skill[rows], weights)
+
+        if latitude is not None and longitude is not None:
+            k = np.cos(np.radians(latitude))
+            distance = KM_PER_DEGREE * np.hypot(self.lat - latitude, (self.lng - longitude) * k)
+            nearby = distance <= NEARBY_KM
+            proximity = np.nan_to_num(np.exp(-distance / DISTANCE_SCALE_KM))
+        else:
+            nearby = np.zeros(len(self), dtype=bool)
+            proximity = np.zeros(len(self))
+
+        affinity = np.zeros(len(self.category_codes) + 1)
+        if category_counts:
+            top = max(category_counts.values())
+            for category, count in category_counts.items():
+                code = self.category_codes.get(_category_key(category))
+                if code is not None:
+                    affinity[code] = count / top
+        history = affinity[self.categories]
+
+        recency = np.exp(-(now - self.created) / (RECENCY_SCALE_DAYS * 86400))
+        score = (
+            WEIGHTS["skills"] * skill
+            + WEIGHTS["distance"] * proximity
+            + WEIGHTS["history"] * history
+            + WEIGHTS["recency"] * recency
+        )
+        mask = (skill > 0) | (history > 0) | nearby
+        if exclude_ids:
+            mask &= ~np.isin(self.ids, np.fromiter(exclude_ids, dtype=np.int64))
+        rows = np.flatnonzero(mask)
+        # Best score first, newest first on ties
+        order = rows[np.lexsort((-self.created[rows], -score[rows]))][:limit]
+        return [(int(self.ids[row]), float(score[row])) for row in order]
+
+
+_index = None
+_index_version = None
+_index_built_at = 0.0
+_index_lock = threading.Lock()
+
+
+def _new_version():
+    # A fresh token rather than a counter: an evicted key can't come back with an old value
+    return uuid.uuid4().hex
+
+
+def feed_version():
+    return cache.get_or_set(GLOBAL_VERSION_KEY, _new_version, None)
+
+
+def _user_version_key(user_id):
+    return f"jobs:feed:user:{user_id}"
+
+
+def bump_feed_version():
+    cache.set(GLOBAL_VERSION_KEY, _new_version(), None)
+
+
+def bump_user_feed_version(user_id):
+    cache.set(_user_version_key(user_id), _new_version(), None)
+
+
+def get_feed_index(version):
+    """Index of recent active jobs, rebuilt when Jobs change (version) or after JOB_FEED_INDEX_TTL seconds."""
+    global _index, _index_version, _index_built_at
+    ttl = getattr(settings, "JOB_FEED_INDEX_TTL", 300)
+    with _index_lock:
+        if _index is None or _index_version != version or time.monotonic() - _index_built_at >= ttl:
+            window = timezone.now() - timedelta(days=getattr(settings, "JOB_FEED_WINDOW_DAYS", 60))
+            rows = list(
+                Job.objects.filter(is_active=True, created_at__gte=window)
+                .order_by("-created_at")
+                .values_list("id", "category", "title", "description", "latitude", "longitude", "created_at")
+                [:getattr(settings, "JOB_FEED_MAX_JOBS", 5000)]
+            )
+            skill_names = list(Skill.objects.values_list("id", "name")) + list(SkillAlias.objects.values_list("skill_id", "name"))
+            _index = JobFeedIndex(rows, skill_names)
+            _index_version = version
+            _index_built_at = time.monotonic()
+        return _index
+
+
+def reset_feed_index():
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def compute_feed(user):
+    profile = TechnicianProfile.objects.filter(user=user).values("id", "latitude", "longitude").first()
+    skill_ids = []
+    latitude = longitude = None
+    if profile:
+        latitude, longitude = profile["latitude"], profile["longitude"]
+        skill_ids = list(
+            TechnicianProfile.skills.through.objects
+            .filter(technicianprofile_id=profile["id"]).values_list("skill_id", flat=True)
+        )
+    applied = list(JobApplication.objects.filter(technician=user).values_list("job_id", "job__category"))
+    index = get_feed_index(feed_version())
+    return index.score(
+        skill_ids, latitude, longitude,
+        category_counts=Counter(category for _, category in applied),
+        exclude_ids={job_id for job_id, _ in applied},
+    )
+
+
+def get_feed(user):
+    """Ranked [(job_id, score)] for user, served from the cache when nothing relevant changed."""
+    user_version = cache.get_or_set(_user_version_key(user.pk), _new_version, None)
+    key = f"jobs:feed:{feed_version()}:{user.pk}:{user_version}"
+    feed = cache.get(key)
+    if feed is None:
+        feed = compute_feed(user)
+        cache.set(key, feed, getattr(settings, "JOB_FEED_CACHE_TIMEOUT", FEED_CACHE_TIMEOUT))
+    return feed
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='geo_cell',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=24),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_job_geo_cell_job_latitude_job_longitude'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=80)),
+                ('query', models.CharField(blank=True, max_length=160)),
+                ('category', models.CharField(blank=True, max_length=64)),
+                ('location', models.CharField(blank=True, max_length=120)),
+                ('min_budget', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('max_budget', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('notify_email', models.BooleanField(default=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SavedSearchMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('pushed_at', models.DateTimeField(blank=True, null=True)),
+                ('emailed_at', models.DateTimeField(blank=True, null=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_search_matches', to='jobs.job')),
+                ('search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='jobs.savedsearch')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='savedsearch',
+            index=models.Index(fields=['user', 'is_active'], name='jobs_saveds_user_id_c1626e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='savedsearchmatch',
+            index=models.Index(fields=['search', 'created_at'], name='jobs_saveds_search__f7542c_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='savedsearchmatch',
+            unique_together={('search', 'job')},
+        ),
+    ]
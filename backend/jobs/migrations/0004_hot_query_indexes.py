@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_saved_searches'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='jobapplication',
+            name='jobs_jobapp_technic_3a1767_idx',
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='jobs_job_active_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['technician', '-created_at'], name='jobs_jobapp_tech_recent'),
+        ),
+    ]
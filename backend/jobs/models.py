@@ -1,8 +1,11 @@
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 
+from geo.models import GeoLocatedModel
 
-class Job(models.Model):
+
+class Job(GeoLocatedModel):
     employer = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="jobs"
     )
@@ -20,6 +23,8 @@ class Job(models.Model):
             models.Index(fields=["is_active", "category"]),
             models.Index(fields=["location"]),
             models.Index(fields=["created_at"]),
+            # The public list: active jobs, newest first
+            models.Index(fields=["-created_at"], condition=Q(is_active=True), name="jobs_job_active_recent"),
         ]
 
     def __str__(self):
@@ -57,10 +62,52 @@ class JobApplication(models.Model):
         unique_together = ("job", "technician")
         indexes = [
             models.Index(fields=["job", "status"]),
-            models.Index(fields=["technician"]),
+            models.Index(fields=["technician", "-created_at"], name="jobs_jobapp_tech_recent"),
             models.Index(fields=["created_at"]),
         ]
 
     def __str__(self):
         return f"App<{self.job_id}:{self.technician_id}:{self.status}>"
 
+
+
+class SavedSearch(models.Model):
+    """A JobListView search a user wants to be told about when new jobs match it."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="saved_searches"
+    )
+    name = models.CharField(max_length=80, blank=True)
+    query = models.CharField(max_length=160, blank=True)  # same as ?q= on the job list
+    category = models.CharField(max_length=64, blank=True)
+    location = models.CharField(max_length=120, blank=True)
+    min_budget = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    max_budget = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    notify_email = models.BooleanField(default=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "is_active"]),
+        ]
+
+    def __str__(self):
+        return f"Search<{self.user_id}:{self.name or self.query or self.category}>"
+
+
+class SavedSearchMatch(models.Model):
+    search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name="matches")
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="saved_search_matches")
+    created_at = models.DateTimeField(auto_now_add=True)
+    pushed_at = models.DateTimeField(null=True, blank=True)
+    emailed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ("search", "job")
+        indexes = [
+            models.Index(fields=["search", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"Match<{self.search_id}:{self.job_id}>"
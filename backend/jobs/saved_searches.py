@@ -0,0 +1,212 @@
+"""
+Matching new jobs against saved searches, and delivering the matches.
+
+Saved searches use the same semantics as JobListView's filters (case-insensitive
+substring matches on category/location, ?q= against title or description, inclusive
+budget bounds). Each search is indexed under one trigram of its most selective text
+criterion; a substring match implies that trigram occurs in the job, so a new job only
+has to look up its own trigrams to find every search that could match it, and only those
+candidates are checked in full. Searches without any text criterion of 3+ characters are
+kept in a small list that is always checked.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from backend.tasks import run_in_background
+from notifications.service import user_group_name
+from .models import Job, SavedSearch, SavedSearchMatch
+
+logger = logging.getLogger(__name__)
+
+EMAIL_BATCH_SIZE = 100
+
+
+def _trigrams(text):
+    text = (text or "").lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SavedSearchIndex:
+    # Anchor fields in order of preference, with the job attributes they are matched against
+    FIELDS = (
+        ("category", ("category",)),
+        ("query", ("title", "description")),
+        ("location", ("location",)),
+    )
+
+    def __init__(self, searches):
+        self.searches = {}
+        self.postings = defaultdict(list)
+        self.unanchored = []
+        for search in searches:
+            self.add(search)
+
+    def add(self, search):
+        self.searches[search.id] = search
+        for field, _ in self.FIELDS:
+            grams = _trigrams(getattr(search, field))
+            if grams:
+                # Pick the trigram with the shortest posting list so far to keep candidates few
+                gram = min(sorted(grams), key=lambda g: len(self.postings.get((field, g), ())))
+                self.postings[(field, gram)].append(search.id)
+                return
+        self.unanchored.append(search.id)
+
+    def candidates(self, job):
+        ids = set(self.unanchored)
+        for field, attributes in self.FIELDS:
+            grams = set()
+            for attribute in attributes:
+                grams |= _trigrams(getattr(job, attribute))
+            for gram in grams:
+                ids.update(self.postings.get((field, gram), ()))
+        return [self.searches[search_id] for search_id in ids]
+
+    def match(self, job):
+        return [search for search in self.candidates(job) if search_matches(search, job)]
+
+
+def search_matches(search, job):
+    def contains(needle, *haystacks):
+        needle = (needle or "").lower()
+        return not needle or any(needle in (h or "").lower() for h in haystacks)
+
+    if not (contains(search.category, job.category) and contains(search.location, job.location)):
+        return False
+    if not contains(search.query, job.title, job.description):
+        return False
+    if search.min_budget is not None and (job.budget is None or job.budget < search.min_budget):
+        return False
+    if search.max_budget is not None and (job.budget is None or job.budget > search.max_budget):
+        return False
+    return True
+
+
+_index = None
+_index_built_at = 0.0
+_index_lock = threading.Lock()
+
+
+def mark_saved_search_index_stale():
+    global _index
+    _index = None
+
+
+def get_saved_search_index():
+    """Current SavedSearchIndex, rebuilt after local changes or SAVED_SEARCH_INDEX_TTL seconds."""
+    global _index, _index_built_at
+    ttl = getattr(settings, "SAVED_SEARCH_INDEX_TTL", 60)
+    with _index_lock:
+        if _index is None or time.monotonic() - _index_built_at >= ttl:
+            _index = SavedSearchIndex(
+                SavedSearch.objects.filter(is_active=True).only(
+                    "id", "user_id", "query", "category", "location", "min_budget", "max_budget", "notify_email",
+                )
+            )
+            _index_built_at = time.monotonic()
+        return _index
+
+
+def match_new_job(job_id):
+    """Record matches for a freshly created job and send them out."""
+    job = Job.objects.filter(pk=job_id, is_active=True).first()
+    if job is None:
+        return []
+    matched = [search.id for search in get_saved_search_index().match(job)]
+    if not matched:
+        return []
+    # Another process may have deleted or paused a search since the index was built
+    matched = list(SavedSearch.objects.filter(pk__in=matched, is_active=True).values_list("pk", flat=True))
+    SavedSearchMatch.objects.bulk_create(
+        [SavedSearchMatch(search_id=search_id, job=job) for search_id in matched],
+        ignore_conflicts=True,
+    )
+    deliver_matches(SavedSearchMatch.objects.filter(job=job, pushed_at__isnull=True).values_list("pk", flat=True))
+    return matched
+
+
+def _job_payload(job):
+    return {
+        "id": job.id,
+        "title": job.title,
+        "category": job.category,
+        "location": job.location,
+        "budget": str(job.budget) if job.budget is not None else None,
+        "currency": job.currency,
+    }
+
+
+def deliver_matches(match_ids):
+    """
+    Push pending matches to each user's sockets (one group_send per user) and email the
+    ones whose search asks for it (one message per user, sent over a shared connection).
+    """
+    matches = list(
+        SavedSearchMatch.objects
+        .filter(pk__in=list(match_ids))
+        .select_related("job", "search", "search__user")
+        .order_by("pk")
+    )
+    if not matches:
+        return
+    by_user = defaultdict(list)
+    for match in matches:
+        by_user[match.search.user_id].append(match)
+
+    now = timezone.now()
+    pushed = []
+    channel_layer = get_channel_layer()
+    for user_id, user_matches in by_user.items():
+        event = {
+            "type": "saved_search.matches",
+            "matches": [
+                {"search_id": m.search_id, "search_name": m.search.name, "job": _job_payload(m.job)}
+                for m in user_matches
+            ],
+        }
+        try:
+            async_to_sync(channel_layer.group_send)(user_group_name(user_id), event)
+        except Exception:
+            logger.warning("Could not push saved-search matches to user %s", user_id, exc_info=True)
+            continue
+        pushed.extend(m.pk for m in user_matches)
+    if pushed:
+        SavedSearchMatch.objects.filter(pk__in=pushed).update(pushed_at=now)
+
+    outgoing = []
+    for user_id, user_matches in by_user.items():
+        to_email = [m for m in user_matches if m.search.notify_email and m.emailed_at is None]
+        user = user_matches[0].search.user
+        if not to_email or not user.email:
+            continue
+        lines = [f"- {m.job.title} ({m.job.category}, {m.job.location or 'N/A'})" for m in to_email]
+        message = EmailMessage(
+            subject=f"{len(to_email)} new job(s) match your saved searches",
+            body="New jobs matching your saved searches:\n\n" + "\n".join(lines),
+            from_email=getattr(settings, "DEFAULT_FROM_EMAIL", None),
+            to=[user.email],
+        )
+        outgoing.append((message, [m.pk for m in to_email]))
+    if not outgoing:
+        return
+    emailed = []
+    connection = get_connection(fail_silently=True)
+    for start in range(0, len(outgoing), EMAIL_BATCH_SIZE):
+        batch = outgoing[start:start + EMAIL_BATCH_SIZE]
+        # With fail_silently a failed batch reports 0 sent; leave it for the next delivery
+        if connection.send_messages([message for message, _ in batch]):
+            emailed.extend(pk for _, pks in batch for pk in pks)
+    if emailed:
+        SavedSearchMatch.objects.filter(pk__in=emailed).update(emailed_at=now)
+
+
+def queue_job_matching(job):
+    run_in_background(match_new_job, job.pk)
@@ -1,22 +1,30 @@
 from rest_framework import serializers
-from .models import Job, JobApplication
 
-class JobSerializer(serializers.ModelSerializer):
+from backend.sparse import SparseFieldsSerializerMixin
+from .models import Job, JobApplication, SavedSearch, SavedSearchMatch
+
+class JobSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     employer_id = serializers.IntegerField(source="employer.id", read_only=True)
     applications_count = serializers.IntegerField(read_only=True)
+    distance_km = serializers.SerializerMethodField()
 
     class Meta:
         model = Job
         fields = [
             "id", "employer_id", "title", "description", "category", "location",
-            "budget", "currency", "is_active", "created_at", "applications_count"
+            "latitude", "longitude", "budget", "currency", "is_active", "created_at",
+            "applications_count", "distance_km"
         ]
         read_only_fields = ["id", "employer_id", "created_at", "applications_count", "is_active"]
 
+    def get_distance_km(self, obj):
+        distance = getattr(obj, "distance_km", None)
+        return round(distance, 2) if distance is not None else None
+
 class JobCreateUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Job
-        fields = ["title", "description", "category", "location", "budget", "currency", "is_active"]
+        fields = ["title", "description", "category", "location", "latitude", "longitude", "budget", "currency", "is_active"]
 
 # jobs/serializers.py
 class JobApplicationSerializer(serializers.ModelSerializer):
@@ -29,3 +37,30 @@ class JobApplicationSerializer(serializers.ModelSerializer):
                   "cover_letter","status","shortlisted_at","hired_at","created_at"]
         read_only_fields = ["id","job","technician","technician_id",
                             "status","shortlisted_at","hired_at","created_at","job_title"]
+
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SavedSearch
+        fields = ["id", "name", "query", "category", "location", "min_budget", "max_budget",
+                  "notify_email", "is_active", "created_at"]
+        read_only_fields = ["id", "created_at"]
+
+    CRITERIA = ("query", "category", "location", "min_budget", "max_budget")
+
+    def validate(self, attrs):
+        data = {field: getattr(self.instance, field, None) for field in self.CRITERIA}
+        data.update({field: attrs[field] for field in self.CRITERIA if field in attrs})
+        if all(data[field] in (None, "") for field in self.CRITERIA):
+            raise serializers.ValidationError("Give at least one of query, category, location or a budget bound.")
+        if data["min_budget"] is not None and data["max_budget"] is not None and data["min_budget"] > data["max_budget"]:
+            raise serializers.ValidationError({"max_budget": "max_budget must not be below min_budget."})
+        return attrs
+
+
+class SavedSearchMatchSerializer(serializers.ModelSerializer):
+    job = JobSerializer(read_only=True)
+
+    class Meta:
+        model = SavedSearchMatch
+        fields = ["id", "search", "job", "created_at"]
@@ -0,0 +1,65 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from technicians.models import TechnicianProfile
+from technicians.signals import technician_profiles_changed
+from .feed import bump_feed_version, bump_user_feed_version
+from .models import Job, JobApplication, SavedSearch
+from .saved_searches import mark_saved_search_index_stale, queue_job_matching
+
+
+def _invalidate(bump, *args):
+    # Bump now for this request and again after commit, so a feed computed by another
+    # request from pre-commit data can't survive under the new version
+    bump(*args)
+    transaction.on_commit(lambda: bump(*args))
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def job_changed(sender, instance: Job, **kwargs):
+    _invalidate(bump_feed_version)
+
+
+@receiver(post_save, sender=Job)
+def job_created(sender, instance: Job, created, **kwargs):
+    if created and instance.is_active:
+        queue_job_matching(instance)
+
+
+@receiver(post_save, sender=SavedSearch)
+@receiver(post_delete, sender=SavedSearch)
+def saved_search_changed(sender, instance: SavedSearch, **kwargs):
+    mark_saved_search_index_stale()
+    transaction.on_commit(mark_saved_search_index_stale)
+
+
+@receiver(post_save, sender=JobApplication)
+@receiver(post_delete, sender=JobApplication)
+def application_changed(sender, instance: JobApplication, **kwargs):
+    _invalidate(bump_user_feed_version, instance.technician_id)
+
+
+@receiver(post_save, sender=TechnicianProfile)
+def technician_profile_saved(sender, instance: TechnicianProfile, update_fields=None, **kwargs):
+    # Rating recomputes and admin flags don't change what the feed scores on
+    if update_fields is None or {"location", "latitude", "longitude"} & set(update_fields):
+        _invalidate(bump_user_feed_version, instance.user_id)
+
+
+@receiver(m2m_changed, sender=TechnicianProfile.skills.through)
+def technician_skills_changed(sender, instance, action, reverse, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        # Changed from the Skill side; cheaper to invalidate every feed than to look up owners
+        _invalidate(bump_feed_version)
+    else:
+        _invalidate(bump_user_feed_version, instance.user_id)
+
+
+@receiver(technician_profiles_changed)
+def technician_profiles_bulk_changed(sender, fields=(), **kwargs):
+    if {"location", "latitude", "longitude"} & set(fields):
+        _invalidate(bump_feed_version)
@@ -1,8 +1,17 @@
 # jobs/tests/test_jobs_api.py
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
 from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.test import override_settings
 from django.urls import reverse
-from rest_framework.test import APITestCase, APIClient
-from jobs.models import Job, JobApplication
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory
+from jobs.feed import GLOBAL_VERSION_KEY, reset_feed_index
+from jobs.models import Job, JobApplication, SavedSearch, SavedSearchMatch
+from jobs.views import JobListView
+from jobs.saved_searches import SavedSearchIndex, mark_saved_search_index_stale, user_group_name
+from technicians.models import Skill
 
 User = get_user_model()
 
@@ -75,3 +84,144 @@ class JobAPITests(APITestCase):
         self.assertEqual(len(resp.data["results"]), 1)
         # Serializer returns job id, not title, in employer applicants list
         self.assertEqual(resp.data["results"][0]["job"], self.job2.id)
+
+    def test_job_list_sparse_fields_and_values_path_match_serializer(self):
+        url = reverse("job-list")
+        resp = self.public_client.get(url, {"fields": "id,title,applications_count"})
+        self.assertEqual(set(resp.data["results"][0]), {"id", "title", "applications_count"})
+
+        factory = APIRequestFactory()
+        for params in ({}, {"near": "Kigali"}, {"fields": "title,budget,created_at,distance_km"}):
+            bodies = [
+                JobListView.as_view(use_values_path=flag)(factory.get(url, params)).render().content
+                for flag in (False, True)
+            ]
+            self.assertEqual(bodies[0], bodies[1], params)
+
+
+class JobFeedTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        reset_feed_index()
+        self.emp = User.objects.create_user(username="emp", password="pass", role="employer", email="emp@example.com")
+        self.tech = User.objects.create_user(username="tech", password="pass", role="technician", email="tech@example.com")
+        profile = self.tech.technician_profile
+        profile.location = "Kimironko"
+        profile.save()
+        profile.skills.add(Skill.objects.create(name="Plumber"))
+
+        def job(title, category, location):
+            return Job.objects.create(employer=self.emp, title=title, description="d", category=category, location=location)
+
+        self.near_plumbing = job("Leaking tap", "Plumbing", "Remera")
+        self.far_plumbing = job("Borehole pump", "Plumbing", "Musanze")
+        self.near_other = job("Paint walls", "Painting", "Kimironko")
+        self.far_other = job("Roof repair", "Roofing", "Huye")
+        self.client = APIClient(); self.client.force_authenticate(self.tech)
+        self.url = reverse("technician-job-feed")
+
+    def titles(self):
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, 200)
+        return [r["title"] for r in resp.data["results"]]
+
+    def test_feed_ranks_skill_and_distance_matches(self):
+        self.assertEqual(self.titles(), ["Leaking tap", "Borehole pump", "Paint walls"])
+
+    def test_feed_is_cached_until_jobs_or_profile_change(self):
+        self.titles()
+        # Cached feed: only the page of jobs is loaded
+        with self.assertNumQueries(1):
+            self.titles()
+
+        Job.objects.create(employer=self.emp, title="New shower", description="d", category="Plumbing", location="Kigali")
+        self.assertIn("New shower", self.titles())
+
+        JobApplication.objects.create(job=self.near_plumbing, technician=self.tech)
+        self.assertNotIn("Leaking tap", self.titles())
+
+    def test_evicted_version_never_brings_back_an_older_feed(self):
+        # Feed cached under a freshly started version
+        cache.delete(GLOBAL_VERSION_KEY)
+        self.titles()
+        Job.objects.create(employer=self.emp, title="New shower", description="d", category="Plumbing", location="Kigali")
+        self.assertIn("New shower", self.titles())
+        # The cache dropped the version key, but not the feed cached before the job existed
+        cache.delete(GLOBAL_VERSION_KEY)
+        self.assertIn("New shower", self.titles())
+
+    def test_application_history_pulls_in_categories(self):
+        JobApplication.objects.create(job=Job.objects.create(
+            employer=self.emp, title="Old roof", description="d", category="Roofing", location="Huye"), technician=self.tech)
+        self.assertIn("Roof repair", self.titles())
+
+    def test_only_technicians(self):
+        client = APIClient(); client.force_authenticate(self.emp)
+        self.assertEqual(client.get(self.url).status_code, 403)
+
+
+@override_settings(
+    BACKGROUND_TASKS_EAGER=True,
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+)
+class SavedSearchTests(APITestCase):
+    def setUp(self):
+        mark_saved_search_index_stale()
+        self.emp = User.objects.create_user(username="emp", password="pass", role="employer", email="emp@example.com")
+        self.tech = User.objects.create_user(username="tech", password="pass", role="technician", email="tech@example.com")
+        self.client = APIClient(); self.client.force_authenticate(self.tech)
+
+    def post_job(self, **fields):
+        data = {"title": "Fix tap", "description": "Leaking kitchen tap", "category": "Plumbing", "location": "Kigali", **fields}
+        return Job.objects.create(employer=self.emp, **data)
+
+    def test_create_and_validate(self):
+        url = reverse("saved-search-list")
+        resp = self.client.post(url, {"name": "Plumbing in Kigali", "category": "plumb", "location": "kigali"}, format="json")
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(self.client.post(url, {"name": "Everything"}, format="json").status_code, 400)
+        resp = self.client.post(url, {"query": "tap", "min_budget": 500, "max_budget": 100}, format="json")
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(self.client.get(url).data["count"], 1)
+
+    def test_new_job_is_matched_pushed_and_emailed_once_per_user(self):
+        plumbing = SavedSearch.objects.create(user=self.tech, name="Plumbing", category="plumb")
+        taps = SavedSearch.objects.create(user=self.tech, name="Taps", query="TAP", max_budget=50000)
+        SavedSearch.objects.create(user=self.tech, name="Musanze", location="Musanze")
+
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(user_group_name(self.tech.id), channel)
+
+        job = self.post_job(budget=20000)
+        self.assertEqual(
+            set(SavedSearchMatch.objects.filter(job=job).values_list("search_id", flat=True)),
+            {plumbing.id, taps.id},
+        )
+        event = async_to_sync(layer.receive)(channel)
+        self.assertEqual(event["type"], "saved_search.matches")
+        self.assertEqual(len(event["matches"]), 2)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn("Fix tap", mail.outbox[0].body)
+        self.assertFalse(SavedSearchMatch.objects.filter(emailed_at__isnull=True).exists())
+
+        resp = self.client.get(reverse("saved-search-matches", kwargs={"pk": plumbing.id}))
+        self.assertEqual([m["job"]["id"] for m in resp.data["results"]], [job.id])
+
+    def test_budget_bounds_and_inactive_searches(self):
+        SavedSearch.objects.create(user=self.tech, query="tap", min_budget=100000)
+        SavedSearch.objects.create(user=self.tech, category="plumbing", is_active=False)
+        self.post_job(budget=20000)
+        self.post_job(budget=None)
+        self.assertFalse(SavedSearchMatch.objects.exists())
+        self.assertEqual(mail.outbox, [])
+
+    def test_index_only_checks_searches_sharing_a_trigram(self):
+        searches = [SavedSearch(id=1, category="Electrical"), SavedSearch(id=2, query="tap"),
+                    SavedSearch(id=3, location="Huye"), SavedSearch(id=4, min_budget=10)]
+        index = SavedSearchIndex(searches)
+        job = Job(title="Fix tap", description="", category="Plumbing", location="Kigali", budget=5)
+        self.assertEqual({s.id for s in index.candidates(job)}, {2, 4})
+        self.assertEqual([s.id for s in index.match(job)], [2])
+
@@ -1,10 +1,16 @@
 from django.urls import path
 from .views import (
-    JobListView, JobRetrieveView
+    JobListView, JobRetrieveView,
+    SavedSearchListCreateView, SavedSearchDetailView, SavedSearchMatchesView,
 )
 
 urlpatterns = [
     # Public
     path("", JobListView.as_view(), name="job-list"),
     path("<int:pk>/", JobRetrieveView.as_view(), name="job-detail"),
+
+    # Technician saved searches
+    path("saved-searches/", SavedSearchListCreateView.as_view(), name="saved-search-list"),
+    path("saved-searches/<int:pk>/", SavedSearchDetailView.as_view(), name="saved-search-detail"),
+    path("saved-searches/<int:pk>/matches/", SavedSearchMatchesView.as_view(), name="saved-search-matches"),
 ]
@@ -1,15 +1,21 @@
 from rest_framework import generics, permissions, filters, status
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied, NotFound
-from django.db.models import Count
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django_filters.rest_framework import DjangoFilterBackend
 
-from .models import Job, JobApplication
+from backend.replicas import ReplicaReadMixin
+from backend.sparse import ValuesListMixin, ValuesRowSerializer
+from .models import Job, JobApplication, SavedSearch, SavedSearchMatch
 from .serializers import (
-    JobSerializer, JobCreateUpdateSerializer, JobApplicationSerializer
+    JobSerializer, JobCreateUpdateSerializer, JobApplicationSerializer,
+    SavedSearchSerializer, SavedSearchMatchSerializer,
 )
 from .filters import JobFilter
 from .pagination import JobsPagination
+from geo.filters import ProximityFilter
+from notifications import events as notification_events
 from django.db import IntegrityError
 from rest_framework import serializers
 
@@ -22,22 +28,42 @@ except Exception:
 
 
 
+def applications_count():
+    """Per-job application count as a correlated subquery: no GROUP BY, so a page can be read
+    straight off the jobs_job_active_recent index instead of sorting every active job."""
+    applications = JobApplication.objects.filter(job=OuterRef("pk")).order_by().values("job")
+    return Coalesce(
+        Subquery(applications.annotate(count=Count("pk")).values("count")), Value(0), output_field=IntegerField(),
+    )
+
+
 # PUBLIC list of active jobs with filters/search/order/pagination
-class JobListView(generics.ListAPIView):
+class JobListView(ReplicaReadMixin, ValuesListMixin, generics.ListAPIView):
     serializer_class = JobSerializer
     permission_classes = [permissions.AllowAny]
     pagination_class = JobsPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter, ProximityFilter]
     filterset_class = JobFilter
     search_fields = ["title", "description", "category", "location"]
     ordering_fields = ["created_at", "budget", "title"]
     ordering = ["-created_at"]
 
     def get_queryset(self):
-        return (
-            Job.objects.filter(is_active=True)
-            .annotate(applications_count=Count("applications"))
-            .select_related("employer")
+        queryset = Job.objects.filter(is_active=True)
+        if self.wants_field("applications_count"):
+            queryset = queryset.annotate(applications_count=applications_count())
+        if not self.use_values_path:
+            queryset = queryset.select_related("employer")
+        return queryset
+
+    def get_values_serializer(self, serializer, queryset):
+        # distance_km only exists when ProximityFilter got a point; otherwise it is null
+        located = "distance_km" in queryset.query.annotations
+        return ValuesRowSerializer(
+            serializer,
+            lookups={"employer_id": "employer_id", "distance_km": "distance_km"},
+            converters={"distance_km": lambda distance: round(distance, 2)},
+            deferred=() if located else ("distance_km",),
         )
 
 
@@ -51,7 +77,7 @@ class JobCreateView(generics.CreateAPIView):
 
 
 # PUBLIC retrieve a job
-class JobRetrieveView(generics.RetrieveAPIView):
+class JobRetrieveView(ReplicaReadMixin, generics.RetrieveAPIView):
     queryset = Job.objects.all().annotate(applications_count=Count("applications")).select_related("employer")
     serializer_class = JobSerializer
     permission_classes = [permissions.AllowAny]
@@ -83,9 +109,10 @@ class ApplyToJobView(generics.CreateAPIView):
     def perform_create(self, serializer):
         job = Job.objects.get(pk=self.kwargs["job_id"], is_active=True)
         try:
-            serializer.save(job=job, technician=self.request.user)  # ✅ sets the right tech
+            application = serializer.save(job=job, technician=self.request.user)  # ✅ sets the right tech
         except IntegrityError:
             raise serializers.ValidationError({"detail": "You have already applied to this job."})
+        notification_events.application_received(application)
 
 
 # TECHNICIAN: my applications
@@ -130,3 +157,42 @@ class MyJobsView(generics.ListAPIView):
             .annotate(applications_count=Count("applications"))\
             .order_by("-created_at")
 
+
+# TECHNICIAN: saved searches that notify on new matching jobs
+class SavedSearchListCreateView(generics.ListCreateAPIView):
+    serializer_class = SavedSearchSerializer
+    permission_classes = [IsTechnician]
+    pagination_class = JobsPagination
+
+    def get_queryset(self):
+        if getattr(self, "swagger_fake_view", False) or not self.request.user.is_authenticated:
+            return SavedSearch.objects.none()
+        return SavedSearch.objects.filter(user=self.request.user).order_by("-created_at")
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+class SavedSearchDetailView(generics.RetrieveUpdateDestroyAPIView):
+    serializer_class = SavedSearchSerializer
+    permission_classes = [IsTechnician]
+
+    def get_queryset(self):
+        if getattr(self, "swagger_fake_view", False) or not self.request.user.is_authenticated:
+            return SavedSearch.objects.none()
+        return SavedSearch.objects.filter(user=self.request.user)
+
+
+class SavedSearchMatchesView(generics.ListAPIView):
+    serializer_class = SavedSearchMatchSerializer
+    permission_classes = [IsTechnician]
+    pagination_class = JobsPagination
+
+    def get_queryset(self):
+        if getattr(self, "swagger_fake_view", False) or not self.request.user.is_authenticated:
+            return SavedSearchMatch.objects.none()
+        return (SavedSearchMatch.objects
+                .filter(search__user=self.request.user, search_id=self.kwargs["pk"])
+                .select_related("job", "job__employer")
+                .order_by("-created_at"))
+
@@ -0,0 +1,18 @@
+from django.contrib import admin
+from .models import Notification, OutboxEmail
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ("user", "kind", "title", "read_at", "created_at")
+    list_filter = ("kind", "created_at")
+    search_fields = ("user__username", "title")
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ("template", "to_email", "status", "attempts", "next_attempt_at", "sent_at")
+    list_filter = ("status", "template")
+    search_fields = ("to_email",)
+    readonly_fields = ("claim_token", "claimed_at", "last_error", "created_at", "sent_at")
+
@@ -0,0 +1,29 @@
+import json
+
+from channels.generic.websocket import AsyncWebsocketConsumer
+from django.contrib.auth.models import AnonymousUser
+
+from .service import user_group_name
+
+
+class NotificationConsumer(AsyncWebsocketConsumer):
+    """Per-user push channel; delivers notification batches and saved-search matches."""
+
+    async def connect(self):
+        self.user = self.scope.get("user", None)
+        if not self.user or isinstance(self.user, AnonymousUser):
+            await self.close(code=4401)
+            return
+        self.group_name = user_group_name(self.user.id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, close_code):
+        if hasattr(self, "group_name"):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def notification_batch(self, event):
+        await self.send(text_data=json.dumps({"type": "notifications", "notifications": event["notifications"]}))
+
+    async def saved_search_matches(self, event):
+        await self.send(text_data=json.dumps({"type": "saved_search_matches", "matches": event["matches"]}))
@@ -0,0 +1,72 @@
+"""The notifications the marketplace sends; callers pass model instances, not text."""
+from django.contrib.auth import get_user_model
+
+from .mail import enqueue_emails
+from .models import Notification
+from .service import notify
+
+
+def application_received(application):
+    job = application.job
+    notify(
+        [job.employer_id], Notification.Kind.APPLICATION_RECEIVED,
+        f"New application for {job.title}",
+        data={"job_id": job.id, "application_id": application.id},
+    )
+
+
+def application_status_changed(applications):
+    """applications: JobApplication rows (with job and technician loaded) that now carry their new status."""
+    emails = []
+    for application in applications:
+        status = application.get_status_display().lower()
+        notify(
+            [application.technician_id], Notification.Kind.APPLICATION_STATUS,
+            f"Your application for {application.job.title} is now {status}",
+            data={"job_id": application.job_id, "application_id": application.id, "status": application.status},
+        )
+        emails.append(("application_status", application.technician.email, {
+            "username": application.technician.username, "job_title": application.job.title, "status": status,
+        }))
+    enqueue_emails(emails)
+
+
+def review_received(review):
+    notify(
+        [review.technician.user_id], Notification.Kind.REVIEW_RECEIVED,
+        f"You received a {review.rating}-star review",
+        body=review.comment,
+        data={"review_id": review.id},
+    )
+
+
+def subscription_activated(subscription):
+    notify(
+        [subscription.user_id], Notification.Kind.SUBSCRIPTION_ACTIVE,
+        "Your subscription is active",
+        data={"subscription_id": subscription.id, "end_date": subscription.end_date.isoformat()},
+    )
+
+
+def technicians_approved(user_ids):
+    users = list(get_user_model().objects.filter(pk__in=list(user_ids)).values_list("pk", "username", "email"))
+    notify([pk for pk, _, _ in users], Notification.Kind.PROFILE_APPROVED, "Your technician profile has been approved")
+    enqueue_emails([("profile_approved", email, {"username": username}) for _, username, email in users])
+
+
+def criminal_records_expiring(rows, now):
+    """rows: (user_id, username, email, expires_at) for each technician to remind."""
+    emails = []
+    for user_id, username, email, expires_at in rows:
+        expired = expires_at <= now
+        date = expires_at.date().isoformat()
+        notify(
+            [user_id], Notification.Kind.CRIMINAL_RECORD_EXPIRING,
+            f"Your criminal record certificate expired on {date}" if expired
+            else f"Your criminal record certificate expires on {date}",
+            body="Upload a new certificate to stay visible to employers.",
+            data={"expires_at": expires_at.isoformat(), "expired": expired},
+        )
+        emails.append(("criminal_record_expiring", email, {"username": username, "expires_on": date, "expired": expired}))
+    enqueue_emails(emails)
+
@@ -0,0 +1,147 @@
+"""
+DB-backed email outbox.
+
+Request handlers call enqueue_email(); the send_outbox command (or, with
+EMAIL_OUTBOX_AUTOSEND, a background task after commit) claims due rows in batches, loads
+each template once per batch and sends everything over one open SMTP connection. Failed
+messages are retried with exponential backoff up to EMAIL_OUTBOX_MAX_ATTEMPTS.
+
+Rows are claimed with a conditional UPDATE carrying a random token, so several workers
+can run at once on any database without sending a message twice.
+"""
+import logging
+import smtplib
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.template.loader import get_template
+from django.utils import timezone
+
+from backend.tasks import run_in_background
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+BACKOFF_BASE_SECONDS = 60
+BACKOFF_MAX_SECONDS = 6 * 60 * 60
+# A SENDING row older than this belongs to a worker that died; make it claimable again
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+def enqueue_email(template, to_email, context=None):
+    return enqueue_emails([(template, to_email, context)])
+
+
+def enqueue_emails(messages):
+    """messages: iterable of (template, to_email, context). Blank addresses are skipped."""
+    rows = OutboxEmail.objects.bulk_create([
+        OutboxEmail(template=template, to_email=to_email, context=context or {})
+        for template, to_email, context in messages
+        if to_email
+    ])
+    if rows and getattr(settings, "EMAIL_OUTBOX_AUTOSEND", True):
+        run_in_background(send_pending)
+    return rows
+
+
+def backoff(attempts):
+    return timedelta(seconds=min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS))
+
+
+def claim_batch(batch_size=BATCH_SIZE):
+    now = timezone.now()
+    due = (
+        OutboxEmail.objects
+        .filter(
+            Q(status=OutboxEmail.Status.PENDING, next_attempt_at__lte=now)
+            | Q(status=OutboxEmail.Status.SENDING, claimed_at__lt=now - CLAIM_TIMEOUT)
+        )
+        .order_by("next_attempt_at", "pk")
+        .values_list("pk", flat=True)[:batch_size]
+    )
+    token = uuid.uuid4().hex
+    OutboxEmail.objects.filter(
+        Q(status=OutboxEmail.Status.PENDING) | Q(status=OutboxEmail.Status.SENDING, claimed_at__lt=now - CLAIM_TIMEOUT),
+        pk__in=list(due),
+    ).update(status=OutboxEmail.Status.SENDING, claim_token=token, claimed_at=now)
+    return list(OutboxEmail.objects.filter(claim_token=token, status=OutboxEmail.Status.SENDING).order_by("pk"))
+
+
+def render(email, templates):
+    """Build the EmailMessage for email, compiling each template at most once per batch."""
+    if email.template not in templates:
+        templates[email.template] = (
+            get_template(f"emails/{email.template}_subject.txt"),
+            get_template(f"emails/{email.template}.txt"),
+        )
+    subject_template, body_template = templates[email.template]
+    subject = " ".join(subject_template.render(email.context).split())
+    return EmailMessage(
+        subject=subject,
+        body=body_template.render(email.context),
+        from_email=getattr(settings, "DEFAULT_FROM_EMAIL", None),
+        to=[email.to_email],
+    )
+
+
+def send_batch(emails, connection):
+    """Send claimed rows over connection and record the outcome; returns the number sent."""
+    templates = {}
+    now = timezone.now()
+    max_attempts = getattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 5)
+    sent, failed = [], []
+    for email in emails:
+        try:
+            message = render(email, templates)
+            message.connection = connection
+            try:
+                delivered = message.send()
+            except smtplib.SMTPServerDisconnected:
+                # The server dropped the idle connection; reconnect once and retry
+                connection.close()
+                connection.open()
+                delivered = message.send()
+            if not delivered:
+                raise smtplib.SMTPException("Backend reported the message as not sent.")
+        except Exception as exc:
+            email.attempts += 1
+            email.last_error = f"{exc.__class__.__name__}: {exc}"[:255]
+            if email.attempts >= max_attempts:
+                email.status = OutboxEmail.Status.FAILED
+            else:
+                email.status = OutboxEmail.Status.PENDING
+                email.next_attempt_at = now + backoff(email.attempts)
+            failed.append(email)
+            continue
+        email.status = OutboxEmail.Status.SENT
+        email.attempts += 1
+        email.sent_at = now
+        sent.append(email)
+    if sent or failed:
+        OutboxEmail.objects.bulk_update(
+            sent + failed, ["status", "attempts", "sent_at", "next_attempt_at", "last_error"]
+        )
+    if failed:
+        logger.warning("%d outbox email(s) failed in this batch", len(failed))
+    return len(sent)
+
+
+def send_pending(batch_size=BATCH_SIZE, max_batches=None, connection=None):
+    """Send due emails batch by batch over one persistent connection; returns the number sent."""
+    emails = claim_batch(batch_size)
+    if not emails:
+        return 0
+    total = batches = 0
+    connection = connection or get_connection()
+    with connection:
+        while emails:
+            total += send_batch(emails, connection)
+            batches += 1
+            if max_batches is not None and batches >= max_batches:
+                break
+            emails = claim_batch(batch_size)
+    return total
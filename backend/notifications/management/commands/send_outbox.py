@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.mail import BATCH_SIZE, send_pending
+
+
+class Command(BaseCommand):
+    help = "Send queued outbox emails in batches over one SMTP connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--max-batches", type=int, default=None)
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new emails.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds between polls with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            sent = send_pending(batch_size=options["batch_size"], max_batches=options["max_batches"])
+            if sent or not options["loop"]:
+                self.stdout.write(f"Sent {sent} email(s)")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
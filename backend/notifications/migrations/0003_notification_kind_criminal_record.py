@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_outboxemail'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='kind',
+            field=models.CharField(choices=[('application_received', 'New application'), ('application_status', 'Application status changed'), ('review_received', 'New review'), ('subscription_active', 'Subscription activated'), ('profile_approved', 'Profile approved'), ('criminal_record_expiring', 'Criminal record expiring')], max_length=32),
+        ),
+    ]
@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class Notification(models.Model):
+    class Kind(models.TextChoices):
+        APPLICATION_RECEIVED = "application_received", "New application"
+        APPLICATION_STATUS = "application_status", "Application status changed"
+        REVIEW_RECEIVED = "review_received", "New review"
+        SUBSCRIPTION_ACTIVE = "subscription_active", "Subscription activated"
+        PROFILE_APPROVED = "profile_approved", "Profile approved"
+        CRIMINAL_RECORD_EXPIRING = "criminal_record_expiring", "Criminal record expiring"
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="notifications")
+    kind = models.CharField(max_length=32, choices=Kind.choices)
+    title = models.CharField(max_length=200)
+    body = models.TextField(blank=True)
+    data = models.JSONField(default=dict, blank=True)
+    read_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-created_at"]),
+        ]
+
+    def __str__(self):
+        return f"Notif<{self.user_id}:{self.kind}>"
+
+
+class OutboxEmail(models.Model):
+    """A templated email waiting for the send_outbox worker."""
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        SENDING = "SENDING", "Sending"
+        SENT = "SENT", "Sent"
+        FAILED = "FAILED", "Failed"
+
+    template = models.CharField(max_length=64)  # emails/<template>_subject.txt and emails/<template>.txt
+    to_email = models.EmailField()
+    context = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claim_token = models.CharField(max_length=32, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+            models.Index(fields=["claim_token"]),
+        ]
+
+    def __str__(self):
+        return f"Email<{self.template}:{self.to_email}:{self.status}>"
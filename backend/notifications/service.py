@@ -0,0 +1,107 @@
+"""
+Batched notification fan-out.
+
+notify() only buffers: once the surrounding transaction commits, the items join a
+process-wide queue that a worker drains after NOTIFICATION_COALESCE_SECONDS. Each drain
+stores everything with one bulk_create and sends one channel-layer event per user,
+however many notifications that user got in the window. With BACKGROUND_TASKS_EAGER
+the queue is skipped and items are delivered as soon as their transaction commits.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import transaction
+
+from backend.tasks import run_in_background
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+BULK_CREATE_BATCH_SIZE = 500
+
+_queue = []
+_queue_lock = threading.Lock()
+_drain_scheduled = False
+
+
+def user_group_name(user_id):
+    """Channel-layer group every notification socket of one user joins."""
+    return f"user_{user_id}"
+
+
+def notify(recipients, kind, title, body="", data=None):
+    """
+    Queue a notification for each recipient (users or user ids).
+
+    Safe to call inside a transaction: nothing is stored or sent unless it commits.
+    """
+    items = []
+    for recipient in recipients:
+        user_id = getattr(recipient, "pk", recipient)
+        if user_id is not None:
+            items.append(Notification(user_id=user_id, kind=kind, title=title[:200], body=body, data=data or {}))
+    if items:
+        transaction.on_commit(lambda: _enqueue(items))
+
+
+def _enqueue(items):
+    global _drain_scheduled
+    if getattr(settings, "BACKGROUND_TASKS_EAGER", False):
+        deliver(items)
+        return
+    with _queue_lock:
+        _queue.extend(items)
+        schedule = not _drain_scheduled
+        _drain_scheduled = True
+    if schedule:
+        run_in_background(_drain)
+
+
+def _drain():
+    global _drain_scheduled
+    # Let the window fill up before taking the batch
+    time.sleep(getattr(settings, "NOTIFICATION_COALESCE_SECONDS", 0.25))
+    with _queue_lock:
+        items = _queue[:]
+        _queue.clear()
+        _drain_scheduled = False
+    if items:
+        deliver(items)
+
+
+def serialize(notification):
+    return {
+        "id": notification.id,
+        "kind": notification.kind,
+        "title": notification.title,
+        "body": notification.body,
+        "data": notification.data,
+        "read_at": None,
+        "created_at": notification.created_at.isoformat() if notification.created_at else None,
+    }
+
+
+def deliver(items):
+    """Store items in bulk and push one event per user."""
+    created = Notification.objects.bulk_create(items, batch_size=BULK_CREATE_BATCH_SIZE)
+    by_user = defaultdict(list)
+    for notification in created:
+        by_user[notification.user_id].append(serialize(notification))
+
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    for user_id, notifications in by_user.items():
+        try:
+            async_to_sync(channel_layer.group_send)(
+                user_group_name(user_id),
+                {"type": "notification.batch", "notifications": notifications},
+            )
+        except Exception:
+            # Stored rows are still listed by the REST endpoint; only the live push is lost
+            logger.warning("Could not push notifications to user %s", user_id, exc_info=True)
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from payments.models import Subscription
+from technicians.models import Review
+from . import events
+
+
+@receiver(post_save, sender=Review)
+def review_created(sender, instance: Review, created, **kwargs):
+    if created:
+        events.review_received(instance)
+
+
+@receiver(post_save, sender=Subscription)
+def subscription_saved(sender, instance: Subscription, created, update_fields=None, **kwargs):
+    activated = created or (update_fields is not None and "status" in update_fields)
+    if activated and instance.status == Subscription.Status.ACTIVE:
+        events.subscription_activated(instance)
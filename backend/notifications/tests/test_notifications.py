@@ -0,0 +1,112 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+
+from jobs.models import Job
+from notifications import service
+from notifications.consumers import NotificationConsumer
+from notifications.models import Notification
+
+User = get_user_model()
+
+CHANNEL_LAYERS_TEST = {
+    "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+}
+
+
+@override_settings(CHANNEL_LAYERS=CHANNEL_LAYERS_TEST, BACKGROUND_TASKS_EAGER=True)
+class NotificationTests(APITestCase):
+    def setUp(self):
+        self.emp = User.objects.create_user(username="emp", email="emp@example.com", password="pass", role="employer")
+        self.tech = User.objects.create_user(username="tech", email="tech@example.com", password="pass", role="technician")
+        self.job = Job.objects.create(employer=self.emp, title="Fix door", description="d", category="Carpentry")
+
+    def test_apply_and_status_change_notify_the_other_side(self):
+        tech_client = APIClient(); tech_client.force_authenticate(self.tech)
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = tech_client.post(reverse("technician-job-apply", kwargs={"job_id": self.job.id}), {}, format="json")
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(Notification.objects.get(user=self.emp).kind, Notification.Kind.APPLICATION_RECEIVED)
+
+        emp_client = APIClient(); emp_client.force_authenticate(self.emp)
+        url = reverse("employer-set-status", kwargs={"application_id": resp.data["id"], "new_status": "SHORTLISTED"})
+        with self.captureOnCommitCallbacks(execute=True):
+            emp_client.post(url)
+        notification = Notification.objects.get(user=self.tech)
+        self.assertEqual(notification.data["status"], "SHORTLISTED")
+        self.assertIn("shortlisted", notification.title)
+
+    def test_nothing_is_sent_when_the_transaction_rolls_back(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            service.notify([self.tech], Notification.Kind.PROFILE_APPROVED, "Approved")
+        self.assertEqual(len(callbacks), 1)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_deliver_is_one_insert_and_one_push_per_user(self):
+        others = [
+            User.objects.create_user(username=f"t{i}", email=f"t{i}@example.com", password="pass", role="technician")
+            for i in range(3)
+        ]
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(service.user_group_name(self.tech.id), channel)
+
+        items = [Notification(user_id=self.tech.id, kind="application_status", title=f"n{i}") for i in range(100)]
+        items += [Notification(user_id=u.id, kind="application_status", title="x") for u in others]
+        with mock.patch.object(layer, "group_send", wraps=layer.group_send) as group_send, self.assertNumQueries(1):
+            service.deliver(items)
+        self.assertEqual(group_send.call_count, 4)
+        event = async_to_sync(layer.receive)(channel)
+        self.assertEqual(len(event["notifications"]), 100)
+
+    def test_queued_items_are_coalesced_into_one_drain(self):
+        with override_settings(BACKGROUND_TASKS_EAGER=False), \
+                mock.patch.object(service, "run_in_background") as schedule, \
+                mock.patch.object(service, "deliver") as deliver, \
+                mock.patch.object(service.time, "sleep"):
+            for i in range(5):
+                service._enqueue([Notification(user_id=self.tech.id, kind="application_status", title=str(i))])
+            self.assertEqual(schedule.call_count, 1)
+            service._drain()
+        self.assertEqual(deliver.call_count, 1)
+        self.assertEqual(len(deliver.call_args.args[0]), 5)
+
+    def test_list_and_mark_read(self):
+        Notification.objects.bulk_create([
+            Notification(user=self.tech, kind="application_status", title=f"n{i}") for i in range(25)
+        ])
+        Notification.objects.create(user=self.emp, kind="application_received", title="not mine")
+        client = APIClient(); client.force_authenticate(self.tech)
+
+        first = client.get(reverse("notification-list"))
+        self.assertEqual(len(first.data["results"]), 20)
+        second = client.get(first.data["next"])
+        self.assertEqual(len(second.data["results"]), 5)
+
+        ids = [n["id"] for n in first.data["results"][:3]]
+        self.assertEqual(client.post(reverse("notification-mark-read"), {"ids": ids}, format="json").data["updated"], 3)
+        unread = client.get(reverse("notification-list"), {"unread": "true", "page_size": 100})
+        self.assertEqual(len(unread.data["results"]), 22)
+        self.assertEqual(client.post(reverse("notification-mark-read"), {}, format="json").data["updated"], 22)
+
+    def test_consumer_receives_batches_for_its_user(self):
+        async def scenario():
+            communicator = WebsocketCommunicator(NotificationConsumer.as_asgi(), "/ws/notifications/")
+            communicator.scope["user"] = self.tech
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+            await get_channel_layer().group_send(
+                service.user_group_name(self.tech.id),
+                {"type": "notification.batch", "notifications": [{"title": "hi"}]},
+            )
+            message = await communicator.receive_json_from()
+            await communicator.disconnect()
+            return message
+
+        self.assertEqual(async_to_sync(scenario)(), {"type": "notifications", "notifications": [{"title": "hi"}]})
@@ -0,0 +1,136 @@
+import socketserver
+import threading
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail import get_connection
+from django.core.management import call_command
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from notifications import mail as outbox
+from notifications.models import OutboxEmail
+
+User = get_user_model()
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: counts sessions and messages."""
+
+    def handle(self):
+        self.server.sessions += 1
+        self.wfile.write(b"220 localhost ready\r\n")
+        in_data = False
+        for raw in self.rfile:
+            line = raw.rstrip(b"\r\n")
+            if in_data:
+                if line == b".":
+                    in_data = False
+                    self.server.messages += 1
+                    self.wfile.write(b"250 OK\r\n")
+                continue
+            command = line[:4].upper()
+            if command == b"EHLO":
+                self.wfile.write(b"250 localhost\r\n")
+            elif command == b"DATA":
+                in_data = True
+                self.wfile.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+            elif command == b"QUIT":
+                self.wfile.write(b"221 Bye\r\n")
+                return
+            else:
+                self.wfile.write(b"250 OK\r\n")
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    sessions = 0
+    messages = 0
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    BACKGROUND_TASKS_EAGER=True,
+    EMAIL_OUTBOX_AUTOSEND=False,
+    EMAIL_OUTBOX_MAX_ATTEMPTS=3,
+)
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="tech", email="tech@example.com", password="pass", role="technician")
+
+    @override_settings(EMAIL_OUTBOX_AUTOSEND=True, FRONTEND_RESET_URL="https://app.example.com/reset")
+    def test_password_reset_is_queued_and_sent_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = APIClient().post(reverse("password-reset"), {"email": "tech@example.com"}, format="json")
+        self.assertEqual(resp.status_code, 200)
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxEmail.Status.SENT)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["tech@example.com"])
+        self.assertIn("https://app.example.com/reset?uid=", mail.outbox[0].body)
+
+    def test_batch_renders_templates_once_and_sends_everything(self):
+        outbox.enqueue_emails([
+            ("profile_approved", f"t{i}@example.com", {"username": f"t{i}"}) for i in range(30)
+        ] + [("profile_approved", "", {})])
+        self.assertEqual(OutboxEmail.objects.count(), 30)
+        self.assertEqual(outbox.send_pending(batch_size=10), 30)
+        self.assertEqual(len(mail.outbox), 30)
+        self.assertIn("t0", mail.outbox[0].body)
+        self.assertFalse(OutboxEmail.objects.exclude(status=OutboxEmail.Status.SENT).exists())
+
+    def test_failures_back_off_then_give_up(self):
+        outbox.enqueue_email("no_such_template", "tech@example.com")
+        for attempt in range(1, 4):
+            self.assertEqual(outbox.send_pending(), 0)
+            email = OutboxEmail.objects.get()
+            self.assertEqual(email.attempts, attempt)
+            if attempt < 3:
+                self.assertEqual(email.status, OutboxEmail.Status.PENDING)
+                self.assertGreater(email.next_attempt_at, timezone.now() + timedelta(seconds=30))
+                # Nothing is due until the backoff elapses
+                self.assertEqual(outbox.claim_batch(), [])
+                OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(email.status, OutboxEmail.Status.FAILED)
+        self.assertIn("TemplateDoesNotExist", email.last_error)
+
+    def test_rows_are_claimed_by_one_worker_only(self):
+        outbox.enqueue_emails([("profile_approved", f"t{i}@example.com", {}) for i in range(5)])
+        first = outbox.claim_batch(batch_size=3)
+        second = outbox.claim_batch(batch_size=10)
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(second), 2)
+        self.assertFalse({e.pk for e in first} & {e.pk for e in second})
+        self.assertEqual(outbox.claim_batch(), [])
+
+        # A claim abandoned by a crashed worker becomes claimable again
+        OutboxEmail.objects.filter(pk=first[0].pk).update(claimed_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual([e.pk for e in outbox.claim_batch()], [first[0].pk])
+
+    def test_one_smtp_session_for_many_messages(self):
+        server = _SMTPServer(("127.0.0.1", 0), _SMTPHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        outbox.enqueue_emails([("profile_approved", f"t{i}@example.com", {"username": "x"}) for i in range(25)])
+        connection = get_connection(
+            "django.core.mail.backends.smtp.EmailBackend",
+            host="127.0.0.1", port=server.server_address[1], use_tls=False, use_ssl=False, timeout=5,
+        )
+        self.assertEqual(outbox.send_pending(batch_size=10, connection=connection), 25)
+        self.assertEqual(server.messages, 25)
+        self.assertEqual(server.sessions, 1)
+
+    def test_send_outbox_command(self):
+        outbox.enqueue_emails([("profile_approved", "a@example.com", {}), ("profile_approved", "b@example.com", {})])
+        out = StringIO()
+        call_command("send_outbox", "--batch-size", "1", "--max-batches", "1", stdout=out)
+        self.assertIn("Sent 1 email(s)", out.getvalue())
+        call_command("send_outbox", stdout=out)
+        self.assertIn("Sent 1 email(s)", out.getvalue().splitlines()[-1])
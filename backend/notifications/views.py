@@ -0,0 +1,40 @@
+from django.utils import timezone
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import generics, permissions
+from rest_framework.response import Response
+
+from .models import Notification
+from .pagination import NotificationCursorPagination
+from .serializers import MarkReadSerializer, NotificationSerializer
+
+
+class NotificationListView(generics.ListAPIView):
+    """GET /api/notifications/?unread=true — newest first, cursor paginated."""
+    serializer_class = NotificationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NotificationCursorPagination
+
+    def get_queryset(self):
+        if getattr(self, "swagger_fake_view", False) or not self.request.user.is_authenticated:
+            return Notification.objects.none()
+        qs = Notification.objects.filter(user=self.request.user)
+        if self.request.query_params.get("unread", "").lower() in ("1", "true", "yes"):
+            qs = qs.filter(read_at__isnull=True)
+        return qs
+
+
+class NotificationMarkReadView(generics.GenericAPIView):
+    """POST /api/notifications/read/ with {"ids": [...]}, or no ids to mark everything read."""
+    serializer_class = MarkReadSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(tags=["Notifications"])
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        qs = Notification.objects.filter(user=request.user, read_at__isnull=True)
+        ids = serializer.validated_data.get("ids")
+        if ids is not None:
+            qs = qs.filter(pk__in=ids)
+        updated = qs.update(read_at=timezone.now())
+        return Response({"updated": updated})
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_hot_query_indexes'),
+        ('payments', '0003_subscriptionplan_stripe_price_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='subscription',
+            name='payments_su_user_id_058311_idx',
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['user', 'status', 'end_date'], name='payments_sub_user_active'),
+        ),
+        migrations.AddConstraint(
+            model_name='payment',
+            constraint=models.UniqueConstraint(condition=models.Q(('tx_ref', ''), _negated=True), fields=('tx_ref',), name='payments_payment_tx_ref_unique'),
+        ),
+    ]
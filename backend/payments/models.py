@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 from django.utils import timezone
 from jobs.models import Job, JobApplication
@@ -40,7 +41,7 @@ class Subscription(models.Model):
 
     class Meta:
         indexes = [
-            models.Index(fields=["user", "status"]),
+            models.Index(fields=["user", "status", "end_date"], name="payments_sub_user_active"),
             models.Index(fields=["end_date"]),
         ]
 
@@ -79,6 +80,10 @@ class Payment(models.Model):
     completed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
+        constraints = [
+            # Webhooks look payments up by tx_ref; blank ones predate the provider round trip
+            models.UniqueConstraint(fields=["tx_ref"], condition=~Q(tx_ref=""), name="payments_payment_tx_ref_unique"),
+        ]
         indexes = [
             models.Index(fields=["status", "created_at"]),
             models.Index(fields=["payer"]),
@@ -5,6 +5,7 @@ from rest_framework import status
 from django.contrib.auth import get_user_model
 from payments.models import SubscriptionPlan, Payment, Subscription
 from unittest.mock import patch
+from django.db import IntegrityError, transaction
 import os
 
 
@@ -87,3 +88,10 @@ class PaymentsTests(APITestCase):
             resp = self.client.get(url)
             self.assertEqual(resp.status_code, 200)
             self.assertEqual(resp.data.get("stripe_publishable_key"), "pk_test_abc")
+
+    def test_tx_ref_is_unique_unless_blank(self):
+        Payment.objects.create(payer=self.tech, amount=1, tx_ref="")
+        Payment.objects.create(payer=self.tech, amount=1, tx_ref="")
+        Payment.objects.create(payer=self.tech, amount=1, tx_ref="cs_test_dup")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Payment.objects.create(payer=self.tech, amount=1, tx_ref="cs_test_dup")
@@ -11,6 +11,7 @@ from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 
 from accounts.models import User
+from backend.replicas import ReplicaReadMixin
 from .models import Payment, Subscription, SubscriptionPlan
 from .serializers import SubscribeInitSerializer, PaymentInitResponseSerializer, SubscriptionSerializer
 from rest_framework.permissions import AllowAny
@@ -203,7 +204,7 @@ class MySubscriptionsView(views.APIView):
         return Response(SubscriptionSerializer(subs, many=True).data)
 
 
-class PlansListView(views.APIView):
+class PlansListView(ReplicaReadMixin, views.APIView):
     permission_classes = [AllowAny]
 
     @swagger_auto_schema(tags=["Payments"])
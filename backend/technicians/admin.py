@@ -1,9 +1,30 @@
 from django.contrib import admin
-from .models import TechnicianProfile
+from .models import TechnicianProfile, TechnicianDocument, Skill, SkillAlias
+
+
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 1
+
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ("name",)
+    search_fields = ("name", "aliases__name")
+    inlines = [SkillAliasInline]
+
+
+class TechnicianDocumentInline(admin.TabularInline):
+    model = TechnicianDocument
+    extra = 0
+    can_delete = False
+    fields = ("kind", "file_name", "status", "error", "content_type", "size", "sha256", "thumbnail", "processed_at")
+    readonly_fields = fields
 
 
 @admin.register(TechnicianProfile)
 class TechnicianProfileAdmin(admin.ModelAdmin):
+    inlines = [TechnicianDocumentInline]
     list_display = (
         "user",
         "location",
@@ -12,11 +33,12 @@ class TechnicianProfileAdmin(admin.ModelAdmin):
         "is_paused",
         "criminal_record_status",
         "criminal_record_expires_at",
+        "documents_verified",
         "trial_ends_at",
         "rating_avg",
         "rating_count",
     )
-    list_filter = ("is_approved", "is_paused", "years_experience", "location", "criminal_record_expires_at")
+    list_filter = ("is_approved", "is_paused", "criminal_record_hidden", "documents_verified", "years_experience", "location", "criminal_record_expires_at")
     search_fields = ("user__username", "user__email", "location", "skills__name")
     actions = [
         "approve_selected_profiles",
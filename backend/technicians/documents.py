@@ -0,0 +1,177 @@
+"""
+Background verification of technician credential uploads.
+
+The request only stores the files and records a PENDING TechnicianDocument per upload;
+size limits, content sniffing, checksums and thumbnails run on the local worker pool.
+"""
+import hashlib
+import io
+import logging
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from backend.tasks import run_in_background
+from .models import TechnicianDocument, TechnicianProfile
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_FIELDS = ("certificates", "criminal_record", "national_id_document")
+REQUIRED_DOCUMENT_FIELDS = ("criminal_record", "national_id_document")
+
+READ_CHUNK_SIZE = 64 * 1024
+THUMBNAIL_SIZE = (320, 320)
+
+_SIGNATURES = (
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+)
+
+
+def sniff_content_type(head: bytes) -> str:
+    for signature, content_type in _SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return ""
+
+
+def queue_document_processing(profile: TechnicianProfile, fields):
+    """Record the newly stored files as pending and verify them off-request."""
+    documents = TechnicianDocument.objects.bulk_create([
+        TechnicianDocument(profile=profile, kind=field, file_name=getattr(profile, field).name)
+        for field in fields
+        if getattr(profile, field)
+    ])
+    TechnicianProfile.objects.filter(pk=profile.pk).update(documents_verified=False, documents_verified_at=None)
+    profile.documents_verified = False
+    profile.documents_verified_at = None
+    run_in_background(process_documents, [doc.pk for doc in documents], profile.pk)
+
+
+def process_documents(document_ids, profile_id):
+    pending = (
+        TechnicianDocument.objects
+        .filter(pk__in=document_ids, status=TechnicianDocument.Status.PENDING)
+        .select_related("profile")
+    )
+    for doc in pending:
+        try:
+            _process_document(doc)
+        except Exception as exc:
+            logger.exception("Document %s could not be processed", doc.pk)
+            _reject(doc, f"Processing failed: {exc.__class__.__name__}")
+    refresh_documents_verified(profile_id)
+
+
+def _finish(doc, status, error=""):
+    doc.status = status
+    doc.error = error[:255]
+    doc.processed_at = timezone.now()
+    doc.save()
+
+
+def _reject(doc, error):
+    """Rejected uploads aren't kept: delete the file and clear the profile field if it still points there."""
+    _finish(doc, TechnicianDocument.Status.REJECTED, error)
+    cleared = {doc.kind: ""}
+    if doc.kind == TechnicianDocument.Kind.CRIMINAL_RECORD:
+        # save() restarted the expiry and unhid the profile on upload; a rejected file earns neither
+        cleared.update(criminal_record_uploaded_at=None, criminal_record_expires_at=None, criminal_record_hidden=True)
+    TechnicianProfile.objects.filter(pk=doc.profile_id, **{doc.kind: doc.file_name}).update(**cleared)
+    try:
+        getattr(doc.profile, doc.kind).storage.delete(doc.file_name)
+    except OSError:
+        logger.exception("Rejected document %s could not be deleted", doc.pk)
+
+
+def _process_document(doc: TechnicianDocument):
+    field_file = getattr(doc.profile, doc.kind)
+    if field_file.name != doc.file_name:
+        _finish(doc, TechnicianDocument.Status.REJECTED, "Superseded by a newer upload.")
+        return
+
+    max_size = getattr(settings, "DOCUMENT_MAX_UPLOAD_SIZE", 10 * 1024 * 1024)
+    digest = hashlib.sha256()
+    head = b""
+    size = 0
+    with field_file.storage.open(doc.file_name, "rb") as fh:
+        for chunk in iter(lambda: fh.read(READ_CHUNK_SIZE), b""):
+            if not head:
+                head = chunk[:16]
+            digest.update(chunk)
+            size += len(chunk)
+            if size > max_size:
+                break
+    doc.size = size
+    if size > max_size:
+        _reject(doc, f"File exceeds {max_size} bytes.")
+        return
+    doc.sha256 = digest.hexdigest()
+
+    # Identical content was already verified: reuse its outcome and thumbnail
+    known = (
+        TechnicianDocument.objects
+        .filter(sha256=doc.sha256, status=TechnicianDocument.Status.VERIFIED)
+        .exclude(pk=doc.pk)
+        .only("content_type", "thumbnail")
+        .first()
+    )
+    if known:
+        doc.content_type = known.content_type
+        doc.thumbnail = known.thumbnail.name or None
+        _finish(doc, TechnicianDocument.Status.VERIFIED)
+        return
+
+    doc.content_type = sniff_content_type(head)
+    if not doc.content_type:
+        _reject(doc, "Unsupported file type; upload a PDF or an image.")
+        return
+
+    if doc.content_type.startswith("image/"):
+        thumbnail = _render_thumbnail(field_file.storage, doc.file_name)
+        if thumbnail is None:
+            _reject(doc, "Image could not be decoded.")
+            return
+        doc.thumbnail.save(f"{doc.sha256}.jpg", ContentFile(thumbnail), save=False)
+    _finish(doc, TechnicianDocument.Status.VERIFIED)
+
+
+def _render_thumbnail(storage, name):
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        with storage.open(name, "rb") as fh:
+            image = Image.open(fh)
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail(THUMBNAIL_SIZE)
+            buf = io.BytesIO()
+            image.convert("RGB").save(buf, "JPEG", quality=80)
+    except (UnidentifiedImageError, OSError, ValueError):
+        return None
+    return buf.getvalue()
+
+
+def refresh_documents_verified(profile_id):
+    """Mark the profile verified once every current upload passed and the required ones exist."""
+    profile = TechnicianProfile.objects.only(*DOCUMENT_FIELDS).filter(pk=profile_id).first()
+    if profile is None:
+        return False
+    current = {field: getattr(profile, field).name for field in DOCUMENT_FIELDS if getattr(profile, field)}
+    statuses = dict(
+        TechnicianDocument.objects
+        .filter(profile_id=profile_id, file_name__in=current.values())
+        .values_list("file_name", "status")
+    )
+    verified = (
+        all(field in current for field in REQUIRED_DOCUMENT_FIELDS)
+        and all(statuses.get(name) == TechnicianDocument.Status.VERIFIED for name in current.values())
+    )
+    TechnicianProfile.objects.filter(pk=profile_id).update(
+        documents_verified=verified,
+        documents_verified_at=timezone.now() if verified else None,
+    )
+    return verified
@@ -0,0 +1,55 @@
+"""
+Criminal-record expiry: reminders before a certificate lapses, and hiding lapsed profiles.
+
+Both passes select rows by range on the indexed criminal_record_expires_at column and
+write with set-based updates, so listings only have to test the criminal_record_hidden
+flag instead of evaluating every profile's expiry per request.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from notifications import events as notification_events
+from .models import TechnicianProfile
+from .signals import technician_profiles_changed
+
+REMINDER_DAYS = 14
+BATCH_SIZE = 500
+
+
+def remind_expiring(days=REMINDER_DAYS, batch_size=BATCH_SIZE, now=None):
+    """Notify technicians whose record expires within days (or already has) once per upload."""
+    now = now or timezone.now()
+    due = (
+        TechnicianProfile.objects
+        .filter(criminal_record_expires_at__lte=now + timedelta(days=days), criminal_record_reminded_at__isnull=True)
+        .order_by("criminal_record_expires_at", "pk")
+    )
+    reminded = 0
+    while True:
+        # Each batch commits on its own, so an interrupted run resumes where it stopped
+        with transaction.atomic():
+            rows = list(
+                due.values_list("pk", "user_id", "user__username", "user__email", "criminal_record_expires_at")
+                [:batch_size]
+            )
+            if not rows:
+                return reminded
+            TechnicianProfile.objects.filter(pk__in=[row[0] for row in rows]).update(criminal_record_reminded_at=now)
+            notification_events.criminal_records_expiring([row[1:] for row in rows], now=now)
+        reminded += len(rows)
+
+
+def hide_expired(now=None):
+    """Take technicians with a lapsed record out of public listings; returns the profile ids hidden."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        expired = TechnicianProfile.objects.filter(criminal_record_expires_at__lte=now, criminal_record_hidden=False)
+        profile_ids = list(expired.values_list("pk", flat=True))
+        if profile_ids:
+            TechnicianProfile.objects.filter(pk__in=profile_ids).update(criminal_record_hidden=True)
+            technician_profiles_changed.send(
+                sender=TechnicianProfile, profile_ids=profile_ids, fields=["criminal_record_hidden"]
+            )
+    return profile_ids
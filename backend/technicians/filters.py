@@ -1,9 +1,10 @@
 import django_filters
 from .models import TechnicianProfile
+from .skills import get_skill_index
 
 class TechnicianFilter(django_filters.FilterSet):
     location = django_filters.CharFilter(field_name="location", lookup_expr="icontains")
-    skill = django_filters.CharFilter(method="filter_skill")  # by name (icontains)
+    skill = django_filters.CharFilter(method="filter_skill")  # word prefix of a skill name or alias
     skill_id = django_filters.NumberFilter(field_name="skills__id")
 
     class Meta:
@@ -11,4 +12,7 @@ class TechnicianFilter(django_filters.FilterSet):
         fields = ["location", "skill", "skill_id", "is_approved"]
 
     def filter_skill(self, queryset, name, value):
-        return queryset.filter(skills__name__icontains=value)
+        skill_ids = get_skill_index().match_ids(value)
+        if not skill_ids:
+            return queryset.none()
+        return queryset.filter(skills__id__in=skill_ids)
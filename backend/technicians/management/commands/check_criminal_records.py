@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from technicians.expiry import BATCH_SIZE, hide_expired, remind_expiring
+
+
+class Command(BaseCommand):
+    help = "Remind technicians whose criminal record is about to expire and optionally hide expired ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=getattr(settings, "CRIMINAL_RECORD_REMINDER_DAYS", 14),
+            help="Remind technicians whose record expires within this many days.",
+        )
+        parser.add_argument("--hide-expired", action="store_true", help="Remove expired technicians from listings.")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        reminded = remind_expiring(days=options["days"], batch_size=options["batch_size"])
+        self.stdout.write(f"Reminded {reminded} technician(s)")
+        if options["hide_expired"]:
+            self.stdout.write(f"Hid {len(hide_expired())} expired technician(s)")
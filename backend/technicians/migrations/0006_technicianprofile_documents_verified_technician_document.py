@@ -0,0 +1,44 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('technicians', '0005_technicianprofile_criminal_record_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='technicianprofile',
+            name='documents_verified',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='technicianprofile',
+            name='documents_verified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='TechnicianDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('certificates', 'Certificates'), ('criminal_record', 'Criminal record'), ('national_id_document', 'National ID document')], max_length=32)),
+                ('file_name', models.CharField(max_length=255)),
+                ('sha256', models.CharField(blank=True, db_index=True, max_length=64)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('content_type', models.CharField(blank=True, max_length=64)),
+                ('thumbnail', models.ImageField(blank=True, null=True, upload_to='document_thumbs/')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('VERIFIED', 'Verified'), ('REJECTED', 'Rejected')], default='PENDING', max_length=12)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='documents', to='technicians.technicianprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['profile', 'kind'], name='technicians_profile_77b8c9_idx')],
+            },
+        ),
+    ]
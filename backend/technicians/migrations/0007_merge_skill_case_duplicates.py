@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:43
+
+from django.db import migrations
+
+
+def merge_case_duplicates(apps, schema_editor):
+    Skill = apps.get_model("technicians", "Skill")
+    TechnicianProfile = apps.get_model("technicians", "TechnicianProfile")
+    Through = TechnicianProfile.skills.through
+
+    groups = {}
+    for skill in Skill.objects.order_by("id"):
+        key = " ".join(skill.name.split()).lower()
+        groups.setdefault(key, []).append(skill)
+
+    for skills in groups.values():
+        keep, duplicates = skills[0], skills[1:]
+        for duplicate in duplicates:
+            for profile_id in Through.objects.filter(skill_id=duplicate.id).values_list("technicianprofile_id", flat=True):
+                Through.objects.get_or_create(technicianprofile_id=profile_id, skill_id=keep.id)
+            duplicate.delete()
+        normalized = " ".join(keep.name.split())
+        if normalized != keep.name:
+            keep.name = normalized
+            keep.save(update_fields=["name"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('technicians', '0006_technicianprofile_documents_verified_technician_document'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_case_duplicates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Separate from 0007: PostgreSQL won't alter a table with the data migration's triggers pending
+
+    dependencies = [
+        ('technicians', '0007_merge_skill_case_duplicates'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='skill',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), name='technicians_skill_name_ci_unique'),
+        ),
+    ]
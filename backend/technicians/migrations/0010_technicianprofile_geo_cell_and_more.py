@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('technicians', '0009_skillalias'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='technicianprofile',
+            name='geo_cell',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=24),
+        ),
+        migrations.AddField(
+            model_name='technicianprofile',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='technicianprofile',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('technicians', '0010_technicianprofile_geo_cell_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='technicianprofile',
+            name='criminal_record_hidden',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='technicianprofile',
+            name='criminal_record_reminded_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='technicianprofile',
+            name='criminal_record_expires_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
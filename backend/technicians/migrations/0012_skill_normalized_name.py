@@ -0,0 +1,57 @@
+from django.db import migrations, models
+
+
+def skill_key(name):
+    return " ".join(name.split()).casefold()
+
+
+def fill_normalized_names(apps, schema_editor):
+    Skill = apps.get_model("technicians", "Skill")
+    SkillAlias = apps.get_model("technicians", "SkillAlias")
+    TechnicianProfile = apps.get_model("technicians", "TechnicianProfile")
+    Through = TechnicianProfile.skills.through
+
+    # Lower() let non-ASCII case variants through (e.g. "Électricien" / "électricien"): merge them
+    kept = {}
+    for skill in Skill.objects.order_by("id"):
+        key = skill_key(skill.name)
+        keep = kept.setdefault(key, skill)
+        if keep.pk != skill.pk:
+            for profile_id in Through.objects.filter(skill_id=skill.pk).values_list("technicianprofile_id", flat=True):
+                Through.objects.get_or_create(technicianprofile_id=profile_id, skill_id=keep.pk)
+            SkillAlias.objects.filter(skill_id=skill.pk).update(skill_id=keep.pk)
+            skill.delete()
+            continue
+        skill.normalized_name = key
+        skill.save(update_fields=["normalized_name"])
+
+    seen = set()
+    for alias in SkillAlias.objects.order_by("id"):
+        key = skill_key(alias.name)
+        if key in seen:
+            alias.delete()
+            continue
+        seen.add(key)
+        alias.normalized_name = key
+        alias.save(update_fields=["normalized_name"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('technicians', '0011_criminal_record_expiry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='normalized_name',
+            field=models.CharField(max_length=192, null=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='skillalias',
+            name='normalized_name',
+            field=models.CharField(max_length=192, null=True, editable=False),
+        ),
+        migrations.RunPython(fill_normalized_names, migrations.RunPython.noop),
+    ]
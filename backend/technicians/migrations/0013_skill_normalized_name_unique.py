@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Separate from 0011: PostgreSQL won't alter a table with the data migration's triggers pending
+
+    dependencies = [
+        ('technicians', '0012_skill_normalized_name'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='skill',
+            name='technicians_skill_name_ci_unique',
+        ),
+        migrations.RemoveConstraint(
+            model_name='skillalias',
+            name='technicians_skillalias_name_ci_unique',
+        ),
+        migrations.AlterField(
+            model_name='skill',
+            name='normalized_name',
+            field=models.CharField(max_length=192, unique=True, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='skillalias',
+            name='normalized_name',
+            field=models.CharField(max_length=192, unique=True, editable=False),
+        ),
+    ]
@@ -1,3 +1,4 @@
+import re
 from datetime import timedelta
 
 from django.conf import settings
@@ -5,12 +6,53 @@ from django.db import models
 from django.db.models import Avg, Count
 from django.utils import timezone
 
+from geo.models import GeoLocatedModel
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_skill_name(name):
+    """Trim and collapse whitespace; case is kept for display and ignored for uniqueness."""
+    return _WHITESPACE.sub(" ", (name or "").strip())[:64]
+
+
+def skill_key(name):
+    """The case-insensitive identity of a name, computed in Python only (SQL LOWER() is ASCII-only on SQLite)."""
+    return normalize_skill_name(name).casefold()
+
 
 class Skill(models.Model):
     name = models.CharField(max_length=64, unique=True)
+    # skill_key(name); casefolding can lengthen a name
+    normalized_name = models.CharField(max_length=192, unique=True, editable=False)
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        self.name = normalize_skill_name(self.name)
+        self.normalized_name = skill_key(self.name)
+        super().save(*args, **kwargs)
+
+
+class SkillAlias(models.Model):
+    """Alternative spelling or synonym that resolves to a canonical Skill (e.g. "Fundi w'amazi" -> Plumber)."""
+
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name="aliases")
+    name = models.CharField(max_length=64)
+    normalized_name = models.CharField(max_length=192, unique=True, editable=False)
+
+    def __str__(self):
+        return f"{self.name} -> {self.skill_id}"
+
+    def save(self, *args, **kwargs):
+        self.name = normalize_skill_name(self.name)
+        self.normalized_name = skill_key(self.name)
+        super().save(*args, **kwargs)
 
 
-class TechnicianProfile(models.Model):
+class TechnicianProfile(GeoLocatedModel):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="technician_profile")
     bio = models.TextField(blank=True)
     years_experience = models.PositiveIntegerField(default=0)
@@ -18,7 +60,9 @@ class TechnicianProfile(models.Model):
     certificates = models.FileField(upload_to="certs/", blank=True, null=True)
     criminal_record = models.FileField(upload_to="criminal_records/", blank=True, null=True)
     criminal_record_uploaded_at = models.DateTimeField(null=True, blank=True)
-    criminal_record_expires_at = models.DateTimeField(null=True, blank=True)
+    criminal_record_expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    criminal_record_reminded_at = models.DateTimeField(null=True, blank=True)
+    criminal_record_hidden = models.BooleanField(default=False)  # set by check_criminal_records once expired
     national_id_document = models.FileField(upload_to="identity_docs/", blank=True, null=True)
     location = models.CharField(max_length=120, blank=True)
     is_approved = models.BooleanField(default=False)  # set by Admin
@@ -27,26 +71,47 @@ class TechnicianProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     rating_avg = models.DecimalField(max_digits=3, decimal_places=2, default=0)  # 4.75
     rating_count = models.PositiveIntegerField(default=0)
+    documents_verified = models.BooleanField(default=False)  # set by the document pipeline
+    documents_verified_at = models.DateTimeField(null=True, blank=True)
 
     def __str__(self):
         return f"{self.user.username} (Technician)"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored criminal record so save() doesn't need to re-read it
+        if "criminal_record" in instance.__dict__:
+            instance._stored_criminal_record = instance.__dict__["criminal_record"] or ""
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        if "criminal_record" in self.__dict__:
+            self._stored_criminal_record = self.criminal_record.name or ""
+
     def save(self, *args, **kwargs):
         new_file_pending = bool(getattr(self.criminal_record, "_file", None))
         previous_file_exists = False
         if self.pk and not new_file_pending:
-            previous = self.__class__.objects.filter(pk=self.pk).only("criminal_record").first()
-            previous_file_exists = bool(previous and previous.criminal_record)
+            stored = getattr(self, "_stored_criminal_record", None)
+            if stored is None:
+                previous = self.__class__.objects.filter(pk=self.pk).only("criminal_record").first()
+                stored = previous.criminal_record.name if previous and previous.criminal_record else ""
+            previous_file_exists = bool(stored)
         if self.criminal_record:
             if new_file_pending or not previous_file_exists or not self.criminal_record_uploaded_at:
                 now = timezone.now()
                 self.criminal_record_uploaded_at = now
                 self.criminal_record_expires_at = now + timedelta(days=180)
+                self.criminal_record_reminded_at = None
+                self.criminal_record_hidden = False
         else:
             if self.criminal_record_uploaded_at or self.criminal_record_expires_at:
                 self.criminal_record_uploaded_at = None
                 self.criminal_record_expires_at = None
         super().save(*args, **kwargs)
+        self._stored_criminal_record = self.criminal_record.name or ""
 
     @property
     def criminal_record_is_expired(self):
@@ -55,6 +120,40 @@ class TechnicianProfile(models.Model):
         return timezone.now() >= self.criminal_record_expires_at
 
 
+class TechnicianDocument(models.Model):
+    """Outcome of background verification for one uploaded credential file."""
+
+    class Kind(models.TextChoices):
+        CERTIFICATES = "certificates", "Certificates"
+        CRIMINAL_RECORD = "criminal_record", "Criminal record"
+        NATIONAL_ID = "national_id_document", "National ID document"
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        VERIFIED = "VERIFIED", "Verified"
+        REJECTED = "REJECTED", "Rejected"
+
+    profile = models.ForeignKey(TechnicianProfile, on_delete=models.CASCADE, related_name="documents")
+    kind = models.CharField(max_length=32, choices=Kind.choices)
+    file_name = models.CharField(max_length=255)
+    sha256 = models.CharField(max_length=64, blank=True, db_index=True)
+    size = models.PositiveBigIntegerField(default=0)
+    content_type = models.CharField(max_length=64, blank=True)
+    thumbnail = models.ImageField(upload_to="document_thumbs/", blank=True, null=True)
+    status = models.CharField(max_length=12, choices=Status.choices, default=Status.PENDING)
+    error = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["profile", "kind"]),
+        ]
+
+    def __str__(self):
+        return f"Doc<{self.profile_id}:{self.kind}:{self.status}>"
+
+
 class Review(models.Model):
     technician = models.ForeignKey(TechnicianProfile, on_delete=models.CASCADE, related_name="reviews")
     reviewer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="reviews_left")
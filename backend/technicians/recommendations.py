@@ -0,0 +1,305 @@
+"""
+Job -> technician recommendations from an in-memory feature index.
+
+Every approved, unpaused technician is kept as a small feature record: skill ids, an
+L2-normalised term-frequency vector of the bio, coordinates, rating, experience, past
+hires and the date their trial/subscription visibility runs out. Skill ids and bio terms
+have inverted postings, so ranking a job only touches technicians sharing at least one
+skill or term with it and never queries per candidate.
+
+Profiles are marked dirty by signals and re-read in one batch on the next lookup; the
+whole index is rebuilt every RECOMMENDATION_INDEX_TTL seconds to catch anything missed
+(e.g. trials ending). Those updates patch the shared index in place, so ranking holds
+the same lock (see rank_technicians).
+"""
+import heapq
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from geo.grid import distance_km
+from jobs.models import JobApplication
+from payments.models import Subscription
+from .models import Skill, SkillAlias, TechnicianProfile
+
+WEIGHTS = {
+    "skills": 0.40,
+    "text": 0.15,
+    "distance": 0.20,
+    "rating": 0.10,
+    "experience": 0.08,
+    "hires": 0.07,
+}
+DISTANCE_SCALE_KM = 15.0
+EXPERIENCE_CAP_YEARS = 15
+HIRES_CAP = 10
+
+_WORD = re.compile(r"[a-z]+")
+_SUFFIXES = ("ians", "ian", "ing", "ers", "er", "ry", "al", "s")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from have i in is it my of on or our the this to we with you your "
+    "need needed looking someone job work".split()
+)
+
+
+def stem(word):
+    """Crude suffix stripping so Plumbing/Plumber and Electrical/Electrician meet."""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            return word[: -len(suffix)]
+    return word
+
+
+def terms(text):
+    return [stem(word) for word in _WORD.findall((text or "").lower()) if word not in STOPWORDS and len(word) > 2]
+
+
+@dataclass(slots=True)
+class Candidate:
+    profile_id: int
+    user_id: int
+    skills: frozenset
+    bio: dict
+    latitude: float
+    longitude: float
+    rating: float
+    years: int
+    hires: int
+    visible_until: object
+
+
+class RecommendationIndex:
+    def __init__(self, skill_names):
+        self.candidates = {}
+        self.by_user = {}
+        self.skill_postings = defaultdict(set)
+        self.term_postings = defaultdict(dict)
+        # stem -> skill ids whose name or alias contains it
+        self.skill_stems = defaultdict(set)
+        for skill_id, name in skill_names:
+            for term in terms(name):
+                self.skill_stems[term].add(skill_id)
+
+    def add(self, candidate):
+        self.remove(candidate.profile_id)
+        self.candidates[candidate.profile_id] = candidate
+        self.by_user[candidate.user_id] = candidate.profile_id
+        for skill_id in candidate.skills:
+            self.skill_postings[skill_id].add(candidate.profile_id)
+        for term, weight in candidate.bio.items():
+            self.term_postings[term][candidate.profile_id] = weight
+
+    def remove(self, profile_id):
+        candidate = self.candidates.pop(profile_id, None)
+        if candidate is None:
+            return
+        self.by_user.pop(candidate.user_id, None)
+        for skill_id in candidate.skills:
+            self.skill_postings[skill_id].discard(profile_id)
+        for term in candidate.bio:
+            postings = self.term_postings[term]
+            postings.pop(profile_id, None)
+            if not postings:
+                del self.term_postings[term]
+
+    def job_skills(self, job):
+        """Skill id -> weight: full weight for skills named by category/title, half for the description."""
+        weights = {}
+        for text, weight in ((f"{job.category} {job.title}", 1.0), (job.description, 0.5)):
+            for term in terms(text):
+                for skill_id in self.skill_stems.get(term, ()):
+                    weights[skill_id] = max(weights.get(skill_id, 0.0), weight)
+        return weights
+
+    def job_terms(self, job):
+        counts = Counter(terms(f"{job.category} {job.title} {job.description}"))
+        total = len(self.candidates) or 1
+        vector = {}
+        for term, count in counts.items():
+            df = len(self.term_postings.get(term, ()))
+            if df:
+                vector[term] = count * (math.log((1 + total) / (1 + df)) + 1)
+        norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+        return {term: w / norm for term, w in vector.items()}
+
+    def rank(self, job, limit=10, exclude_user_ids=(), now=None):
+        """Top (profile_id, score, distance_km) for job, best first."""
+        now = now or timezone.now()
+        skill_weights = self.job_skills(job)
+        skill_total = sum(skill_weights.values())
+        skill_hits = defaultdict(float)
+        for skill_id, weight in skill_weights.items():
+            for profile_id in self.skill_postings.get(skill_id, ()):
+                skill_hits[profile_id] += weight
+        text_hits = defaultdict(float)
+        for term, weight in self.job_terms(job).items():
+            for profile_id, bio_weight in self.term_postings[term].items():
+                text_hits[profile_id] += weight * bio_weight
+
+        has_point = job.latitude is not None and job.longitude is not None
+        scored = []
+        for profile_id in skill_hits.keys() | text_hits.keys():
+            c = self.candidates[profile_id]
+            if c.user_id in exclude_user_ids or c.visible_until is None or c.visible_until < now:
+                continue
+            distance = None
+            proximity = 0.0
+            if has_point and c.latitude is not None and c.longitude is not None:
+                distance = distance_km(job.latitude, job.longitude, c.latitude, c.longitude)
+                proximity = math.exp(-distance / DISTANCE_SCALE_KM)
+            score = (
+                WEIGHTS["skills"] * (skill_hits[profile_id] / skill_total if skill_total else 0.0)
+                + WEIGHTS["text"] * min(text_hits[profile_id], 1.0)
+                + WEIGHTS["distance"] * proximity
+                + WEIGHTS["rating"] * c.rating / 5
+                + WEIGHTS["experience"] * min(c.years, EXPERIENCE_CAP_YEARS) / EXPERIENCE_CAP_YEARS
+                + WEIGHTS["hires"] * math.log1p(min(c.hires, HIRES_CAP)) / math.log1p(HIRES_CAP)
+            )
+            scored.append((score, -profile_id, distance))
+        return [(-neg_id, score, distance) for score, neg_id, distance in heapq.nlargest(limit, scored)]
+
+
+def load_candidates(profile_filter=None):
+    """Build Candidate records for approved, unpaused, unhidden profiles in a fixed number of queries."""
+    profiles = TechnicianProfile.objects.filter(is_approved=True, is_paused=False, criminal_record_hidden=False)
+    if profile_filter is not None:
+        profiles = profiles.filter(profile_filter)
+    rows = list(profiles.values_list(
+        "id", "user_id", "bio", "latitude", "longitude", "rating_avg", "years_experience", "trial_ends_at",
+    ))
+    if not rows:
+        return []
+    profile_ids = [row[0] for row in rows]
+    user_ids = [row[1] for row in rows]
+
+    skills = defaultdict(set)
+    for profile_id, skill_id in TechnicianProfile.skills.through.objects.filter(
+        technicianprofile_id__in=profile_ids
+    ).values_list("technicianprofile_id", "skill_id"):
+        skills[profile_id].add(skill_id)
+    subscription_ends = dict(
+        Subscription.objects
+        .filter(user_id__in=user_ids, status=Subscription.Status.ACTIVE)
+        .values("user_id").annotate(end=Max("end_date")).values_list("user_id", "end")
+    )
+    hires = dict(
+        JobApplication.objects
+        .filter(technician_id__in=user_ids, status=JobApplication.HIRED)
+        .values("technician_id").annotate(n=Count("id")).values_list("technician_id", "n")
+    )
+
+    candidates = []
+    for profile_id, user_id, bio, lat, lng, rating, years, trial_ends_at in rows:
+        counts = Counter(terms(bio))
+        norm = math.sqrt(sum(n * n for n in counts.values())) or 1.0
+        ends = [end for end in (trial_ends_at, subscription_ends.get(user_id)) if end is not None]
+        candidates.append(Candidate(
+            profile_id=profile_id,
+            user_id=user_id,
+            skills=frozenset(skills[profile_id]),
+            bio={term: n / norm for term, n in counts.items()},
+            latitude=lat,
+            longitude=lng,
+            rating=float(rating or 0),
+            years=years or 0,
+            hires=hires.get(user_id, 0),
+            visible_until=max(ends) if ends else None,
+        ))
+    return candidates
+
+
+_index = None
+_index_built_at = 0.0
+_dirty_profiles = set()
+_dirty_users = set()
+_index_lock = threading.Lock()
+
+
+def mark_profiles_dirty(profile_ids=(), user_ids=()):
+    with _index_lock:
+        _dirty_profiles.update(profile_ids)
+        _dirty_users.update(user_ids)
+
+
+def reset_recommendation_index():
+    global _index
+    with _index_lock:
+        _index = None
+        _dirty_profiles.clear()
+        _dirty_users.clear()
+
+
+def _build():
+    skill_names = list(Skill.objects.values_list("id", "name")) + list(SkillAlias.objects.values_list("skill_id", "name"))
+    index = RecommendationIndex(skill_names)
+    for candidate in load_candidates():
+        index.add(candidate)
+    return index
+
+
+def _current_index():
+    """The shared index with pending profile changes applied, rebuilt after the TTL. Needs _index_lock."""
+    global _index, _index_built_at
+    ttl = getattr(settings, "RECOMMENDATION_INDEX_TTL", 600)
+    if _index is None or time.monotonic() - _index_built_at >= ttl:
+        _dirty_profiles.clear()
+        _dirty_users.clear()
+        _index = _build()
+        _index_built_at = time.monotonic()
+    elif _dirty_profiles or _dirty_users:
+        profile_ids, user_ids = set(_dirty_profiles), set(_dirty_users)
+        _dirty_profiles.clear()
+        _dirty_users.clear()
+        profile_ids |= {_index.by_user[u] for u in user_ids if u in _index.by_user}
+        fresh = load_candidates(Q(pk__in=profile_ids) | Q(user_id__in=user_ids))
+        for profile_id in profile_ids:
+            _index.remove(profile_id)
+        for candidate in fresh:
+            _index.add(candidate)
+    return _index
+
+
+def rank_technicians(job, limit=10, exclude_user_ids=()):
+    """RecommendationIndex.rank on the shared index, which no other thread can update meanwhile."""
+    with _index_lock:
+        return _current_index().rank(job, limit=limit, exclude_user_ids=exclude_user_ids)
+
+
+def mark_skills_changed():
+    """Skill names feed the job -> skill mapping, so any change means a full rebuild."""
+    reset_recommendation_index()
+
+
+def recommend_technicians(job, limit=10):
+    """
+    Rank visible technicians for job; returns [(TechnicianProfile, score)] best first,
+    with ``distance_km`` set on each profile when both sides have coordinates.
+    """
+    applied = set(JobApplication.objects.filter(job=job).values_list("technician_id", flat=True))
+    ranked = rank_technicians(job, limit=limit, exclude_user_ids=applied)
+    if not ranked:
+        return []
+    now = timezone.now()
+    # Re-check visibility in SQL so a stale index entry can never leak a hidden profile
+    profiles = (
+        TechnicianProfile.objects
+        .filter(pk__in=[profile_id for profile_id, _, _ in ranked], is_approved=True, is_paused=False,
+                criminal_record_hidden=False)
+        .filter(Q(trial_ends_at__gte=now) | Q(user__subscriptions__status="ACTIVE", user__subscriptions__end_date__gte=now))
+        .select_related("user").prefetch_related("skills").distinct()
+        .in_bulk()
+    )
+    results = []
+    for profile_id, score, distance in ranked:
+        profile = profiles.get(profile_id)
+        if profile is not None:
+            profile.distance_km = distance
+            results.append((profile, score))
+    return results
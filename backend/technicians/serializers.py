@@ -1,5 +1,8 @@
 from rest_framework import serializers
+
+from backend.sparse import SparseFieldsSerializerMixin
 from .models import TechnicianProfile, Skill, Review
+from .skills import resolve_skill_ids
 from rest_framework import validators
 
 class SkillSerializer(serializers.ModelSerializer):
@@ -7,10 +10,11 @@ class SkillSerializer(serializers.ModelSerializer):
         model = Skill
         fields = ["id", "name"]
 
-class TechnicianListSerializer(serializers.ModelSerializer):
+class TechnicianListSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     first_name = serializers.CharField(source="user.first_name", read_only=True)
     last_name = serializers.CharField(source="user.last_name", read_only=True)
     skills = SkillSerializer(many=True, read_only=True)
+    distance_km = serializers.SerializerMethodField()
 
     class Meta:
         model = TechnicianProfile
@@ -25,8 +29,13 @@ class TechnicianListSerializer(serializers.ModelSerializer):
             "is_approved",
             "skills",
             "certificates",
+            "distance_km",
         ]
 
+    def get_distance_km(self, obj):
+        distance = getattr(obj, "distance_km", None)
+        return round(distance, 2) if distance is not None else None
+
 class TechnicianDetailSerializer(serializers.ModelSerializer):
     first_name = serializers.CharField(source="user.first_name", read_only=True)
     last_name = serializers.CharField(source="user.last_name", read_only=True)
@@ -66,6 +75,7 @@ class TechnicianProfileEditSerializer(serializers.ModelSerializer):
     criminal_record_expires_at = serializers.DateTimeField(read_only=True)
     criminal_record_is_expired = serializers.SerializerMethodField()
     criminal_record_expiry_notice = serializers.SerializerMethodField()
+    documents_verified = serializers.BooleanField(read_only=True)
 
     class Meta:
         model = TechnicianProfile
@@ -77,6 +87,8 @@ class TechnicianProfileEditSerializer(serializers.ModelSerializer):
             "bio",
             "years_experience",
             "location",
+            "latitude",
+            "longitude",
             "skills",
             "skill_names",
             "certificates",
@@ -86,6 +98,7 @@ class TechnicianProfileEditSerializer(serializers.ModelSerializer):
             "criminal_record_is_expired",
             "criminal_record_expiry_notice",
             "national_id_document",
+            "documents_verified",
             "is_approved",
             "rating_avg",
             "rating_count",
@@ -112,14 +125,7 @@ class TechnicianProfileEditSerializer(serializers.ModelSerializer):
         # Handle skills by names if provided
         skill_names = validated_data.pop("skill_names", None)
         if skill_names is not None:
-            skill_objs = []
-            for name in skill_names:
-                name = (name or "").strip()
-                if not name:
-                    continue
-                obj, _ = Skill.objects.get_or_create(name=name)
-                skill_objs.append(obj)
-            instance.skills.set(skill_objs)
+            instance.skills.set(resolve_skill_ids(skill_names))
 
         if "criminal_record" in validated_data and not validated_data["criminal_record"]:
             if instance.criminal_record:
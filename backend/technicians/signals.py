@@ -1,8 +1,18 @@
-from django.db.models.signals import post_save, post_delete
-from django.dispatch import receiver
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.dispatch import receiver, Signal
 from django.db.models import Avg, Count
 
-from .models import Review, TechnicianProfile
+from jobs.models import JobApplication
+from payments.models import Subscription
+from .models import Review, Skill, SkillAlias, TechnicianProfile
+from .recommendations import mark_profiles_dirty, mark_skills_changed
+from .skills import clear_skill_cache, mark_skill_index_stale
+
+
+# Sent once after a set-based update of technician profiles (queryset.update() skips
+# post_save). Receivers get ``profile_ids`` and the list of changed ``fields``.
+technician_profiles_changed = Signal()
 
 
 def _recompute_rating(technician: TechnicianProfile):
@@ -24,3 +34,64 @@ def review_saved(sender, instance: Review, created, **kwargs):
 def review_deleted(sender, instance: Review, **kwargs):
     _recompute_rating(instance.technician)
 
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def skill_changed(sender, instance: Skill, created=False, **kwargs):
+    mark_skill_index_stale()
+    mark_skills_changed()
+    # New rows can't invalidate cached ids; renames and deletes can
+    if not created:
+        clear_skill_cache()
+
+
+@receiver(post_save, sender=SkillAlias)
+@receiver(post_delete, sender=SkillAlias)
+def skill_alias_changed(sender, instance: SkillAlias, **kwargs):
+    mark_skill_index_stale()
+    mark_skills_changed()
+
+
+def _refresh_recommendations(profile_ids=(), user_ids=()):
+    # Mark now so this thread sees its own writes, and again after commit in case another
+    # thread re-read the rows in between
+    profile_ids, user_ids = list(profile_ids), list(user_ids)
+    mark_profiles_dirty(profile_ids, user_ids)
+    transaction.on_commit(lambda: mark_profiles_dirty(profile_ids, user_ids))
+
+
+@receiver(post_save, sender=TechnicianProfile)
+@receiver(post_delete, sender=TechnicianProfile)
+def technician_profile_changed(sender, instance: TechnicianProfile, **kwargs):
+    _refresh_recommendations(profile_ids=[instance.pk])
+
+
+@receiver(technician_profiles_changed)
+def technician_profiles_bulk_changed(sender, profile_ids, **kwargs):
+    _refresh_recommendations(profile_ids=profile_ids)
+
+
+@receiver(m2m_changed, sender=TechnicianProfile.skills.through)
+def technician_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        # Skill side: pk_set holds profile ids (None on clear, so rebuild everything)
+        if pk_set is None:
+            mark_skills_changed()
+        else:
+            _refresh_recommendations(profile_ids=pk_set)
+    else:
+        _refresh_recommendations(profile_ids=[instance.pk])
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def technician_subscription_changed(sender, instance: Subscription, **kwargs):
+    _refresh_recommendations(user_ids=[instance.user_id])
+
+
+@receiver(post_save, sender=JobApplication)
+@receiver(post_delete, sender=JobApplication)
+def technician_application_changed(sender, instance: JobApplication, **kwargs):
+    _refresh_recommendations(user_ids=[instance.technician_id])
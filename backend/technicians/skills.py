@@ -0,0 +1,136 @@
+"""
+Skill-name resolution and the in-memory skill search index.
+
+Names are matched case-insensitively after whitespace normalisation, on the casefolded
+Skill.normalized_name column. Resolved ids are kept in a small in-process cache, so the
+common skills cost no queries at all.
+"""
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Skill, SkillAlias, normalize_skill_name, skill_key
+
+SKILL_ID_CACHE_MAX = 5000
+
+_skill_ids = {}
+_skill_ids_lock = threading.Lock()
+
+
+def clear_skill_cache():
+    with _skill_ids_lock:
+        _skill_ids.clear()
+
+
+def _remember(pairs):
+    with _skill_ids_lock:
+        if len(_skill_ids) + len(pairs) > SKILL_ID_CACHE_MAX:
+            _skill_ids.clear()
+        _skill_ids.update(pairs)
+
+
+def _lookup(keys):
+    return dict(Skill.objects.filter(normalized_name__in=keys).values_list("normalized_name", "id"))
+
+
+def resolve_skill_ids(names):
+    """
+    Return Skill ids for the given free-form names, in input order and without duplicates,
+    creating the missing skills. Costs at most one SELECT, one INSERT and one SELECT.
+    """
+    wanted = {}
+    for name in names:
+        display = normalize_skill_name(name)
+        if display:
+            wanted.setdefault(skill_key(display), display)
+
+    ids = {key: _skill_ids[key] for key in wanted if key in _skill_ids}
+    unknown = [key for key in wanted if key not in ids]
+    if unknown:
+        found = _lookup(unknown)
+        missing = [key for key in unknown if key not in found]
+        if missing:
+            # Another request may insert the same name concurrently; ignore_conflicts lets
+            # the unique index settle it and the follow-up SELECT picks up whichever row won.
+            Skill.objects.bulk_create(
+                [Skill(name=wanted[key], normalized_name=key) for key in missing], ignore_conflicts=True,
+            )
+            found.update(_lookup(missing))
+            # bulk_create sends no post_save, so tell the search index directly
+            transaction.on_commit(mark_skill_index_stale)
+        # Only cache rows that are known to be committed
+        transaction.on_commit(lambda: _remember(found))
+        ids.update(found)
+    return [ids[key] for key in wanted if key in ids]
+
+
+class SkillIndex:
+    """
+    Sorted array of search terms for every skill name and alias.
+
+    Each name is indexed under every word suffix ("solar panel installer", "panel installer",
+    "installer"), so a prefix lookup with bisect finds skills by the start of any word.
+    """
+
+    def __init__(self, skills, aliases):
+        self.names = dict(skills)
+        entries = set()
+        for skill_id, text in list(skills) + list(aliases):
+            words = text.lower().split()
+            for i in range(len(words)):
+                entries.add((" ".join(words[i:]), i, skill_id))
+        self._entries = sorted(entries)
+        self._terms = [term for term, _, _ in self._entries]
+
+    def _scan(self, prefix):
+        prefix = " ".join(prefix.lower().split())
+        if not prefix:
+            return
+        start = bisect_left(self._terms, prefix)
+        for term, word_pos, skill_id in self._entries[start:]:
+            if not term.startswith(prefix):
+                break
+            yield word_pos, skill_id
+
+    def match_ids(self, query):
+        """Ids of skills whose name or alias has a word starting with query."""
+        return {skill_id for _, skill_id in self._scan(query)}
+
+    def search(self, query, limit=10):
+        """(id, name) pairs ranked by where the match starts, then alphabetically."""
+        best = {}
+        for word_pos, skill_id in self._scan(query):
+            if skill_id in self.names and word_pos < best.get(skill_id, word_pos + 1):
+                best[skill_id] = word_pos
+        ranked = sorted(best, key=lambda skill_id: (best[skill_id], self.names[skill_id].lower()))
+        return [(skill_id, self.names[skill_id]) for skill_id in ranked[:limit]]
+
+
+_index = None
+_index_built_at = 0.0
+_index_stale = True
+_index_lock = threading.Lock()
+
+
+def mark_skill_index_stale():
+    global _index_stale
+    _index_stale = True
+
+
+def get_skill_index():
+    """Return the current SkillIndex, rebuilding it after Skill/alias changes or SKILL_INDEX_TTL seconds."""
+    global _index, _index_built_at, _index_stale
+    ttl = getattr(settings, "SKILL_INDEX_TTL", 300)
+    if _index is not None and not _index_stale and time.monotonic() - _index_built_at < ttl:
+        return _index
+    with _index_lock:
+        if _index is None or _index_stale or time.monotonic() - _index_built_at >= ttl:
+            _index_stale = False
+            skills = list(Skill.objects.values_list("id", "name"))
+            aliases = list(SkillAlias.objects.values_list("skill_id", "name"))
+            _index = SkillIndex(skills, aliases)
+            _index_built_at = time.monotonic()
+    return _index
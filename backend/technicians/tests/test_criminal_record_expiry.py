@@ -0,0 +1,70 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+
+from notifications.models import Notification, OutboxEmail
+from technicians.expiry import hide_expired, remind_expiring
+from technicians.models import TechnicianProfile
+
+User = get_user_model()
+
+
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    BACKGROUND_TASKS_EAGER=True,
+    EMAIL_OUTBOX_AUTOSEND=False,
+)
+class CriminalRecordExpiryTests(APITestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.profiles = {}
+        for name, expires_in in (("lapsed", -3), ("soon", 5), ("later", 60), ("none", None)):
+            user = User.objects.create_user(username=name, email=f"{name}@example.com", password="pass", role="technician")
+            profile = TechnicianProfile.objects.get(user=user)
+            TechnicianProfile.objects.filter(pk=profile.pk).update(
+                is_approved=True,
+                trial_ends_at=now + timedelta(days=30),
+                criminal_record_expires_at=None if expires_in is None else now + timedelta(days=expires_in),
+            )
+            self.profiles[name] = profile.pk
+
+    def test_reminds_expiring_and_expired_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(remind_expiring(days=14, batch_size=1), 2)
+        reminded = set(Notification.objects.filter(kind=Notification.Kind.CRIMINAL_RECORD_EXPIRING).values_list("user__username", flat=True))
+        self.assertEqual(reminded, {"lapsed", "soon"})
+        self.assertEqual(
+            set(OutboxEmail.objects.values_list("to_email", flat=True)), {"lapsed@example.com", "soon@example.com"}
+        )
+        self.assertEqual(remind_expiring(days=14), 0)
+
+    def test_hidden_profiles_leave_public_listings(self):
+        self.assertEqual(hide_expired(), [self.profiles["lapsed"]])
+        self.assertEqual(hide_expired(), [])
+        resp = APIClient().get(reverse("technician-list"))
+        ids = {row["id"] for row in resp.data["results"]}
+        self.assertNotIn(self.profiles["lapsed"], ids)
+        self.assertIn(self.profiles["soon"], ids)
+
+    def test_hidden_profiles_are_not_reachable_by_id(self):
+        client = APIClient()
+        url = reverse("technician-detail", kwargs={"pk": self.profiles["lapsed"]})
+        self.assertEqual(client.get(url).status_code, 200)
+        hide_expired()
+        self.assertEqual(client.get(url).status_code, 404)
+
+    def test_command_hides_and_reports(self):
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("check_criminal_records", "--days", "7", "--hide-expired", stdout=out)
+        self.assertIn("Reminded 2 technician(s)", out.getvalue())
+        self.assertIn("Hid 1 expired technician(s)", out.getvalue())
+        self.assertTrue(TechnicianProfile.objects.get(pk=self.profiles["lapsed"]).criminal_record_hidden)
+        self.assertEqual(len(mail.outbox), 0)
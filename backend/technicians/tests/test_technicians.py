@@ -10,7 +10,7 @@ from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APITestCase, APIClient
 
-from technicians.models import TechnicianProfile, Skill
+from technicians.models import TechnicianProfile, Skill, TechnicianDocument
 from technicians.serializers import TechnicianProfileEditSerializer
 
 
@@ -190,3 +190,144 @@ class TechnicianCredentialTests(APITestCase):
         self.assertIsNotNone(self.profile.criminal_record_uploaded_at)
         self.assertIsNotNone(self.profile.criminal_record_expires_at)
 
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class TechnicianDocumentPipelineTests(APITestCase):
+    def setUp(self):
+        self._temp_media = tempfile.mkdtemp()
+        self.addCleanup(lambda: shutil.rmtree(self._temp_media, ignore_errors=True))
+        override = override_settings(MEDIA_ROOT=self._temp_media)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.user = User.objects.create_user(
+            username="doctech", password="pass", role="technician", location="Kigali", email="doctech@example.com",
+        )
+        self.client.force_authenticate(self.user)
+        self.url = reverse("technician-me")
+
+    def _png(self):
+        from io import BytesIO
+        from PIL import Image
+        buf = BytesIO()
+        Image.new("RGB", (800, 600), (200, 30, 30)).save(buf, "PNG")
+        return SimpleUploadedFile("id.png", buf.getvalue(), content_type="image/png")
+
+    def test_valid_uploads_mark_profile_verified(self):
+        payload = {
+            "criminal_record": SimpleUploadedFile("record.pdf", b"%PDF-1.4\n1 0 obj\n%%EOF", content_type="application/pdf"),
+            "national_id_document": self._png(),
+        }
+        response = self.client.put(self.url, payload, format="multipart")
+        self.assertEqual(response.status_code, 200)
+        profile = TechnicianProfile.objects.get(user=self.user)
+        self.assertTrue(profile.documents_verified)
+        self.assertIsNotNone(profile.documents_verified_at)
+        id_doc = TechnicianDocument.objects.get(profile=profile, kind="national_id_document")
+        self.assertEqual(id_doc.content_type, "image/png")
+        self.assertEqual(len(id_doc.sha256), 64)
+        self.assertTrue(id_doc.thumbnail.name.startswith("document_thumbs/"))
+
+    def test_unrecognised_content_is_rejected(self):
+        payload = {
+            "criminal_record": SimpleUploadedFile("record.pdf", b"not really a pdf", content_type="application/pdf"),
+            "national_id_document": self._png(),
+        }
+        response = self.client.put(self.url, payload, format="multipart")
+        self.assertEqual(response.status_code, 200)
+        profile = TechnicianProfile.objects.get(user=self.user)
+        self.assertFalse(profile.documents_verified)
+        record_doc = TechnicianDocument.objects.get(profile=profile, kind="criminal_record")
+        self.assertEqual(record_doc.status, TechnicianDocument.Status.REJECTED)
+        # The rejected file is gone and the profile no longer points at it
+        storage = TechnicianProfile._meta.get_field("criminal_record").storage
+        self.assertFalse(storage.exists(record_doc.file_name))
+        self.assertFalse(profile.criminal_record)
+        self.assertTrue(storage.exists(profile.national_id_document.name))
+
+    def test_rejected_record_keeps_an_expired_profile_hidden(self):
+        TechnicianProfile.objects.filter(user=self.user).update(
+            criminal_record_expires_at=timezone.now() - timedelta(days=1), criminal_record_hidden=True,
+        )
+        payload = {
+            "criminal_record": SimpleUploadedFile("record.pdf", b"not really a pdf", content_type="application/pdf"),
+            "national_id_document": self._png(),
+        }
+        self.assertEqual(self.client.put(self.url, payload, format="multipart").status_code, 200)
+        profile = TechnicianProfile.objects.get(user=self.user)
+        self.assertTrue(profile.criminal_record_hidden)
+        self.assertIsNone(profile.criminal_record_expires_at)
+        self.assertIsNone(profile.criminal_record_uploaded_at)
+
+
+class SkillResolutionTests(APITestCase):
+    def setUp(self):
+        from technicians.skills import clear_skill_cache
+        clear_skill_cache()
+        self.addCleanup(clear_skill_cache)
+        self.existing = Skill.objects.create(name="Plumber")
+        self.user = User.objects.create_user(
+            username="skilltech", password="pass", role="technician", location="Kigali", email="skilltech@example.com",
+        )
+        self.profile = TechnicianProfile.objects.get(user=self.user)
+
+    def test_names_are_normalized_and_deduplicated(self):
+        from technicians.skills import resolve_skill_ids
+        with self.captureOnCommitCallbacks(execute=True):
+            ids = resolve_skill_ids(["plumber", "  PLUMBER ", "Solar   panel", "solar panel", ""])
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(ids[0], self.existing.id)
+        self.assertEqual(Skill.objects.get(id=ids[1]).name, "Solar panel")
+
+        # Second resolution is served from the in-process cache
+        with self.assertNumQueries(0):
+            self.assertEqual(resolve_skill_ids(["Solar Panel", "plumber"]), [ids[1], ids[0]])
+
+    def test_profile_edit_sets_skills_in_batch(self):
+        self.client.force_authenticate(self.user)
+        resp = self.client.patch(
+            reverse("technician-me"), {"skill_names": ["Plumber", "Tiling", "tiling", "Welding"]}, format="json",
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(sorted(s["name"] for s in resp.data["skills"]), ["Plumber", "Tiling", "Welding"])
+        self.assertEqual(Skill.objects.filter(name__iexact="tiling").count(), 1)
+
+    def test_case_insensitive_unique_constraint(self):
+        from django.db import IntegrityError, transaction
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Skill.objects.create(name="plumber")
+
+    def test_non_ascii_names_match_case_insensitively(self):
+        from django.db import IntegrityError, transaction
+        from technicians.skills import resolve_skill_ids
+        skill = Skill.objects.create(name="Électricien")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(resolve_skill_ids(["Électricien", "ÉLECTRICIEN", "électricien"]), [skill.id])
+        self.assertEqual(Skill.objects.count(), 2)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Skill.objects.create(name="électricien")
+
+
+class SkillAutocompleteTests(APITestCase):
+    def setUp(self):
+        from technicians.models import SkillAlias
+        self.plumber = Skill.objects.create(name="Plumber")
+        self.solar = Skill.objects.create(name="Solar Panel Installer")
+        self.painter = Skill.objects.create(name="Painter")
+        SkillAlias.objects.create(skill=self.plumber, name="Pipe fitter")
+        self.url = reverse("skill-autocomplete")
+
+    def test_prefix_matches_any_word_and_ranks_leading_matches_first(self):
+        resp = self.client.get(self.url, {"q": "pa"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([r["name"] for r in resp.data], ["Painter", "Solar Panel Installer"])
+
+    def test_aliases_resolve_to_canonical_skill(self):
+        resp = self.client.get(self.url, {"q": "pipe"})
+        self.assertEqual(resp.data, [{"id": self.plumber.id, "name": "Plumber"}])
+
+    def test_index_picks_up_new_skills(self):
+        self.assertEqual(self.client.get(self.url, {"q": "weld"}).data, [])
+        welder = Skill.objects.create(name="Welder")
+        self.assertEqual(self.client.get(self.url, {"q": "weld"}).data, [{"id": welder.id, "name": "Welder"}])
+
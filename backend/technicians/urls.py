@@ -1,7 +1,7 @@
 from django.urls import path
 from .views import (
     TechnicianListView, TechnicianDetailView, MyTechnicianProfileView, TechnicianReviewsView,
-    TechnicianApplyToJobView, TechnicianMyApplicationsView
+    TechnicianApplyToJobView, TechnicianMyApplicationsView, SkillAutocompleteView, TechnicianJobFeedView
 )
 
 urlpatterns = [
@@ -9,7 +9,9 @@ urlpatterns = [
     path("<int:pk>/", TechnicianDetailView.as_view(), name="technician-detail"),    
     path("me/", MyTechnicianProfileView.as_view(), name="technician-me"),           
     path("<int:pk>/reviews/", TechnicianReviewsView.as_view(), name="technician-reviews"), 
+    path("skills/autocomplete/", SkillAutocompleteView.as_view(), name="skill-autocomplete"),
     
     path("jobs/<int:job_id>/apply/", TechnicianApplyToJobView.as_view(), name="technician-job-apply"),
     path("applications/mine/", TechnicianMyApplicationsView.as_view(), name="technician-my-applications"),
+    path("jobs/for-me/", TechnicianJobFeedView.as_view(), name="technician-job-feed"),
 ]
@@ -1,25 +1,35 @@
 from rest_framework import generics, permissions, filters
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from django.utils import timezone
-from django.db.models import Q
-from .models import TechnicianProfile, Review
+from django.db.models import Count, Q
+from backend.replicas import ReplicaReadMixin
+from backend.sparse import ValuesListMixin, ValuesRowSerializer
+from .models import Skill, TechnicianProfile, Review
 from .serializers import (
     TechnicianListSerializer, TechnicianDetailSerializer, TechnicianProfileEditSerializer, ReviewSerializer
 )
+from .documents import DOCUMENT_FIELDS, queue_document_processing, refresh_documents_verified
 from .filters import TechnicianFilter
 from .pagination import NinePerPagePagination
 from .permissions import IsTechnician
+from .skills import get_skill_index
 from employers.permissions import IsEmployer
 from django_filters.rest_framework import DjangoFilterBackend
+from geo.filters import ProximityFilter
+from jobs.feed import get_feed
 from jobs.models import Job, JobApplication
-from jobs.serializers import JobApplicationSerializer
+from jobs.pagination import JobsPagination
+from jobs.serializers import JobApplicationSerializer, JobSerializer
+from notifications import events as notification_events
 from rest_framework import serializers as drf_serializers
 
 
-class TechnicianListView(generics.ListAPIView):
+class TechnicianListView(ReplicaReadMixin, ValuesListMixin, generics.ListAPIView):
     serializer_class = TechnicianListSerializer
     permission_classes = [permissions.AllowAny]
     pagination_class = NinePerPagePagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter, ProximityFilter]
     filterset_class = TechnicianFilter
     search_fields = ["user__username", "bio", "location", "skills__name"]
     ordering_fields = ["rating_avg", "years_experience"]
@@ -27,19 +37,50 @@ class TechnicianListView(generics.ListAPIView):
 
     def get_queryset(self):
         now = timezone.now()
-        return (
+        queryset = (
             TechnicianProfile.objects
-            .filter(is_approved=True, is_paused=False)
+            .filter(is_approved=True, is_paused=False, criminal_record_hidden=False)
             .filter(
                 Q(trial_ends_at__gte=now) |
                 Q(user__subscriptions__status="ACTIVE", user__subscriptions__end_date__gte=now)
             )
-            .select_related("user").prefetch_related("skills").distinct()
+            .distinct()
+        )
+        if not self.use_values_path:
+            queryset = queryset.select_related("user").prefetch_related("skills")
+        return queryset
+
+    def get_values_serializer(self, serializer, queryset):
+        located = "distance_km" in queryset.query.annotations
+        return ValuesRowSerializer(
+            serializer,
+            lookups={"distance_km": "distance_km"},
+            converters={"distance_km": lambda distance: round(distance, 2)},
+            deferred=("skills",) if located else ("skills", "distance_km"),
+            extra=("id",),
         )
 
-
-class TechnicianDetailView(generics.RetrieveAPIView):
-    queryset = TechnicianProfile.objects.filter(is_approved=True).select_related("user").prefetch_related("skills")
+    def finish_values_rows(self, data, rows, values_serializer):
+        if not data or "skills" not in data[0]:
+            return data
+        id_index = values_serializer.index("id")
+        skills = {row[id_index]: [] for row in rows}
+        # One query for the page, like prefetch_related("skills") would run
+        for profile_id, skill_id, name in (
+            Skill.objects.filter(technicianprofile__in=list(skills))
+            .values_list("technicianprofile__id", "id", "name")
+        ):
+            skills[profile_id].append({"id": skill_id, "name": name})
+        for item, row in zip(data, rows):
+            item["skills"] = skills[row[id_index]]
+        return data
+
+
+class TechnicianDetailView(ReplicaReadMixin, generics.RetrieveAPIView):
+    queryset = (
+        TechnicianProfile.objects.filter(is_approved=True, criminal_record_hidden=False)
+        .select_related("user").prefetch_related("skills")
+    )
     serializer_class = TechnicianDetailSerializer
     permission_classes = [permissions.AllowAny]
 
@@ -80,8 +121,30 @@ class MyTechnicianProfileView(generics.RetrieveUpdateAPIView):
         kwargs["partial"] = True
         return super().update(request, *args, **kwargs)
 
+    def perform_update(self, serializer):
+        changed = [field for field in DOCUMENT_FIELDS if field in serializer.validated_data]
+        uploaded = [field for field in changed if serializer.validated_data[field]]
+        profile = serializer.save()
+        if uploaded:
+            queue_document_processing(profile, uploaded)
+        elif changed:
+            refresh_documents_verified(profile.pk)
+
 
-class TechnicianReviewsView(generics.ListAPIView):
+class SkillAutocompleteView(APIView):
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        query = request.query_params.get("q", "")
+        try:
+            limit = min(max(int(request.query_params.get("limit", 10)), 1), 50)
+        except ValueError:
+            limit = 10
+        matches = get_skill_index().search(query, limit=limit)
+        return Response([{"id": skill_id, "name": name} for skill_id, name in matches])
+
+
+class TechnicianReviewsView(ReplicaReadMixin, generics.ListAPIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = ReviewSerializer
 
@@ -111,9 +174,10 @@ class TechnicianApplyToJobView(generics.CreateAPIView):
             raise drf_serializers.ValidationError({"detail": "Job not found or inactive."})
         from django.db import IntegrityError
         try:
-            serializer.save(job=job, technician=self.request.user)
+            application = serializer.save(job=job, technician=self.request.user)
         except IntegrityError:
             raise drf_serializers.ValidationError({"detail": "You have already applied to this job."})
+        notification_events.application_received(application)
 
 
 
@@ -130,3 +194,29 @@ class TechnicianMyApplicationsView(generics.ListAPIView):
                 .select_related("job")
                 .order_by("-created_at"))
 
+
+class TechnicianJobFeedView(generics.ListAPIView):
+    """
+    GET /api/technicians/jobs/for-me/
+    Active jobs ranked for the current technician by skills, distance and application history.
+    """
+    serializer_class = JobSerializer
+    permission_classes = [IsTechnician]
+    pagination_class = JobsPagination
+
+    def list(self, request, *args, **kwargs):
+        feed = get_feed(request.user)
+        page = self.paginate_queryset(feed)
+        scores = dict(page)
+        jobs = (
+            Job.objects.filter(pk__in=scores, is_active=True)
+            .annotate(applications_count=Count("applications"))
+            .select_related("employer")
+            .in_bulk()
+        )
+        results = []
+        for job_id, score in page:
+            if job_id in jobs:
+                results.append({**self.get_serializer(jobs[job_id]).data, "score": round(score, 4)})
+        return self.get_paginated_response(results)
+